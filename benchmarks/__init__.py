@@ -0,0 +1,9 @@
+"""
+Benchmark NDB CSV Processor (tidak ikut di-install)
+
+- generate_ndb: generator CSV NDB sintetis
+- bench_stages: waktu, baris/detik dan peak memory per stage + perbandingan baseline JSON
+- bench_startup: waktu cold start GUI dan console
+
+Jalankan dari root repository, contoh: python -m benchmarks.bench_stages --sizes 10k,1m
+"""
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stage Benchmark
+Ukur waktu, throughput dan peak memory tiap stage pipeline pada data NDB sintetis
+
+Stage yang diukur (input = CSV dari generate_ndb.py):
+- load_data, transform_data, filter_allowed_columns (NDBDataProcessor)
+- generate_rawndb_csv, generate_rawndb_simple_csv (FinalOutputGenerator)
+- process_all_steps (end-to-end Step 2 + Step 4)
+
+Waktu = median dari --repeat run. Peak memory = kenaikan RSS process tertinggi selama stage
+(di-sample thread background, termasuk buffer Arrow / polars), maksimum dari semua run.
+Hasil disimpan ke JSON (--output) dan bisa dibandingkan dengan run sebelumnya (--baseline).
+
+Usage:
+    python -m benchmarks.bench_stages --sizes 10k,1m --output benchmarks/results/current.json
+    python -m benchmarks.bench_stages --sizes 10k,1m --baseline benchmarks/results/current.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import threading
+import contextlib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+
+from main_processor import (NDBDataProcessor, FinalOutputGenerator, process_all_steps, resolve_reader_engine,
+                            PROCESSING_ENGINES)
+from benchmarks.generate_ndb import generate_ndb_csv, parse_rows, GENERATOR_VERSION
+
+STAGES = ['load_data', 'transform_data', 'filter_allowed_columns', 'generate_rawndb_csv',
+          'generate_rawndb_simple_csv', 'process_all_steps']
+
+DEFAULT_SIZES = '10k'
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'ndb_benchmark')
+# Stage dianggap regresi jika lebih lambat dari baseline lebih dari threshold (%)
+DEFAULT_THRESHOLD = 10.0
+# Selisih di bawah ini (detik) dianggap noise walaupun persentasenya besar
+MIN_REGRESSION_SECONDS = 0.01
+# Interval sample RSS (detik)
+RSS_SAMPLE_INTERVAL = 0.005
+
+def get_dataset(rows, seed, data_dir):
+    """Path CSV sintetis, di-generate sekali lalu dipakai ulang"""
+    os.makedirs(data_dir, exist_ok=True)
+    csv_path = os.path.join(data_dir, f"ndb_synthetic_{rows}_seed{seed}_v{GENERATOR_VERSION}.csv")
+    if not os.path.exists(csv_path):
+        print(f"Generate data sintetis {rows:,} baris -> {csv_path}")
+        generate_ndb_csv(csv_path, rows, seed)
+    return csv_path
+
+def get_process_rss():
+    """RSS process saat ini (byte), None jika tidak bisa dibaca"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class StageTimer:
+    """Catat waktu dan peak memory (kenaikan RSS) per stage"""
+
+    def __init__(self):
+        self.seconds = {}
+        self.peak_mb = {}
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        start_rss = get_process_rss()
+        peak = [start_rss or 0]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(RSS_SAMPLE_INTERVAL):
+                peak[0] = max(peak[0], get_process_rss() or 0)
+
+        sampler = None
+        if start_rss is not None:
+            sampler = threading.Thread(target=sample, daemon=True)
+            sampler.start()
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] = time.perf_counter() - start_time
+            done.set()
+            if sampler is not None:
+                sampler.join()
+                peak[0] = max(peak[0], get_process_rss() or 0)
+                self.peak_mb[stage] = (peak[0] - start_rss) / (1024 * 1024)
+
+def run_pipeline(csv_path, work_dir, engine):
+    """1x run semua stage, return (StageTimer, jumlah baris input)"""
+    timer = StageTimer()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+
+    # Log pipeline tidak ikut di output benchmark
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        processor = NDBDataProcessor(csv_path)
+        processor.reader_engine = resolve_reader_engine(engine) if engine != 'polars' else 'pandas'
+
+        with timer.measure('load_data'):
+            if not processor.load_data():
+                raise RuntimeError("load_data gagal")
+        rows = len(processor.df)
+
+        with timer.measure('transform_data'):
+            transformed_df = processor.transform_data(processor.df, verbose=False)
+
+        with timer.measure('filter_allowed_columns'):
+            final_df = processor.filter_allowed_columns(transformed_df, verbose=False)
+
+        generator = FinalOutputGenerator(df=final_df)
+        with timer.measure('generate_rawndb_csv'):
+            if not generator.generate_rawndb_csv(os.path.join(work_dir, 'rawndb.csv')):
+                raise RuntimeError("generate_rawndb_csv gagal")
+
+        with timer.measure('generate_rawndb_simple_csv'):
+            if not generator.generate_rawndb_simple_csv(os.path.join(work_dir, 'rawndb_simple.csv')):
+                raise RuntimeError("generate_rawndb_simple_csv gagal")
+
+        del processor, transformed_df, final_df, generator
+
+        output_dir = os.path.join(work_dir, 'all_steps')
+        os.makedirs(output_dir)
+        with timer.measure('process_all_steps'):
+            if not process_all_steps(csv_path, engine=engine, output_dir=output_dir):
+                raise RuntimeError("process_all_steps gagal")
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return timer, rows
+
+def benchmark_size(label, rows, args):
+    """Benchmark 1 ukuran data, return dict hasil per stage"""
+    csv_path = get_dataset(rows, args.seed, args.data_dir)
+    work_dir = os.path.join(args.data_dir, 'work')
+
+    timings = {stage: [] for stage in STAGES}
+    peak_mb = {}
+    input_rows = rows
+    for i in range(args.repeat):
+        print(f"[{label}] run {i + 1}/{args.repeat}...")
+        timer, input_rows = run_pipeline(csv_path, work_dir, args.engine)
+        for stage in STAGES:
+            timings[stage].append(timer.seconds[stage])
+        for stage, peak in timer.peak_mb.items():
+            peak_mb[stage] = max(peak_mb.get(stage, 0.0), peak)
+
+    stages = {}
+    for stage in STAGES:
+        seconds = statistics.median(timings[stage])
+        stages[stage] = {
+            'seconds': round(seconds, 4),
+            'min_seconds': round(min(timings[stage]), 4),
+            'rows_per_second': round(input_rows / seconds) if seconds > 0 else None,
+            'peak_memory_mb': round(peak_mb[stage], 1) if stage in peak_mb else None,
+        }
+
+    return {
+        'rows': input_rows,
+        'file_mb': round(os.path.getsize(csv_path) / (1024 * 1024), 1),
+        'stages': stages,
+    }
+
+def compare_results(current, baseline, threshold):
+    """Bandingkan waktu per stage dengan baseline, return list regresi (label, stage, % perubahan)"""
+    regressions = []
+    print(f"\nPerbandingan dengan baseline ({baseline['meta'].get('timestamp', '?')}):")
+    print(f"{'Size':<8}{'Stage':<30}{'Baseline':>11}{'Sekarang':>11}{'Perubahan':>11}")
+    print("-" * 71)
+    for label, result in current['results'].items():
+        base_result = baseline['results'].get(label)
+        if base_result is None:
+            print(f"{label:<8}(tidak ada di baseline)")
+            continue
+        for stage, stage_result in result['stages'].items():
+            base_stage = base_result['stages'].get(stage)
+            if not base_stage or not base_stage['seconds']:
+                continue
+            change = (stage_result['seconds'] - base_stage['seconds']) / base_stage['seconds'] * 100
+            flag = ''
+            if change > threshold and stage_result['seconds'] - base_stage['seconds'] > MIN_REGRESSION_SECONDS:
+                flag = '  REGRESI'
+                regressions.append((label, stage, change))
+            print(f"{label:<8}{stage:<30}{base_stage['seconds']:>10.3f}s{stage_result['seconds']:>10.3f}s"
+                  f"{change:>+10.1f}%{flag}")
+    return regressions
+
+def print_results(current):
+    """Print tabel hasil per ukuran data"""
+    for label, result in current['results'].items():
+        print(f"\n{label}: {result['rows']:,} baris, {result['file_mb']} MB")
+        print(f"{'Stage':<30}{'Waktu':>10}{'Baris/detik':>14}{'Peak MB':>10}")
+        print("-" * 64)
+        for stage, stage_result in result['stages'].items():
+            rate = f"{stage_result['rows_per_second']:,}" if stage_result['rows_per_second'] else '-'
+            peak = f"{stage_result['peak_memory_mb']:.1f}" if stage_result['peak_memory_mb'] is not None else '-'
+            print(f"{stage:<30}{stage_result['seconds']:>9.3f}s{rate:>14}{peak:>10}")
+
+def build_meta(args):
+    """Info environment run (untuk membandingkan baseline yang setara)"""
+    return {
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'engine': args.engine,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'generator_version': GENERATOR_VERSION,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark stage pipeline NDB dengan data sintetis")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Ukuran data dipisah koma (contoh: 10k,1m,10m)")
+    parser.add_argument('--repeat', type=int, default=3, help="Jumlah run waktu per ukuran (median)")
+    parser.add_argument('--engine', choices=PROCESSING_ENGINES, default='pandas')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="Folder data sintetis (dipakai ulang)")
+    parser.add_argument('--output', default=None, help="Simpan hasil ke file JSON")
+    parser.add_argument('--baseline', default=None, help="File JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Batas perlambatan (%%) yang dianggap regresi")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit code 1 jika ada regresi")
+    args = parser.parse_args(argv)
+    args.repeat = max(1, args.repeat)
+
+    # Baseline dibaca dulu supaya --output ke file yang sama tetap membandingkan dengan run lama
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    current = {'meta': build_meta(args), 'results': {}}
+    for label in [size.strip() for size in args.sizes.split(',') if size.strip()]:
+        current['results'][label] = benchmark_size(label, parse_rows(label), args)
+
+    print_results(current)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nHasil disimpan ke {args.output}")
+
+    if baseline is not None:
+        regressions = compare_results(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage lebih lambat > {args.threshold:.0f}% dari baseline")
+            if args.fail_on_regression:
+                return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup Benchmark
+Ukur waktu start aplikasi (cold start interpreter baru per run)
+
+- console: start python sampai main_processor.main() bisa dipanggil
+- gui_import: start python sampai import ndb_processor_gui selesai
+- gui_first_frame: start python sampai frame pertama GUI ter-render (butuh dearpygui + display)
+
+Setiap pengukuran dijalankan di subprocess baru sebanyak --repeat kali (median dan min dilaporkan).
+Hasil bisa ditambahkan ke file JSON (--json) untuk dibandingkan antar release.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5] [--json benchmarks/startup_history.json]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modul berat yang seharusnya belum ter-load saat frame pertama GUI tampil
+HEAVY_MODULES = ['pandas', 'numpy', 'polars', 'pyarrow']
+
+# Snippet subprocess: print JSON {"ready": time.time(), "loaded": [...]} di baris terakhir stdout
+CONSOLE_SNIPPET = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import main_processor
+print(json.dumps({{'ready': time.time(), 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+GUI_IMPORT_SNIPPET = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import ndb_processor_gui
+print(json.dumps({{'ready': time.time(), 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+GUI_FIRST_FRAME_SNIPPET = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import ndb_processor_gui
+import dearpygui.dearpygui as dpg
+app = ndb_processor_gui.NDBProcessorGUI()
+app.setup_viewport()
+dpg.render_dearpygui_frame()
+ready = time.time()
+loaded = [m for m in {heavy!r} if m in sys.modules]
+dpg.destroy_context()
+print(json.dumps({{'ready': ready, 'loaded': loaded}}))
+"""
+
+BENCHMARKS = {
+    'console': CONSOLE_SNIPPET,
+    'gui_import': GUI_IMPORT_SNIPPET,
+    'gui_first_frame': GUI_FIRST_FRAME_SNIPPET,
+}
+
+def run_once(snippet):
+    """1x cold start, return (detik sampai ready, modul berat yang sudah ter-load)"""
+    code = snippet.format(root=ROOT_DIR, heavy=HEAVY_MODULES)
+    start_time = time.time()
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True,
+                            timeout=300)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit code {result.returncode}")
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report['ready'] - start_time, report['loaded']
+
+def run_benchmark(name, repeat):
+    """Jalankan 1 benchmark sebanyak repeat kali, return dict hasil"""
+    try:
+        timings = []
+        loaded = []
+        for _ in range(repeat):
+            seconds, loaded = run_once(BENCHMARKS[name])
+            timings.append(seconds)
+    except Exception as e:
+        return {'name': name, 'skipped': str(e)}
+
+    return {
+        'name': name,
+        'median_seconds': round(statistics.median(timings), 4),
+        'min_seconds': round(min(timings), 4),
+        'runs': [round(seconds, 4) for seconds in timings],
+        'heavy_modules_loaded': loaded,
+    }
+
+def slowest_imports(module, limit=10):
+    """Import paling lambat (kumulatif, top-level package) dari python -X importtime"""
+    code = f"import sys; sys.path.insert(0, {ROOT_DIR!r}); import {module}"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT_DIR,
+                            capture_output=True, text=True, timeout=300)
+
+    # Format baris: "import time:  self [us] | cumulative | imported package"
+    totals = {}
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Indent 2 spasi per level, level 1 = di-import langsung oleh modul yang diukur
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 1:
+            totals[name.strip()] = int(parts[1]) / 1e6
+
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+def print_results(results, imports):
+    """Print tabel hasil"""
+    print(f"{'Benchmark':<18}{'Median':>10}{'Min':>10}  Modul berat ter-load")
+    print("-" * 70)
+    for result in results:
+        if 'skipped' in result:
+            print(f"{result['name']:<18}{'-':>10}{'-':>10}  dilewati: {result['skipped']}")
+        else:
+            loaded = ', '.join(result['heavy_modules_loaded']) or '-'
+            print(f"{result['name']:<18}{result['median_seconds']:>9.3f}s{result['min_seconds']:>9.3f}s  {loaded}")
+
+    if imports:
+        print("\nImport paling lambat saat start console (detik, kumulatif):")
+        for name, seconds in imports:
+            print(f"  {name:<30}{seconds:>8.3f}")
+
+def append_history(json_path, record):
+    """Tambahkan hasil ke file history JSON (list record)"""
+    history = []
+    if os.path.exists(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    history.append(record)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+
+def get_app_version():
+    """Versi aplikasi dari __init__.py root"""
+    with open(os.path.join(ROOT_DIR, '__init__.py'), 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('__version__'):
+                return line.split('=')[1].strip().strip('"\'')
+    return 'unknown'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark waktu startup console dan GUI")
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah cold start per benchmark")
+    parser.add_argument('--only', choices=list(BENCHMARKS), action='append',
+                        help="Jalankan benchmark tertentu saja (boleh berulang)")
+    parser.add_argument('--json', default=None, help="Tambahkan hasil ke file history JSON")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    results = [run_benchmark(name, max(1, args.repeat)) for name in names]
+    imports = slowest_imports('main_processor') if 'console' in names else []
+    print_results(results, imports)
+
+    if args.json:
+        append_history(args.json, {
+            'version': get_app_version(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        })
+        print(f"\nHasil ditambahkan ke {args.json}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
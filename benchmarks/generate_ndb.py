@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetic NDB Generator
+Generate file CSV NDB sintetis (deterministik per seed) untuk benchmark
+
+Data dibuat per site lalu per cell, mirip dump NDB asli:
+- CELL_SYSTEM_INFO dari band nyata (GSM900, DCS1800, LTE900/1800/2100, 5G18/21, 5G_26G) + nilai tidak dikenal / kosong
+- CELL_NAME = SITE_ID + prefix band (L18_, L21_, 5G18_, 5G21_, ...) + sector letter + 2 digit
+- Site INDOOR (SITE_TYPE dan SITE_NAME), REGION / PROVINCE / CITY per site
+- Koordinat rusak (kosong, text, 0) dan SITE_ID berawalan '0' (dibuang di output RAWNDB)
+- Kolom tambahan supaya lebar baris mendekati dump asli (~60 kolom)
+
+Usage:
+    python -m benchmarks.generate_ndb output.csv --rows 1m [--seed 42]
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Band: (CELL_SYSTEM_INFO, prefix CELL_NAME, bobot)
+BANDS = [
+    ('LTE1800', 'L18_', 0.30),
+    ('LTE2100', 'L21_', 0.15),
+    ('LTE900', 'L09_', 0.08),
+    ('GSM900', 'G09_', 0.10),
+    ('DCS1800', 'D18_', 0.07),
+    ('5G21', '5G21_', 0.08),
+    ('5G18', '5G18_', 0.05),
+    ('5G_26G', '5G26_', 0.02),
+    ('L18', 'L18_', 0.04),
+    ('L21', 'L21_', 0.03),
+    ('UMTS2100', 'U21_', 0.05),
+    ('', 'X_', 0.03),
+]
+
+# Region: (REGION, bbox lon/lat kasar, list province)
+REGIONS = [
+    ('CENTRAL SUMATERA', (98.5, -1.5, 104.5, 2.5), ['RIAU', 'SUMATERA BARAT', 'JAMBI']),
+    ('SOUTH SUMATERA', (101.0, -6.0, 106.5, -1.5), ['SUMATERA SELATAN', 'LAMPUNG', 'BENGKULU']),
+    ('WEST JAVA', (106.4, -7.8, 108.8, -6.0), ['JAWA BARAT']),
+    ('OUTER JAKARTA', (106.5, -6.6, 107.2, -6.0), ['BANTEN', 'JAWA BARAT']),
+    ('INNER JAKARTA', (106.7, -6.4, 106.98, -6.08), ['DKI JAKARTA']),
+    ('CENTRAL JAVA', (108.8, -8.2, 111.7, -6.4), ['JAWA TENGAH', 'DI YOGYAKARTA']),
+    ('EAST JAVA', (111.0, -8.8, 114.6, -6.7), ['JAWA TIMUR']),
+    ('BALI NUSRA', (114.4, -10.8, 125.2, -8.0), ['BALI', 'NTB', 'NTT']),
+    ('KALIMANTAN', (108.8, -4.2, 119.0, 4.4), ['KALIMANTAN TIMUR', 'KALIMANTAN BARAT']),
+    ('SULAWESI', (118.8, -5.8, 125.3, 1.8), ['SULAWESI SELATAN', 'SULAWESI UTARA']),
+    ('NORTHERN SUMATERA', (95.0, 0.5, 100.5, 6.0), ['SUMATERA UTARA', 'ACEH']),
+    ('MAPA', (124.0, -8.5, 141.0, 2.5), ['MALUKU', 'PAPUA']),
+]
+
+SITE_PREFIXES = ['JKT', 'BDG', 'SBY', 'MDN', 'PLB', 'DPS', 'MKS', 'BPN', 'SMG', 'PKU', 'JYP', 'AMB']
+SITE_TYPES = ['GF', 'RT', 'MICROCELL', 'INDOOR']
+SITE_TYPE_WEIGHTS = [0.55, 0.25, 0.08, 0.12]
+CLUTTERS = ['DENSE URBAN', 'URBAN', 'SUBURBAN', 'RURAL']
+VENDORS = ['HUAWEI', 'ERICSSON', 'NOKIA', 'ZTE']
+ANTENNA_TYPES = ['ADU4518R6', 'AQU4518R11', 'APE4517R0', 'AAU5613', 'ODV-065R17']
+SECTOR_LETTERS = 'ABCD'
+
+# Rasio data rusak
+BAD_COORDINATE_RATE = 0.01
+ZERO_SITE_RATE = 0.02
+MISSING_CELL_ID_RATE = 0.01
+
+# Rata-rata cell per site (site dipakai berurutan seperti dump asli)
+CELLS_PER_SITE = 9
+EXTRA_COLUMNS = 30
+CHUNK_ROWS = 200000
+
+SIZE_SUFFIXES = {'k': 1000, 'm': 1000000}
+
+# Naikkan jika data yang dihasilkan berubah (nama file cache benchmark ikut berubah)
+GENERATOR_VERSION = 1
+
+def parse_rows(value):
+    """'10k' / '1m' / '10000' -> jumlah baris"""
+    text = str(value).strip().lower()
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+def build_sites(n_sites, rng):
+    """Tabel atribut per site"""
+    region_idx = rng.integers(0, len(REGIONS), n_sites)
+    bboxes = np.array([bbox for _, bbox, _ in REGIONS])[region_idx]
+    lon = np.round(rng.uniform(bboxes[:, 0], bboxes[:, 2]), 6)
+    lat = np.round(rng.uniform(bboxes[:, 1], bboxes[:, 3]), 6)
+
+    prefix = np.array(SITE_PREFIXES, dtype=object)[rng.integers(0, len(SITE_PREFIXES), n_sites)]
+    numbers = pd.Series(np.arange(n_sites)).astype(str).str.zfill(6).to_numpy(dtype=object)
+    site_id = prefix + numbers
+    # SITE_ID berawalan '0' (dibuang di output RAWNDB)
+    zero_site = rng.random(n_sites) < ZERO_SITE_RATE
+    site_id[zero_site] = '0' + site_id[zero_site]
+
+    site_type = np.array(SITE_TYPES, dtype=object)[rng.choice(len(SITE_TYPES), n_sites, p=SITE_TYPE_WEIGHTS)]
+    site_name = site_id + ' ' + np.array(['MAIN', 'CITY', 'MALL', 'TOWER', 'HILL'], dtype=object)[
+        rng.integers(0, 5, n_sites)]
+    site_name[site_type == 'INDOOR'] = site_name[site_type == 'INDOOR'] + ' INDOOR'
+
+    # Province dipilih dari list province region site
+    pick = rng.random(n_sites)
+    province = np.array([REGIONS[i][2][int(u * len(REGIONS[i][2]))] for i, u in zip(region_idx, pick)],
+                        dtype=object)
+    return {
+        'site_id': site_id,
+        'site_name': site_name,
+        'site_type': site_type,
+        'region': np.array([name for name, _, _ in REGIONS], dtype=object)[region_idx],
+        'province': province,
+        'city': np.array(['KOTA', 'KAB'], dtype=object)[rng.integers(0, 2, n_sites)] + ' ' + prefix,
+        'lon': lon,
+        'lat': lat,
+        'height': np.round(rng.uniform(12, 72, n_sites), 1),
+        'lac': rng.integers(1000, 60000, n_sites),
+    }
+
+def build_chunk(sites, start, rows, seed):
+    """Frame NDB untuk baris start .. start + rows (deterministik per chunk)"""
+    rng = np.random.default_rng([seed, start])
+    n_sites = len(sites['site_id'])
+    site_idx = np.minimum(np.arange(start, start + rows) // CELLS_PER_SITE, n_sites - 1)
+
+    weights = np.array([weight for _, _, weight in BANDS])
+    band_idx = rng.choice(len(BANDS), rows, p=weights / weights.sum())
+    system_info = np.array([name for name, _, _ in BANDS], dtype=object)[band_idx]
+    band_prefix = np.array([prefix for _, prefix, _ in BANDS], dtype=object)[band_idx]
+
+    sector = rng.integers(0, 3, rows)
+    letters = np.array(list(SECTOR_LETTERS), dtype=object)[np.minimum(sector + (rng.random(rows) < 0.05), 3)]
+    digits = pd.Series(rng.integers(1, 100, rows)).astype(str).str.zfill(2).to_numpy(dtype=object)
+    cell_name = sites['site_id'][site_idx] + band_prefix + letters + digits
+
+    lon = sites['lon'][site_idx].astype(object)
+    lat = sites['lat'][site_idx].astype(object)
+    bad = rng.random(rows) < BAD_COORDINATE_RATE
+    lon[bad] = np.array(['', 'N/A', 0.0], dtype=object)[rng.integers(0, 3, int(bad.sum()))]
+
+    cell_id = rng.integers(1, 268435455, rows).astype(object)
+    cell_id[rng.random(rows) < MISSING_CELL_ID_RATE] = ''
+
+    columns = {
+        'SITE_ID': sites['site_id'][site_idx],
+        'SITE_NAME': sites['site_name'][site_idx],
+        'CELL_NAME': cell_name,
+        'CELL_ID': cell_id,
+        'X_LONGITUDE': lon,
+        'Y_LATITUDE': lat,
+        'ANTENNA_AZIMUTH_DEG': (sector * 120 + rng.integers(-15, 16, rows)) % 360,
+        'HORIZONTAL_BEAMWIDTH_DEG': np.array([33, 65, 65, 90])[rng.integers(0, 4, rows)],
+        'HEIGHT_ANTENNA_M': sites['height'][site_idx],
+        'ANTENNA_TYPE': np.array(ANTENNA_TYPES, dtype=object)[rng.integers(0, len(ANTENNA_TYPES), rows)],
+        'SECTOR_TYPE': np.array(['MACRO', 'MICRO'], dtype=object)[rng.integers(0, 2, rows)],
+        'CELL_SYSTEM_INFO': system_info,
+        'REGION': sites['region'][site_idx],
+        'PROVINCE': sites['province'][site_idx],
+        'CITY_OR_DATI_II': sites['city'][site_idx],
+        'CLUTTER': np.array(CLUTTERS, dtype=object)[rng.integers(0, len(CLUTTERS), rows)],
+        'Vendor': np.array(VENDORS, dtype=object)[rng.integers(0, len(VENDORS), rows)],
+        'LAC': sites['lac'][site_idx],
+        'PCI': rng.integers(0, 504, rows),
+        'TAC_4G': sites['lac'][site_idx] + 1,
+        'BCCH_OR_TRX1_Freq': rng.integers(1, 1024, rows),
+        'SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR': sites['site_type'][site_idx],
+    }
+    for i in range(EXTRA_COLUMNS):
+        columns[f'PARAM_{i:02d}'] = rng.integers(0, 100000, rows)
+    return pd.DataFrame(columns)
+
+def generate_ndb_csv(output_path, rows, seed=42, chunk_rows=CHUNK_ROWS):
+    """Tulis CSV NDB sintetis sebanyak rows baris, return output_path"""
+    rng = np.random.default_rng(seed)
+    sites = build_sites(max(1, -(-rows // CELLS_PER_SITE)), rng)
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        if rows == 0:
+            build_chunk(sites, 0, 0, seed).to_csv(f, index=False)
+        for start in range(0, rows, chunk_rows):
+            chunk = build_chunk(sites, start, min(chunk_rows, rows - start), seed)
+            chunk.to_csv(f, index=False, header=start == 0)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate CSV NDB sintetis untuk benchmark")
+    parser.add_argument('output', help="Path file CSV output")
+    parser.add_argument('--rows', default='10k', help="Jumlah baris (contoh: 10k, 1m, 10m)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rows = parse_rows(args.rows)
+    generate_ndb_csv(args.output, rows, args.seed)
+    print(f"{args.output}: {rows:,} baris, {os.path.getsize(args.output) / (1024 * 1024):.1f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -72,6 +72,24 @@ def load_column_settings():
         print(f"Failed to load column settings: {e}")
         return get_default_columns()
 
+def read_column_settings_file(settings_file):
+    """
+    Read allowed columns dari file tertentu (format sama dengan column_settings.json)
+    
+    File berisi {"allowed_columns": [...]} atau list kolom langsung. Error tidak ditelan
+    supaya pemanggil (CLI) bisa melaporkannya.
+    """
+    with open(settings_file, 'r', encoding='utf-8') as f:
+        settings_data = json.load(f)
+    
+    if isinstance(settings_data, dict):
+        settings_data = settings_data.get('allowed_columns')
+    
+    if not isinstance(settings_data, list) or not all(isinstance(col, str) for col in settings_data):
+        raise ValueError(f"Format column settings tidak valid: {settings_file}")
+    
+    return settings_data
+
 def get_default_columns():
     """Get default column list"""
     return [
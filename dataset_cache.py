@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dataset Cache
+Cache in-memory (per sesi GUI) frame hasil load + transform dari file input
+
+Frame disimpan tanpa filter baris dan dengan kolom filter (REGION, SITE_ID, koordinat),
+sehingga run ulang dengan filter region / site ID / area atau allowed columns lain cukup
+menerapkan filter, column filter dan generate output tanpa parse CSV lagi.
+Key = path, mtime, ukuran file, versi transform rules dan opsi schema.
+Total memory dibatasi, frame yang paling lama tidak dipakai dilepas lebih dulu (LRU).
+"""
+
+import os
+import gc
+from collections import OrderedDict
+
+DEFAULT_DATASET_CACHE_MB = 2048
+
+def build_dataset_key(csv_path, rules, use_schema=True):
+    """Key dataset: file input (path, mtime, ukuran) + transform rules + opsi schema"""
+    stat = os.stat(csv_path)
+    return (os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size, rules.version, rules.rules_hash,
+            bool(use_schema))
+
+class DatasetCache:
+    """LRU cache frame transform per file input dengan batas total memory"""
+
+    def __init__(self, max_size_mb=DEFAULT_DATASET_CACHE_MB):
+        self.max_size_mb = max_size_mb
+        # key -> (nama kolom input uppercase, frame, ukuran byte)
+        self.entries = OrderedDict()
+
+    @property
+    def enabled(self):
+        return self.max_size_mb > 0
+
+    @property
+    def nbytes(self):
+        return sum(size for _, _, size in self.entries.values())
+
+    def get(self, key, required_columns):
+        """Frame untuk key jika semua kolom input yang dibutuhkan sudah ada, selain itu None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        columns, df, _ = entry
+        if not {str(col).upper() for col in required_columns} <= columns:
+            return None
+
+        self.entries.move_to_end(key)
+        return df
+
+    def put(self, key, input_columns, df):
+        """Simpan frame, return True jika tersimpan (frame lebih besar dari batas tidak disimpan)"""
+        if not self.enabled:
+            return False
+
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_size_mb * 1024 * 1024:
+            return False
+
+        # 1 file hanya 1 entry (versi lama file yang sama tidak berguna lagi)
+        for old_key in [k for k in self.entries if k[0] == key[0]]:
+            del self.entries[old_key]
+
+        self.entries[key] = ({str(col).upper() for col in input_columns}, df, size)
+        self.evict()
+        return True
+
+    def evict(self):
+        """Lepas frame paling lama tidak dipakai sampai total memory <= batas"""
+        limit = self.max_size_mb * 1024 * 1024
+        while self.entries and self.nbytes > limit:
+            self.entries.popitem(last=False)
+
+    def release(self):
+        """Lepas semua frame, return jumlah byte yang dilepas"""
+        size = self.nbytes
+        self.entries.clear()
+        gc.collect()
+        return size
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming Deduplication
+Drop duplicates lintas chunk dengan memory terbatas (dipakai output 1st tier)
+
+- Setiap baris di-hash menjadi digest 64-bit (pd.util.hash_pandas_object)
+- Digest yang sudah ditulis disimpan di hash set open addressing berbasis NumPy (8 byte per slot)
+- Jika jumlah digest melewati batas, digest dan baris kandidat di-spill ke partisi di disk
+  lalu diselesaikan per partisi di akhir
+
+Urutan output selalu mengikuti kemunculan pertama (sama seperti drop_duplicates).
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from main_processor import log_message
+
+# Slot kosong di hash set, digest 0 diganti konstanta lain
+EMPTY_SLOT = np.uint64(0)
+ZERO_DIGEST = np.uint64(0x9E3779B97F4A7C15)
+MAX_LOAD_FACTOR = 0.5
+
+# Batas digest in-memory sebelum spill ke disk (8M digest = tabel ~128 MB)
+DEFAULT_MAX_DIGESTS = 8000000
+# Jumlah partisi spill (dipilih dari bit teratas digest)
+SPILL_PARTITIONS = 64
+SPILL_DTYPE = np.dtype([('digest', '<u8'), ('seq', '<i8')])
+
+def row_digests(df):
+    """
+    Digest 64-bit per baris (semua kolom, tanpa index)
+
+    Digest tergantung dtype (1 vs 1.0 berbeda), jadi semua chunk harus memakai dtype yang sama.
+    """
+    digests = pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64, copy=True)
+    digests[digests == EMPTY_SLOT] = ZERO_DIGEST
+    return digests
+
+def first_occurrences(digests):
+    """Posisi kemunculan pertama setiap digest, urut sesuai posisi"""
+    return np.flatnonzero(~pd.Series(digests, copy=False).duplicated().to_numpy())
+
+class DigestSet:
+    """Hash set uint64 open addressing (linear probing) di array NumPy, insert vectorized"""
+
+    def __init__(self, capacity=1 << 16):
+        self.table = np.zeros(capacity, dtype=np.uint64)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def values(self):
+        return self.table[self.table != EMPTY_SLOT]
+
+    def _grow(self, required):
+        capacity = len(self.table)
+        while required > capacity * MAX_LOAD_FACTOR:
+            capacity *= 2
+        old_values = self.values()
+        self.table = np.zeros(capacity, dtype=np.uint64)
+        self.size = 0
+        self.add_new(old_values)
+
+    def add_new(self, digests):
+        """
+        Tambahkan digest (harus unik dalam 1 panggilan), return mask digest yang belum ada di set
+
+        Semua digest di-probe bersamaan; jika beberapa digest berebut 1 slot kosong,
+        hanya 1 yang menang dan sisanya lanjut probing di iterasi berikutnya.
+        """
+        if self.size + len(digests) > len(self.table) * MAX_LOAD_FACTOR:
+            self._grow(self.size + len(digests))
+
+        mask = np.uint64(len(self.table) - 1)
+        positions = (digests & mask).astype(np.int64)
+        is_new = np.zeros(len(digests), dtype=bool)
+        pending = np.arange(len(digests))
+
+        while len(pending):
+            slots = self.table[positions[pending]]
+            found = slots == digests[pending]
+            empty = slots == EMPTY_SLOT
+            done = found.copy()
+
+            claims = np.flatnonzero(empty)
+            if len(claims):
+                _, first = np.unique(positions[pending[claims]], return_index=True)
+                winners = pending[claims[first]]
+                self.table[positions[winners]] = digests[winners]
+                is_new[winners] = True
+                done[claims[first]] = True
+
+            # Slot berisi digest lain -> probe slot berikutnya (yang kalah rebutan cek ulang slot yang sama)
+            occupied = pending[~found & ~empty]
+            positions[occupied] = (positions[occupied] + 1) & int(mask)
+            pending = pending[~done]
+
+        self.size += int(is_new.sum())
+        return is_new
+
+class StreamingDeduplicator:
+    """
+    Drop duplicates lintas chunk, hasil ditulis ke CSV (urutan kemunculan pertama)
+
+    Selama jumlah digest di bawah max_digests, baris baru langsung ditulis per chunk.
+    Sesudahnya baris kandidat disimpan per chunk di spill_dir bersama digest per partisi,
+    dan finish() memilih kemunculan pertama per partisi sebelum menulis sisa baris.
+    """
+
+    def __init__(self, output_file, max_digests=DEFAULT_MAX_DIGESTS, spill_dir=None, sep=','):
+        self.output_file = output_file
+        self.max_digests = max_digests
+        self.spill_dir = spill_dir
+        self.sep = sep
+        self.digests = DigestSet()
+        self.spilled = False
+        self.columns = None
+        self.header_written = False
+        self.rows_in = 0
+        self.rows_out = 0
+        self.pending_chunks = []
+        self.pending_rows = 0
+
+    def add(self, chunk):
+        """Proses 1 chunk"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        self.rows_in += len(chunk)
+
+        digests = row_digests(chunk)
+        first = first_occurrences(digests)
+
+        if not self.spilled:
+            is_new = self.digests.add_new(digests[first])
+            self._write(chunk.iloc[first[is_new]])
+            if len(self.digests) > self.max_digests:
+                self._start_spill()
+            return
+
+        # Spill mode: keputusan duplikat ditunda sampai finish()
+        seqs = np.arange(self.pending_rows, self.pending_rows + len(first), dtype=np.int64)
+        self._spill_digests(digests[first], seqs)
+        path = os.path.join(self.spill_dir, f"chunk_{len(self.pending_chunks):06d}.pkl")
+        chunk.iloc[first].to_pickle(path)
+        self.pending_chunks.append((path, len(first)))
+        self.pending_rows += len(first)
+
+    def _write(self, df):
+        df.to_csv(self.output_file, sep=self.sep, index=False,
+                  mode='a' if self.header_written else 'w', header=not self.header_written)
+        self.header_written = True
+        self.rows_out += len(df)
+
+    def _start_spill(self):
+        """Pindahkan digest in-memory ke partisi disk (seq -1 = sudah ditulis)"""
+        # Folder sementara di spill_dir (default: folder output), dihapus di finish()
+        parent_dir = self.spill_dir or os.path.dirname(os.path.abspath(self.output_file))
+        os.makedirs(parent_dir, exist_ok=True)
+        self.spill_dir = tempfile.mkdtemp(prefix='ndb_dedup_', dir=parent_dir)
+
+        log_message("INFO", f"Dedup: {len(self.digests):,} digest melewati batas, spill ke {self.spill_dir}")
+        written = self.digests.values()
+        self._spill_digests(written, np.full(len(written), -1, dtype=np.int64))
+        self.digests = None
+        self.spilled = True
+
+    def _spill_digests(self, digests, seqs):
+        records = np.empty(len(digests), dtype=SPILL_DTYPE)
+        records['digest'] = digests
+        records['seq'] = seqs
+
+        shift = np.uint64(64 - int(np.log2(SPILL_PARTITIONS)))
+        partitions = (digests >> shift).astype(np.int64)
+        order = np.argsort(partitions, kind='stable')
+        records, partitions = records[order], partitions[order]
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(partitions, minlength=SPILL_PARTITIONS))])
+
+        for partition in np.flatnonzero(np.diff(bounds)):
+            with open(os.path.join(self.spill_dir, f"part_{partition:03d}.bin"), 'ab') as f:
+                records[bounds[partition]:bounds[partition + 1]].tofile(f)
+
+    def finish(self):
+        """Selesaikan baris yang di-spill (jika ada), return jumlah baris output"""
+        try:
+            if self.spilled:
+                keep = np.zeros(self.pending_rows, dtype=bool)
+                for partition in range(SPILL_PARTITIONS):
+                    path = os.path.join(self.spill_dir, f"part_{partition:03d}.bin")
+                    if not os.path.exists(path):
+                        continue
+                    records = np.fromfile(path, dtype=SPILL_DTYPE)
+                    records = records[np.lexsort((records['seq'], records['digest']))]
+                    first = np.ones(len(records), dtype=bool)
+                    first[1:] = records['digest'][1:] != records['digest'][:-1]
+                    winners = records['seq'][first]
+                    keep[winners[winners >= 0]] = True
+
+                offset = 0
+                for path, rows in self.pending_chunks:
+                    chunk = pd.read_pickle(path)
+                    self._write(chunk[keep[offset:offset + rows]])
+                    offset += rows
+
+            if not self.header_written:
+                self._write(pd.DataFrame(columns=self.columns or []))
+
+            return self.rows_out
+
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """Hapus file spill"""
+        if self.spilled and self.spill_dir and os.path.isdir(self.spill_dir):
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
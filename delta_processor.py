@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Delta Processor
+Incremental processing antar snapshot NDB (dump harian)
+
+State run sebelumnya disimpan di 1 file .npz per input (<input>_delta_state.npz): key per baris (CELL_NAME + CELL_ID), digest
+64-bit kolom input per baris, dan byte range setiap baris di 3 output. Run berikutnya:
+- parse kolom yang dibutuhkan seperti biasa lalu hitung digest per baris
+- baris ADDED / CHANGED saja yang di-transform, divalidasi dan di-render ke CSV
+- baris yang tidak berubah disalin langsung (byte range) dari output run sebelumnya
+- daftar perubahan (ADDED / CHANGED / REMOVED) ditulis ke <input>_delta.csv
+
+Jika setting, tipe kolom input atau output lama berubah, run otomatis menjadi full run
+(semua baris di-render) dan state baru tetap disimpan.
+"""
+
+import os
+import json
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from main_processor import (log_message, NDBDataProcessor, FinalOutputGenerator, generate_output_names,
+                            get_base_filename, resolve_reader_engine)
+from site_filter import SiteIdFilter
+from spatial_filter import SpatialFilter
+from dedup import row_digests, first_occurrences
+
+STATE_VERSION = 1
+
+# Key baris antar snapshot (case-insensitive), key duplikat diberi nomor kemunculan
+KEY_COLUMNS = ['CELL_NAME', 'CELL_ID']
+KEY_SEPARATOR = '\x1f'
+
+# Baris per batch saat render CSV dan ukuran blok copy dari output lama
+RENDER_CHUNK_SIZE = 200000
+COPY_BLOCK_SIZE = 16 * 1024 * 1024
+
+CHANGE_ADDED = 'ADDED'
+CHANGE_CHANGED = 'CHANGED'
+CHANGE_REMOVED = 'REMOVED'
+
+def get_delta_filename(csv_path):
+    """Nama file daftar perubahan: <input>_delta.csv"""
+    return f"{get_base_filename(csv_path)}_delta.csv"
+
+def get_state_filename(csv_path):
+    """Nama file state delta: <input>_delta_state.npz"""
+    return f"{get_base_filename(csv_path)}_delta_state.npz"
+
+def build_row_keys(df):
+    """Key text per baris (CELL_NAME, CELL_ID, nomor kemunculan jika key dobel)"""
+    columns_upper = {str(col).upper(): col for col in df.columns}
+    missing = [col for col in KEY_COLUMNS if col not in columns_upper]
+    if missing:
+        raise ValueError(f"Kolom key {', '.join(missing)} tidak ditemukan untuk incremental mode")
+
+    # Text (bukan nilai bertipe) supaya key stabil walaupun dtype kolom berubah antar dump
+    parts = [df[columns_upper[col]].astype('string').fillna('').astype(object) for col in KEY_COLUMNS]
+    keys = parts[0].str.cat(parts[1:], sep=KEY_SEPARATOR)
+
+    occurrence = keys.groupby(keys, sort=False).cumcount()
+    repeated = occurrence.to_numpy() > 0
+    if repeated.any():
+        keys = keys.where(~repeated, keys + KEY_SEPARATOR + occurrence.astype(str))
+    return keys
+
+def hash_keys(keys):
+    """Hash 64-bit key text"""
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64, copy=True)
+
+def encode_keys(keys):
+    """Key text ke blob UTF-8 + offset (disimpan di state tanpa pickle)"""
+    encoded = keys.str.encode('utf-8')
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(encoded.str.len().to_numpy(dtype=np.int64), out=offsets[1:])
+    blob = np.frombuffer(b''.join(encoded.tolist()), dtype=np.uint8)
+    return blob, offsets
+
+def decode_keys(blob, offsets, positions):
+    """Key text untuk posisi tertentu dari blob state"""
+    return [blob[offsets[i]:offsets[i + 1]].tobytes().decode('utf-8') for i in positions]
+
+def record_ends(data):
+    """Posisi akhir (exclusive) setiap record CSV di buffer, newline di dalam quote diabaikan"""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buffer == 10)
+    quotes = np.flatnonzero(buffer == 34)
+    inside_quote = np.searchsorted(quotes, newlines) % 2 == 1
+    return newlines[~inside_quote] + 1
+
+def file_fingerprint(path):
+    """Path absolut, ukuran dan mtime output (cek output lama belum diubah)"""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def build_settings(processor):
+    """Setting yang mempengaruhi isi output (harus sama supaya output lama bisa dipakai ulang)"""
+    rules = processor.transform_rules
+    settings = {
+        'allowed_columns': list(processor.allowed_columns_raw),
+        'transform_input_columns': list(processor.transform_input_columns),
+        'regions': sorted(processor.region_filter),
+        'site_filter': processor.site_id_filter.cache_key() if processor.site_id_filter else None,
+        'spatial_filter': processor.spatial_filter.cache_key() if processor.spatial_filter is not None else None,
+        'rules': [rules.version, rules.rules_hash],
+        'use_schema': processor.use_schema,
+    }
+    # Round trip JSON supaya sama persis dengan setting yang dibaca dari state
+    return json.loads(json.dumps(settings))
+
+def load_state(state_path):
+    """Load state run sebelumnya, None jika belum ada atau tidak valid"""
+    if not state_path or not os.path.exists(state_path):
+        return None
+
+    try:
+        with np.load(state_path, allow_pickle=False) as data:
+            state = {name: data[name] for name in data.files}
+        state['meta'] = json.loads(str(state['meta']))
+        if state['meta'].get('version') != STATE_VERSION:
+            log_message("WARNING", "Versi state delta berbeda, state lama diabaikan")
+            return None
+        return state
+
+    except Exception as e:
+        log_message("WARNING", f"State delta tidak bisa dibaca ({str(e)}), state lama diabaikan")
+        return None
+
+def save_state(state_path, arrays, meta):
+    """Simpan state (tulis ke file sementara lalu rename)"""
+    temp_path = state_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+    os.replace(temp_path, state_path)
+
+class RowRenderer:
+    """Render baris DataFrame ke CSV di file sementara, simpan byte range setiap baris"""
+
+    def __init__(self, directory=None):
+        self.handle = tempfile.TemporaryFile(prefix='ndb_delta_', dir=directory)
+        self.size = 0
+
+    def render(self, df, sep):
+        """Return (starts, ends) byte range setiap baris df di file sementara"""
+        starts = np.empty(len(df), dtype=np.int64)
+        ends = np.empty(len(df), dtype=np.int64)
+
+        for offset in range(0, len(df), RENDER_CHUNK_SIZE):
+            chunk = df.iloc[offset:offset + RENDER_CHUNK_SIZE]
+            data = chunk.to_csv(sep=sep, index=False, header=False).encode('utf-8')
+            chunk_ends = record_ends(data)
+            if len(chunk_ends) != len(chunk):
+                raise ValueError(f"Render CSV menghasilkan {len(chunk_ends)} record untuk {len(chunk)} baris")
+
+            ends[offset:offset + len(chunk)] = chunk_ends + self.size
+            starts[offset:offset + len(chunk)] = np.concatenate([[0], chunk_ends[:-1]]) + self.size
+            self.handle.write(data)
+            self.size += len(data)
+
+        return starts, ends
+
+    def close(self):
+        self.handle.close()
+
+def _copy_range(source, target, start, end):
+    source.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = source.read(min(COPY_BLOCK_SIZE, remaining))
+        if not block:
+            raise IOError("Output lama lebih pendek dari state delta")
+        target.write(block)
+        remaining -= len(block)
+
+def write_output(path, header, rendered, starts, ends, old_path, renderer):
+    """
+    Tulis output: header lalu setiap baris dari output lama (rendered False) atau hasil render
+
+    Baris berurutan yang juga berurutan di file sumbernya disalin sebagai 1 blok.
+    Return (starts, ends) byte range setiap baris di output baru.
+    """
+    lengths = ends - starts
+    new_ends = len(header) + np.cumsum(lengths)
+    new_starts = new_ends - lengths
+
+    if len(starts):
+        breaks = np.flatnonzero((rendered[1:] != rendered[:-1]) | (starts[1:] != ends[:-1])) + 1
+        run_starts = np.concatenate([[0], breaks])
+        run_ends = np.concatenate([breaks, [len(starts)]])
+    else:
+        run_starts = run_ends = np.zeros(0, dtype=np.int64)
+
+    old_file = open(old_path, 'rb') if not rendered.all() else None
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as out:
+            out.write(header)
+            renderer.handle.flush()
+            for first, last in zip(run_starts, run_ends):
+                source = renderer.handle if rendered[first] else old_file
+                _copy_range(source, out, starts[first], ends[last - 1])
+    finally:
+        if old_file is not None:
+            old_file.close()
+
+    os.replace(temp_path, path)
+    return new_starts, new_ends
+
+def check_reusable(state, settings, input_dtypes):
+    """Return alasan output lama tidak bisa dipakai ulang, None jika bisa"""
+    if state is None:
+        return "state run sebelumnya belum ada"
+
+    meta = state['meta']
+    if meta['settings'] != settings:
+        return "setting kolom / filter / transform rules berubah"
+    if meta['input_dtypes'] != input_dtypes:
+        return "tipe kolom input berubah"
+
+    for key, fingerprint in meta['outputs'].items():
+        path = fingerprint['path']
+        if not os.path.exists(path) or file_fingerprint(path) != fingerprint:
+            return f"output sebelumnya ({os.path.basename(path)}) hilang atau sudah diubah"
+
+    return None
+
+def _align_rawndb_dtypes(raw_sub, raw_dtypes):
+    """
+    Samakan dtype kolom RAWNDB baris yang di-render dengan output lama (mis. Sector int -> float)
+
+    Return False jika dtype tidak bisa disamakan tanpa mengubah isi.
+    """
+    for col, dtype in raw_dtypes:
+        if str(raw_sub[col].dtype) == dtype:
+            continue
+        if np.dtype(dtype).kind != 'f' or raw_sub[col].dtype.kind not in 'iuf':
+            return False
+        raw_sub[col] = raw_sub[col].astype(dtype)
+    return True
+
+def build_outputs(processor, df, output_names, state, reuse_pos):
+    """
+    Tulis 3 output, baris dengan reuse_pos >= 0 disalin dari output lama
+
+    Return (arrays state, meta outputs) atau None jika output lama tidak kompatibel
+    (pemanggil lalu mengulang sebagai full run).
+    """
+    n = len(df)
+    reused = reuse_pos >= 0
+    render_rows = np.flatnonzero(~reused)
+    old_pos = reuse_pos[reused]
+    meta = state['meta'] if state is not None else None
+
+    # Transform + validasi hanya baris yang berubah (index = posisi baris di df)
+    subset = df if len(render_rows) == n else df.iloc[render_rows]
+    final_sub = processor.filter_allowed_columns(processor.transform_data(subset, verbose=False), verbose=False)
+    generator = FinalOutputGenerator(df=final_sub)
+    raw_sub = generator.build_rawndb_frame(verbose=False)
+    if raw_sub is None:
+        raise Exception("Failed to build RAWNDB frame")
+
+    txt_columns = [str(col) for col in final_sub.columns]
+    raw_columns = [str(col) for col in raw_sub.columns]
+    if meta is not None and (meta['txt_columns'] != txt_columns or meta['raw_columns'] != raw_columns):
+        log_message("INFO", "Kolom output berbeda dengan run sebelumnya")
+        return None
+
+    # Baris RAWNDB dan Sector kosong per baris (Sector float jika ada yang kosong di file)
+    raw_rows = raw_sub.index.to_numpy()
+    in_raw = np.zeros(n, dtype=bool)
+    sector_nan = np.zeros(n, dtype=bool)
+    if meta is not None:
+        in_raw[reused] = state['raw_start'][old_pos] >= 0
+        sector_nan[reused] = state['sector_nan'][old_pos]
+    in_raw[raw_rows] = True
+    if 'Sector' in raw_sub.columns:
+        sector_nan[raw_rows] = raw_sub['Sector'].isna().to_numpy()
+    sector_float = bool(sector_nan[in_raw].any())
+
+    if meta is not None and len(raw_sub):
+        if sector_float != meta['sector_float'] or not _align_rawndb_dtypes(raw_sub, meta['raw_dtypes']):
+            log_message("INFO", "Format kolom RAWNDB berbeda dengan run sebelumnya")
+            return None
+    raw_dtypes = meta['raw_dtypes'] if meta is not None else [[str(col), str(dtype)] for col, dtype in raw_sub.dtypes.items()]
+
+    output_dir = os.path.dirname(os.path.abspath(output_names['processed_txt']))
+    old_outputs = meta['outputs'] if meta is not None else {}
+    renderer = RowRenderer(output_dir)
+    try:
+        # 1. TXT: semua baris df
+        starts = np.zeros(n, dtype=np.int64)
+        ends = np.zeros(n, dtype=np.int64)
+        if meta is not None:
+            starts[reused] = state['txt_start'][old_pos]
+            ends[reused] = state['txt_end'][old_pos]
+        starts[render_rows], ends[render_rows] = renderer.render(final_sub, '\t')
+        header = final_sub.iloc[:0].to_csv(sep='\t', index=False).encode('utf-8')
+        txt_start, txt_end = write_output(output_names['processed_txt'], header, ~reused, starts, ends,
+                                          old_outputs.get('processed_txt', {}).get('path'), renderer)
+
+        # 2. RAWNDB: baris yang lolos validasi, urutan df
+        raw_positions = np.flatnonzero(in_raw)
+        raw_reused = reused[raw_positions]
+        starts = np.zeros(len(raw_positions), dtype=np.int64)
+        ends = np.zeros(len(raw_positions), dtype=np.int64)
+        if meta is not None:
+            starts[raw_reused] = state['raw_start'][reuse_pos[raw_positions[raw_reused]]]
+            ends[raw_reused] = state['raw_end'][reuse_pos[raw_positions[raw_reused]]]
+        starts[~raw_reused], ends[~raw_reused] = renderer.render(raw_sub, ',')
+        header = raw_sub.iloc[:0].to_csv(index=False).encode('utf-8')
+        new_starts, new_ends = write_output(output_names['rawndb_csv'], header, ~raw_reused, starts, ends,
+                                            old_outputs.get('rawndb_csv', {}).get('path'), renderer)
+        raw_start = np.full(n, -1, dtype=np.int64)
+        raw_end = np.full(n, -1, dtype=np.int64)
+        raw_start[raw_positions] = new_starts
+        raw_end[raw_positions] = new_ends
+
+        # 3. 1st tier: kemunculan pertama per digest, isi baris dengan digest sama identik
+        simple_sub = generator.build_simple_frame(raw_sub)
+        simple_digest = np.zeros(n, dtype=np.uint64)
+        if meta is not None:
+            simple_digest[reused] = state['simple_digest'][old_pos]
+        simple_digest[raw_rows] = row_digests(simple_sub)
+
+        raw_digests = simple_digest[raw_positions]
+        keep = first_occurrences(raw_digests)
+        kept_rows = raw_positions[keep]
+        kept_digests = raw_digests[keep]
+
+        file_pos = np.full(len(keep), -1, dtype=np.int64)
+        if meta is not None and len(keep):
+            file_pos = pd.Index(state['simple_file_digest']).get_indexer(kept_digests)
+        from_render = file_pos < 0
+        if (from_render & reused[kept_rows]).any():
+            log_message("INFO", "Output 1st tier lama tidak lengkap")
+            return None
+
+        starts = np.zeros(len(keep), dtype=np.int64)
+        ends = np.zeros(len(keep), dtype=np.int64)
+        if meta is not None:
+            starts[~from_render] = state['simple_file_start'][file_pos[~from_render]]
+            ends[~from_render] = state['simple_file_end'][file_pos[~from_render]]
+        starts[from_render], ends[from_render] = renderer.render(simple_sub.loc[kept_rows[from_render]], ',')
+        header = simple_sub.iloc[:0].to_csv(index=False).encode('utf-8')
+        simple_start, simple_end = write_output(output_names['rawndb_simple_csv'], header, from_render,
+                                                starts, ends, old_outputs.get('rawndb_simple_csv', {}).get('path'),
+                                                renderer)
+    finally:
+        renderer.close()
+
+    arrays = {
+        'txt_start': txt_start,
+        'txt_end': txt_end,
+        'raw_start': raw_start,
+        'raw_end': raw_end,
+        'sector_nan': sector_nan,
+        'simple_digest': simple_digest,
+        'simple_file_digest': kept_digests,
+        'simple_file_start': simple_start,
+        'simple_file_end': simple_end,
+    }
+    output_meta = {
+        'txt_columns': txt_columns,
+        'raw_columns': raw_columns,
+        'raw_dtypes': raw_dtypes,
+        'sector_float': sector_float,
+        'outputs': {key: file_fingerprint(path) for key, path in output_names.items()},
+    }
+    log_message("DELTA", f"Render {len(render_rows):,} baris, salin {int(reused.sum()):,} baris dari output lama")
+    return arrays, output_meta
+
+def write_delta_file(delta_file, keys, added, changed, removed_keys):
+    """Tulis daftar perubahan: CHANGE, CELL_NAME, CELL_ID"""
+    rows = np.flatnonzero(added | changed)
+    changes = np.where(added[rows], CHANGE_ADDED, CHANGE_CHANGED)
+    key_text = list(keys.iloc[rows]) + list(removed_keys)
+    change = list(changes) + [CHANGE_REMOVED] * len(removed_keys)
+
+    parts = [key.split(KEY_SEPARATOR) for key in key_text]
+    delta_df = pd.DataFrame({
+        'CHANGE': change,
+        KEY_COLUMNS[0]: [part[0] for part in parts],
+        KEY_COLUMNS[1]: [part[1] for part in parts],
+    })
+    delta_df.to_csv(delta_file, index=False)
+    return len(delta_df)
+
+def process_incremental(csv_path, state_path=None, regions=None, site_ids=None, spatial=None,
+                        allowed_columns=None, engine='pandas', force_full=False, output_dir=None):
+    """
+    Incremental run terhadap state run sebelumnya (lihat docstring modul)
+
+    Output ditulis ke output_dir (default folder kerja). state_path default <input>_delta_state.npz
+    di folder output, sehingga input yang berbeda tidak saling menimpa state.
+    force_full = render semua baris (delta tetap dihitung dan state diperbarui).
+    """
+    try:
+        log_message("START", "=== NDB CSV Processing (Incremental) ===")
+        log_message("INPUT", f"CSV File: {csv_path}")
+        overall_start = time.time()
+
+        output_names = generate_output_names(csv_path, output_dir)
+        delta_file = os.path.join(output_dir or '', get_delta_filename(csv_path))
+        state_path = state_path or os.path.join(output_dir or '', get_state_filename(csv_path))
+
+        processor = NDBDataProcessor(csv_path)
+        if allowed_columns is not None:
+            processor.allowed_columns_raw = allowed_columns
+        # Engine polars tidak menghasilkan frame per baris, pakai reader pandas/pyarrow
+        processor.reader_engine = resolve_reader_engine(engine) if engine != 'polars' else 'pandas'
+        processor.region_filter = list(regions or [])
+        processor.site_id_filter = SiteIdFilter.coerce(site_ids)
+        processor.spatial_filter = SpatialFilter.coerce(spatial)
+        # Key selalu di-parse walaupun tidak ada di allowed columns
+        processor.transform_input_columns = processor.transform_input_columns + KEY_COLUMNS
+
+        if not processor.load_data():
+            raise Exception("Failed to load CSV data")
+        df = processor.df.reset_index(drop=True)
+        processor.df = None
+
+        # Key dan digest per baris
+        step_start = time.time()
+        keys = build_row_keys(df)
+        key_hashes = hash_keys(keys)
+        digests = row_digests(df)
+        log_message("TIMING", f"Digest {len(df):,} baris: {time.time() - step_start:.2f} seconds")
+
+        settings = build_settings(processor)
+        input_dtypes = [[str(col), str(dtype)] for col, dtype in df.dtypes.items()]
+        state = load_state(state_path)
+        if state is not None and not pd.Index(state['key_hash']).is_unique:
+            log_message("WARNING", "Key state delta tidak unik, state lama diabaikan")
+            state = None
+
+        # Bandingkan dengan run sebelumnya
+        n = len(df)
+        old_pos = np.full(n, -1, dtype=np.int64)
+        removed = np.zeros(0, dtype=np.int64)
+        if state is not None:
+            old_pos = pd.Index(state['key_hash']).get_indexer(key_hashes)
+            seen = np.zeros(len(state['key_hash']), dtype=bool)
+            seen[old_pos[old_pos >= 0]] = True
+            removed = np.flatnonzero(~seen)
+
+        added = old_pos < 0
+        unchanged = np.zeros(n, dtype=bool)
+        if state is not None:
+            unchanged[~added] = state['digest'][old_pos[~added]] == digests[~added]
+        changed = ~added & ~unchanged
+
+        log_message("DELTA", f"Added: {int(added.sum()):,}, changed: {int(changed.sum()):,}, "
+                             f"removed: {len(removed):,}, unchanged: {int(unchanged.sum()):,}")
+
+        removed_keys = decode_keys(state['key_blob'], state['key_offsets'], removed) if len(removed) else []
+        delta_rows = write_delta_file(delta_file, keys, added, changed, removed_keys)
+        log_message("SUCCESS", f"{delta_file} tersimpan: {delta_rows:,} perubahan")
+
+        # Output: salin baris yang tidak berubah dari output lama jika memungkinkan
+        step_start = time.time()
+        reason = "full run diminta" if force_full else check_reusable(state, settings, input_dtypes)
+        result = None
+        if reason is None:
+            result = build_outputs(processor, df, output_names, state, np.where(unchanged, old_pos, -1))
+            if result is None:
+                reason = "format output berubah"
+        if result is None:
+            log_message("INFO", f"Full run: {reason}")
+            result = build_outputs(processor, df, output_names, None, np.full(n, -1, dtype=np.int64))
+        arrays, output_meta = result
+        log_message("TIMING", f"Output ditulis dalam {time.time() - step_start:.2f} seconds")
+
+        for key, filename in output_names.items():
+            size_mb = os.path.getsize(filename) / (1024 * 1024)
+            log_message("INFO", f"- {filename}: {size_mb:.1f} MB")
+
+        key_blob, key_offsets = encode_keys(keys)
+        arrays.update({'key_hash': key_hashes, 'digest': digests, 'key_blob': key_blob, 'key_offsets': key_offsets})
+        meta = {
+            'version': STATE_VERSION,
+            'input': os.path.abspath(csv_path),
+            'rows': n,
+            'created': time.time(),
+            'settings': settings,
+            'input_dtypes': input_dtypes,
+        }
+        meta.update(output_meta)
+        save_state(state_path, arrays, meta)
+        log_message("INFO", f"State delta tersimpan: {os.path.abspath(state_path)}")
+
+        total_time = time.time() - overall_start
+        log_message("COMPLETE", "=== INCREMENTAL PROCESSING COMPLETED ===")
+        log_message("TIMING", f"Total processing time: {total_time:.2f} seconds")
+        return True
+
+    except Exception as e:
+        log_message("ERROR", f"Incremental processing failed: {str(e)}")
+        return False
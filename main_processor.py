@@ -7,22 +7,355 @@ Integrated script untuk memproses file CSV NDB menjadi berbagai output
 
 import os
 import sys
+import io
+import re
+import csv
+import json
 import time
+import argparse
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from processing_options import DEFAULT_CHUNK_SIZE, PROCESSING_ENGINES
+from transform_rules import get_transform_rules
+from column_settings import read_column_settings_file
+from site_filter import SiteIdFilter
+from spatial_filter import SpatialFilter, find_coordinate_columns, LONGITUDE_COLUMNS, LATITUDE_COLUMNS
+
+# Copy-on-write: subset, rename dan kolom baru tidak menduplikasi kolom yang tidak diubah
+# (pandas 3 selalu copy-on-write, option ini hanya ada di pandas 2.x)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Kolom yang dipakai filter baris region dan site ID (case-insensitive)
+REGION_COLUMN = 'REGION'
+SITE_ID_COLUMN = 'SITE_ID'
+
+# Estimasi peak memory 1 file saat batch: ~1.5x ukuran data yang di-load sekaligus
+# (load penuh = ukuran file, streaming mode = 1 chunk x estimasi ukuran 1 baris CSV)
+BATCH_MEMORY_FACTOR = 1.5
+ESTIMATED_ROW_BYTES = 1000
+
+# Exit code CLI (argparse memakai 2 untuk argumen tidak valid)
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NO_INPUT = 3
+
+# Step yang bisa dipilih dari CLI
+CLI_STEPS = ['all', '2', '4', 'partition', 'incremental']
+
+# Opsi CLI yang tidak dipakai step tertentu (ditolak supaya tidak diabaikan diam-diam): step -> [(flag, dest)]
+CLI_UNUSED_OPTIONS = {
+    '4': [('--region', 'region'), ('--site-ids', 'site_ids'), ('--area', 'area'),
+          ('--columns-file', 'columns_file'), ('--use-site-index', 'use_site_index')],
+    'incremental': [('--chunk-size', 'chunk_size'), ('--use-site-index', 'use_site_index')],
+}
+
+# Schema dtype bawaan untuk kolom NDB (nama kolom dicocokkan case-insensitive)
+# Hanya text dengan kardinalitas rendah -> category. Kolom numerik (koordinat, azimuth, beamwidth,
+# CELL_ID, LAC, ...) tetap memakai inferensi pandas (float64 / int64) supaya angka yang ditulis ke
+# output sama persis: float32 memotong presisi koordinat dan Int64 / float32 mengubah format angka.
+NDB_DTYPE_SCHEMA = {
+    'REGION': 'category',
+    'PROVINCE': 'category',
+    'CITY_OR_DATI_II': 'category',
+    'CITY': 'category',
+    'BRANCH': 'category',
+    'AREA': 'category',
+    'CLUTTER': 'category',
+    'VENDOR': 'category',
+    'BTS_VENDOR': 'category',
+    'CELL_SYSTEM_INFO': 'category',
+    'SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR': 'category',
+}
+
 def log_message(step, message):
     """Fungsi untuk logging dengan format yang konsisten"""
     timestamp = time.strftime("%H:%M:%S")
     print(f"[{timestamp}] [{step}] {message}")
 
+def get_schema_dtypes(columns):
+    """Map nama kolom yang ada ke dtype dari NDB_DTYPE_SCHEMA"""
+    return {col: NDB_DTYPE_SCHEMA[str(col).upper()] for col in columns if str(col).upper() in NDB_DTYPE_SCHEMA}
+
+def apply_schema_dtypes(df, dtypes):
+    """Convert kolom ke dtype schema, kolom yang tidak valid dibiarkan apa adanya"""
+    skipped = []
+    for col, dtype in dtypes.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        try:
+            df[col] = df[col].astype(dtype)
+        except (ValueError, TypeError):
+            skipped.append(col)
+    return skipped
+
+def restore_numeric_categories(df, dtypes):
+    """
+    Kolom category yang semua nilainya angka dikembalikan ke numerik
+
+    Hasilnya sama dengan inferensi pandas tanpa schema (contoh AREA "01" -> 1), sehingga
+    output tidak berubah karena schema. Return list kolom yang dikembalikan.
+    """
+    restored = []
+    for col, dtype in dtypes.items():
+        if dtype != 'category' or col not in df.columns or not isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        categories = df[col].cat.categories
+        if len(categories) == 0 or pd.to_numeric(categories.astype(object), errors='coerce').isna().any():
+            continue
+        df[col] = pd.to_numeric(df[col].astype(object))
+        restored.append(col)
+    return restored
+
+def record_chunk_dtypes(seen, df):
+    """
+    Catat dtype setiap kolom 1 chunk ke seen (kolom -> set nama dtype)
+
+    Kolom float yang seluruhnya kosong dicatat sebagai 'empty': ditulis sama ("") untuk dtype
+    apa pun, tapi tetap membuat kolom integer menjadi float saat digabung.
+    """
+    for col, dtype in df.dtypes.items():
+        name = dtype.name
+        if name == 'float64' and len(df) and df[col].isna().all():
+            name = 'empty'
+        seen.setdefault(col, set()).add(name)
+
+def merge_chunk_dtypes(seen, category_columns=()):
+    """
+    Gabung dtype per chunk (hasil record_chunk_dtypes) seperti inferensi load penuh
+
+    int64 + float64 -> float64, campuran lain -> text. Kolom category_columns tetap category kecuali
+    seluruhnya numerik (sama seperti restore_numeric_categories). Return dict kolom -> dtype.
+    """
+    dtypes = {}
+    for col, names in seen.items():
+        names = set(names)
+        if 'empty' in names:
+            names.discard('empty')
+            if names != {'object'}:
+                names.add('float64')
+        if len(names) == 1:
+            dtype = names.pop()
+        elif names == {'int64', 'float64'}:
+            dtype = 'float64'
+        else:
+            dtype = 'object'
+        if dtype == 'object' and col in category_columns:
+            dtype = 'category'
+        dtypes[col] = dtype
+    return dtypes
+
+def chunk_dtypes_consistent(seen, dtypes, strict_columns=()):
+    """
+    True jika semua chunk sudah memakai dtype gabungan, sehingga output tidak perlu dibaca ulang
+
+    Chunk 'empty' dianggap sama kecuali kolom strict_columns (digest dedup tergantung dtype NaN).
+    """
+    for col, names in seen.items():
+        dtype = 'object' if dtypes[col] == 'category' else dtypes[col]
+        allowed = {dtype}
+        if col not in strict_columns or dtype == 'float64':
+            allowed.add('empty')
+        if not names <= allowed:
+            return False
+    return True
+
+def infer_csv_dtypes(csv_path, sep=',', usecols=None, chunk_size=DEFAULT_CHUNK_SIZE, category_columns=()):
+    """
+    Inferensi dtype kolom 1x untuk seluruh file (1 pass per chunk, memory sebesar 1 chunk)
+
+    Parser pandas menginferensi dtype per chunk, sehingga kolom yang sama bisa int64 di satu
+    chunk dan float64 di chunk lain ("30" vs "30.0"). Hasil per chunk digabung dengan
+    merge_chunk_dtypes. Return dict kolom -> dtype.
+    """
+    seen = {}
+    for chunk in pd.read_csv(csv_path, sep=sep, usecols=usecols, chunksize=chunk_size, low_memory=False):
+        record_chunk_dtypes(seen, chunk)
+    return merge_chunk_dtypes(seen, category_columns)
+
+def estimate_untyped_memory(df, dtypes):
+    """Estimasi memory kolom schema jika di-load tanpa dtype (object/float64)"""
+    total = 0
+    for col in dtypes:
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Setiap baris menyimpan pointer + objek string Python sendiri
+            counts = series.value_counts(dropna=True)
+            total += len(series) * 8
+            total += sum(sys.getsizeof(str(value)) * count for value, count in counts.items())
+            total += int(series.isna().sum()) * sys.getsizeof(np.nan)
+        else:
+            total += len(series) * 8
+    return total
+
+def resolve_reader_engine(engine):
+    """Cek engine reader yang diminta, fallback ke pandas jika dependency tidak ada"""
+    if engine == 'pyarrow':
+        try:
+            import pyarrow.csv  # noqa: F401
+            return 'pyarrow'
+        except ImportError:
+            log_message("WARNING", "pyarrow tidak terinstall, fallback ke engine pandas")
+    elif engine != 'pandas':
+        log_message("WARNING", f"Engine '{engine}' tidak dikenal, fallback ke engine pandas")
+    return 'pandas'
+
+def resolve_processing_engine(engine):
+    """Cek engine processing, polars fallback ke pandas jika tidak terinstall"""
+    if engine == 'polars':
+        from polars_engine import is_polars_available
+        if is_polars_available():
+            return 'polars'
+        log_message("WARNING", "polars tidak terinstall, fallback ke engine pandas")
+        return 'pandas'
+    return engine
+
+def run_polars_steps(csv_path, output_names, steps, allowed_columns=None, regions=None, site_ids=None,
+                     spatial=None):
+    """Jalankan step dengan engine polars, return False jika harus fallback ke pandas"""
+    try:
+        from polars_engine import run_polars_pipeline
+        return run_polars_pipeline(csv_path, output_names, allowed_columns, steps,
+                                   regions=regions, site_ids=site_ids, spatial=spatial)
+    except Exception as e:
+        log_message("WARNING", f"Engine polars gagal ({str(e)}), fallback ke engine pandas")
+        return False
+
+def read_csv_header(csv_path, sep=','):
+    """Read nama kolom CSV tanpa parsing data"""
+    return pd.read_csv(csv_path, sep=sep, nrows=0).columns
+
+def _read_csv_pandas(csv_path, sep, usecols, dtypes):
+    """Read CSV dengan parser C pandas (single thread)"""
+    try:
+        return pd.read_csv(csv_path, sep=sep, usecols=usecols, dtype=dtypes, low_memory=False)
+    except (ValueError, TypeError) as e:
+        log_message("WARNING", f"Schema parse gagal ({str(e)}), convert per kolom...")
+        category_dtypes = {col: dtype for col, dtype in dtypes.items() if dtype == 'category'}
+        # Buffer in-memory (site index) dibaca ulang dari awal
+        if hasattr(csv_path, 'seek'):
+            csv_path.seek(0)
+        df = pd.read_csv(csv_path, sep=sep, usecols=usecols, dtype=category_dtypes, low_memory=False)
+        skipped = apply_schema_dtypes(df, dtypes)
+        if skipped:
+            log_message("WARNING", f"Kolom tanpa schema (nilai tidak valid): {skipped}")
+        return df
+
+def _arrow_string_mapper(arrow_type):
+    """Simpan kolom string sebagai string Arrow-backed saat convert ke pandas"""
+    import pyarrow as pa
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype("pyarrow")
+    return None
+
+def _read_csv_pyarrow(csv_path, sep, names, dtypes):
+    """Read CSV dengan reader Arrow multithread, return None jika harus fallback"""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    # Nama kolom duplikat tidak bisa dipilih by name di Arrow
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        raw_header = next(csv.reader(f, delimiter=sep), [])
+    if len(set(raw_header)) != len(raw_header):
+        log_message("WARNING", "Header berisi nama kolom duplikat, fallback ke engine pandas")
+        return None
+    
+    arrow_types = {
+        'category': pa.dictionary(pa.int32(), pa.string()),
+    }
+    read_options = pa_csv.ReadOptions(use_threads=True)
+    parse_options = pa_csv.ParseOptions(delimiter=sep)
+    
+    # Kolom tanggal tetap dibaca sebagai text seperti parser pandas
+    with pa_csv.open_csv(csv_path, read_options=read_options, parse_options=parse_options) as reader:
+        text_columns = {field.name: pa.string() for field in reader.schema
+                        if field.name in names and pa.types.is_temporal(field.type)}
+    
+    def read(column_types):
+        convert_options = pa_csv.ConvertOptions(include_columns=names, strings_can_be_null=True,
+                                                column_types={**text_columns, **column_types})
+        table = pa_csv.read_csv(csv_path, read_options=read_options, parse_options=parse_options,
+                                convert_options=convert_options)
+        return table.to_pandas(types_mapper=_arrow_string_mapper)
+    
+    try:
+        try:
+            df = read({col: arrow_types[dtype] for col, dtype in dtypes.items()})
+        except pa.ArrowInvalid as e:
+            log_message("WARNING", f"Schema parse gagal ({str(e)}), convert per kolom...")
+            df = read({col: arrow_types[dtype] for col, dtype in dtypes.items() if dtype == 'category'})
+    except pa.ArrowInvalid as e:
+        log_message("WARNING", f"Arrow reader gagal ({str(e)}), fallback ke engine pandas")
+        return None
+    
+    # Kolom yang gagal di-parse di-convert setelah load
+    skipped = apply_schema_dtypes(df, dtypes)
+    if skipped:
+        log_message("WARNING", f"Kolom tanpa schema (nilai tidak valid): {skipped}")
+    
+    return df
+
+def read_ndb_csv(csv_path, sep=',', usecols=None, use_schema=True, engine='pandas'):
+    """
+    Read CSV NDB dengan engine yang dipilih dan NDB_DTYPE_SCHEMA diterapkan saat parsing
+    
+    usecols berisi posisi kolom (hasil get_required_columns). Engine 'pyarrow' memakai
+    reader Arrow multithread dan menyimpan kolom string sebagai string Arrow-backed.
+    """
+    start_time = time.time()
+    
+    header = read_csv_header(csv_path, sep)
+    names = list(header) if usecols is None else [header[i] for i in usecols]
+    dtypes = get_schema_dtypes(names) if use_schema else {}
+    
+    engine = resolve_reader_engine(engine)
+    df = None
+    if engine == 'pyarrow':
+        df = _read_csv_pyarrow(csv_path, sep, names, dtypes)
+        if df is None:
+            engine = 'pandas'
+    if df is None:
+        df = _read_csv_pandas(csv_path, sep, usecols, dtypes)
+    
+    # Throughput parsing
+    parse_time = max(time.time() - start_time, 1e-6)
+    size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+    log_message("INFO", f"Parse {size_mb:.1f} MB dengan engine {engine}: {parse_time:.2f} detik ({size_mb / parse_time:.1f} MB/s)")
+    
+    if dtypes:
+        restore_numeric_categories(df, dtypes)
+        report_schema_memory(df, dtypes)
+    
+    return df
+
+def report_schema_memory(df, dtypes):
+    """Log memory kolom schema dibandingkan load tanpa dtype"""
+    typed_columns = [col for col in dtypes if col in df.columns]
+    if not typed_columns:
+        return
+    
+    typed_bytes = df[typed_columns].memory_usage(index=False, deep=True).sum()
+    untyped_bytes = estimate_untyped_memory(df, dtypes)
+    saved_mb = (untyped_bytes - typed_bytes) / (1024 * 1024)
+    
+    log_message("INFO", f"Schema dtype: {len(typed_columns)} kolom, {typed_bytes / (1024 * 1024):.2f} MB "
+                        f"(tanpa schema ~{untyped_bytes / (1024 * 1024):.2f} MB, hemat {saved_mb:.2f} MB)")
+
 def get_base_filename(file_path):
     """Extract base filename without extension from file path"""
     return Path(file_path).stem
 
-def generate_output_names(input_csv_path):
-    """Generate output filenames based on input CSV filename"""
+def generate_output_names(input_csv_path, output_dir=None):
+    """Generate output filenames based on input CSV filename (di output_dir jika diisi)"""
     base_name = get_base_filename(input_csv_path)
     
     output_names = {
@@ -31,12 +364,95 @@ def generate_output_names(input_csv_path):
         'rawndb_simple_csv': f"{base_name}_for_raw_1st_tier.csv"
     }
     
+    if output_dir:
+        output_names = {key: os.path.join(output_dir, name) for key, name in output_names.items()}
+    
     return output_names
 
+def get_partition_dirname(region):
+    """Nama subfolder untuk 1 region (karakter yang tidak valid di path diganti '_')"""
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', str(region)).strip().rstrip('.')
+    return name or 'UNKNOWN_REGION'
+
+def get_chunk_size_input():
+    """Tanya user apakah memakai streaming mode (chunk)"""
+    answer = input(f"Streaming mode per chunk? Masukkan jumlah baris (Enter = load penuh, 'y' = {DEFAULT_CHUNK_SIZE:,}): ").strip().lower()
+    
+    if not answer:
+        return None
+    if answer == 'y':
+        return DEFAULT_CHUNK_SIZE
+    if answer.isdigit() and int(answer) > 0:
+        return int(answer)
+    
+    print("❌ Jumlah baris tidak valid, memakai load penuh")
+    return None
+
+def get_site_filter_input():
+    """Tanya user filter SITE_ID: path file .txt/.csv atau daftar ID (pattern JKT*, BDG?01 didukung)"""
+    answer = input("Filter SITE_ID? Masukkan path file .txt/.csv atau daftar ID dipisah koma (Enter = tanpa filter): ").strip().strip('"')
+    
+    if not answer:
+        return None
+    
+    try:
+        if os.path.isfile(answer):
+            site_filter = SiteIdFilter.from_file(answer)
+        else:
+            site_filter = SiteIdFilter.from_text(answer)
+    except Exception as e:
+        print(f"❌ Gagal membaca filter SITE_ID: {e}")
+        return None
+    
+    if not site_filter:
+        print("❌ Tidak ada SITE_ID valid, memakai tanpa filter")
+        return None
+    
+    print(f"✅ Filter SITE_ID: {site_filter.describe()}")
+    return site_filter
+
+def get_spatial_filter_input():
+    """Tanya user spatial filter: bbox, WKT polygon atau path file .geojson/.wkt"""
+    answer = input("Filter area? Masukkan bbox 'min_lon,min_lat,max_lon,max_lat', WKT POLYGON atau path file .geojson/.wkt (Enter = tanpa filter): ").strip().strip('"')
+    
+    if not answer:
+        return None
+    
+    try:
+        spatial = SpatialFilter.coerce(answer)
+    except Exception as e:
+        print(f"❌ Spatial filter tidak valid: {e}")
+        return None
+    
+    print(f"✅ Filter area: {spatial.describe()}")
+    return spatial
+
+def get_engine_input():
+    """Tanya user engine processing yang dipakai"""
+    print("\n⚙️ Pilih engine processing:")
+    for i, engine in enumerate(PROCESSING_ENGINES, 1):
+        print(f"{i}. {engine}")
+    
+    answer = input(f"Pilih engine (1-{len(PROCESSING_ENGINES)}, Enter = pandas): ").strip()
+    if answer.isdigit() and 1 <= int(answer) <= len(PROCESSING_ENGINES):
+        return PROCESSING_ENGINES[int(answer) - 1]
+    
+    return 'pandas'
+
+def get_input_dir():
+    """Folder Input di samping script"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "Input")
+
+def find_input_csvs(input_dir=None):
+    """Semua file CSV di folder Input (urut nama)"""
+    input_dir = input_dir or get_input_dir()
+    if not os.path.isdir(input_dir):
+        return []
+    return sorted(os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.lower().endswith('.csv'))
+
 def get_csv_input():
     """Get CSV input file from user"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    input_dir = os.path.join(current_dir, "Input")
+    input_dir = get_input_dir()
     
     print("\n📁 Pilih input CSV file:")
     print("1. Auto-detect dari folder Input")
@@ -47,10 +463,13 @@ def get_csv_input():
     if choice == "1":
         # Auto-detect CSV file in Input folder
         if os.path.exists(input_dir):
-            csv_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.csv')]
+            csv_files = [os.path.basename(f) for f in find_input_csvs(input_dir)]
             if csv_files:
                 csv_path = os.path.join(input_dir, csv_files[0])
                 log_message("INFO", f"Auto-detected: {csv_files[0]}")
+                if len(csv_files) > 1:
+                    log_message("WARNING", f"{len(csv_files)} file CSV di folder Input, hanya {csv_files[0]} yang diproses "
+                                           f"(pakai menu Batch untuk memproses semua)")
                 return csv_path
             else:
                 print("❌ Tidak ada file CSV di folder Input!")
@@ -89,6 +508,56 @@ class NDBDataProcessor:
             "Nano_Cluster", "Cluster", "Nano Cluster", "Vendor", "BTS_VENDOR", 
             "BCCH_OR_TRX1_Freq", "LAC", "PCI", "TAC_4G"
         ]
+        # Kolom input yang dibaca transform_data walaupun tidak ada di allowed columns
+        self.transform_input_columns = [
+            "CELL_SYSTEM_INFO", "CELL_NAME", "SITE_NAME",
+            "SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR"
+        ]
+        # Projection pushdown: hanya parse kolom yang dibutuhkan pipeline
+        self.use_projection = True
+        # Terapkan NDB_DTYPE_SCHEMA saat parsing
+        self.use_schema = True
+        # Engine reader CSV (lihat processing_options.READER_ENGINES)
+        self.reader_engine = 'pandas'
+        # Rule Fixed_Ant_Size dan Class_Cell (compiled dari transform_rules.json)
+        self.transform_rules = get_transform_rules()
+        # Filter baris (predicate pushdown), list kosong = tanpa filter
+        self.region_filter = []
+        self.site_id_filter = SiteIdFilter()
+        # Filter area Longitude/Latitude (SpatialFilter), None = tanpa filter
+        self.spatial_filter = None
+        # Pakai sidecar site index (site_index.py) untuk baca baris terfilter langsung dari offset
+        self.use_site_index = False
+        
+    def get_required_columns(self, header):
+        """Get posisi kolom header yang dibutuhkan pipeline (case-insensitive)"""
+        required_upper = {col.upper() for col in self.allowed_columns_raw}
+        required_upper.update(col.upper() for col in self.transform_input_columns)
+        if self.region_filter:
+            required_upper.add(REGION_COLUMN)
+        if self.site_id_filter:
+            required_upper.add(SITE_ID_COLUMN)
+        if self.spatial_filter is not None:
+            required_upper.update(LONGITUDE_COLUMNS + LATITUDE_COLUMNS)
+        
+        usecols = [i for i, col in enumerate(header) if str(col).upper() in required_upper]
+        
+        # Tetap baca 1 kolom supaya jumlah baris tidak hilang
+        if not usecols and len(header) > 0:
+            usecols = [0]
+        
+        return usecols
+        
+    def resolve_usecols(self):
+        """Baca header dulu untuk menentukan kolom yang perlu di-parse"""
+        if not self.use_projection:
+            return None
+        
+        header = read_csv_header(self.csv_path)
+        usecols = self.get_required_columns(header)
+        log_message("INFO", f"Projection: parse {len(usecols)} dari {len(header)} kolom")
+        
+        return usecols
         
     def load_data(self):
         """Load CSV data"""
@@ -96,119 +565,167 @@ class NDBDataProcessor:
             log_message("START", "Loading CSV data...")
             start_time = time.time()
             
-            # Load with pandas
-            self.df = pd.read_csv(self.csv_path, low_memory=False)
+            usecols = self.resolve_usecols()
+            
+            # Load with pandas (hanya baris terfilter jika site index dipakai)
+            self.df = self.read_indexed_rows(usecols)
+            if self.df is None:
+                self.df = read_ndb_csv(self.csv_path, usecols=usecols, use_schema=self.use_schema,
+                                       engine=self.reader_engine)
             
             load_time = time.time() - start_time
             log_message("SUCCESS", f"Data loaded dalam {load_time:.2f} detik")
             log_message("INFO", f"Shape: {self.df.shape}")
             
+            # Buang baris di luar filter sebelum transform
+            if self.has_row_filters():
+                self.log_row_filters()
+                rows_before = len(self.df)
+                self.df = self.apply_row_filters(self.df)
+                log_message("FILTER", f"Rows: {rows_before:,} -> {len(self.df):,}")
+            
             return True
             
         except Exception as e:
             log_message("ERROR", f"Failed to load CSV: {str(e)}")
             return False
     
-    def transform_data(self, df):
+    def read_indexed_rows(self, usecols):
+        """
+        Baca hanya baris yang lolos filter lewat site index (seek ke byte offset)
+        
+        Return None jika site index tidak dipakai / tidak bisa dibuat, pemanggil
+        lalu membaca seluruh CSV seperti biasa.
+        """
+        # Index hanya berisi REGION / SITE_ID, filter area diterapkan sesudah baca
+        if not (self.use_site_index and (self.region_filter or self.site_id_filter)):
+            return None
+        
+        from site_index import SiteIndex
+        
+        index = SiteIndex.get_or_build(self.csv_path)
+        if index is None:
+            return None
+        
+        try:
+            start_time = time.time()
+            rows = index.lookup_filters(self.region_filter, self.site_id_filter)
+            data = index.read_rows(rows)
+        except Exception as e:
+            log_message("WARNING", f"Site index gagal dipakai ({str(e)}), baca seluruh CSV")
+            return None
+        
+        header = read_csv_header(self.csv_path)
+        names = list(header) if usecols is None else [header[i] for i in usecols]
+        # Dtype seluruh file (dari index), bukan inferensi dari baris terpilih saja
+        schema_dtypes = get_schema_dtypes(names) if self.use_schema else {}
+        dtypes = {}
+        for name in names:
+            dtype = index.dtypes.get(name)
+            if dtype == 'object' and name in schema_dtypes:
+                dtype = schema_dtypes[name]
+            if dtype is not None:
+                dtypes[name] = dtype
+        df = _read_csv_pandas(io.BytesIO(data), ',', usecols, dtypes)
+        
+        log_message("INDEX", f"Site index: {len(rows):,} dari {index.row_count:,} baris dibaca dalam {time.time() - start_time:.3f} detik")
+        return df
+    
+    def has_row_filters(self):
+        """Cek apakah filter region / site ID / area aktif"""
+        return bool(self.region_filter or self.site_id_filter or self.spatial_filter is not None)
+    
+    def log_row_filters(self):
+        """Log filter baris yang aktif"""
+        if self.region_filter:
+            log_message("FILTER", f"Filter region: {', '.join(self.region_filter)}")
+        if self.site_id_filter:
+            log_message("FILTER", f"Filter site ID: {self.site_id_filter.describe()}")
+        if self.spatial_filter is not None:
+            log_message("FILTER", f"Filter area: {self.spatial_filter.describe()}")
+    
+    def apply_row_filters(self, df):
+        """Filter baris berdasarkan REGION, SITE_ID dan area (predicate pushdown sebelum transform)"""
+        if not self.has_row_filters():
+            return df
+        
+        columns_upper = {str(col).upper(): col for col in df.columns}
+        mask = pd.Series(True, index=df.index)
+        
+        if self.region_filter:
+            if REGION_COLUMN not in columns_upper:
+                raise ValueError(f"Kolom {REGION_COLUMN} tidak ditemukan untuk filter region")
+            mask &= df[columns_upper[REGION_COLUMN]].isin(self.region_filter)
+        
+        if self.site_id_filter:
+            if SITE_ID_COLUMN not in columns_upper:
+                raise ValueError(f"Kolom {SITE_ID_COLUMN} tidak ditemukan untuk filter site ID")
+            # Hash set untuk ID exact + 1 regex untuk prefix/wildcard (lihat site_filter.py)
+            mask &= self.site_id_filter.mask(df[columns_upper[SITE_ID_COLUMN]])
+        
+        if self.spatial_filter is not None:
+            lon_col, lat_col = find_coordinate_columns(df.columns)
+            if lon_col is None or lat_col is None:
+                raise ValueError("Kolom Longitude/Latitude tidak ditemukan untuk filter area")
+            # Point-in-polygon vectorized dengan grid pre-filter (lihat spatial_filter.py)
+            lon = pd.to_numeric(df[lon_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            lat = pd.to_numeric(df[lat_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            mask &= self.spatial_filter.mask(lon, lat)
+        
+        return df[mask]
+    
+    def transform_data(self, df, verbose=True):
         """Transform data dengan logic dari Module1.bas"""
         try:
-            log_message("START", "Melakukan transformasi data...")
+            if verbose:
+                log_message("START", "Melakukan transformasi data...")
             
-            # Copy dataframe
-            transformed_df = df.copy()
+            # Kolom baru dihitung sebagai Series lalu di-assign sekali ke shallow copy,
+            # kolom input lain tidak ikut dicopy (copy-on-write)
             
             # 1. Fixed_Ant_Size mapping based on CELL_SYSTEM_INFO (sesuai macro VBA)
-            def get_fixed_ant_size(cell_system_info):
-                if pd.isna(cell_system_info):
-                    return 0.08  # Default dari macro
-                
-                cell_system_str = str(cell_system_info).upper()
-                
-                # Mapping sesuai macro VBA
-                if cell_system_str.startswith('GSM900'):
-                    return 0.03
-                elif cell_system_str.startswith('LTE1800'):
-                    return 0.095
-                elif cell_system_str.startswith('LTE2100'):
-                    return 0.085  # Berbeda dari sebelumnya
-                elif cell_system_str.startswith('LTE900'):
-                    return 0.1    # Berbeda dari sebelumnya
-                elif cell_system_str.startswith('DCS1800'):
-                    return 0.02   # Baru ditambahkan
-                elif cell_system_str.startswith('5G18'):
-                    return 0.07   # Berbeda dari sebelumnya
-                elif cell_system_str.startswith('5G21'):
-                    return 0.065  # Berbeda dari sebelumnya
-                elif cell_system_str.startswith('5G_26G'):
-                    return 0.065  # Baru ditambahkan
-                elif cell_system_str.startswith('L18'):
-                    return 0.09   # Baru ditambahkan
-                elif cell_system_str.startswith('L21'):
-                    return 0.08   # Baru ditambahkan
-                else:
-                    return 0.08   # Default dari macro
-            
-            # Apply Fixed_Ant_Size
-            if 'CELL_SYSTEM_INFO' in transformed_df.columns:
-                transformed_df.loc[:, 'Fixed_Ant_Size'] = transformed_df['CELL_SYSTEM_INFO'].apply(get_fixed_ant_size)
+            if 'CELL_SYSTEM_INFO' in df.columns:
+                ant_size = self.transform_rules.map_fixed_ant_size(df['CELL_SYSTEM_INFO'])
             else:
-                transformed_df.loc[:, 'Fixed_Ant_Size'] = 0.03
+                ant_size = pd.Series(self.transform_rules.missing_column_ant_size, index=df.index, dtype=np.float64)
             
             # 2. Class_Cell extraction from CELL_NAME (sesuai macro VBA)
-            def extract_class_cell(cell_name):
-                if pd.isna(cell_name):
-                    return ""
-                
-                cell_name_str = str(cell_name).upper()
-                
-                # Cari pattern sesuai macro VBA: ambil 3 karakter setelah prefix jika dimulai A/B/C/D
-                prefixes = ['L18_', 'L21_', '5G18_', '5G21_']
-                
-                for prefix in prefixes:
-                    pos = cell_name_str.find(prefix)
-                    if pos >= 0:
-                        # Ambil 3 karakter setelah prefix
-                        start_pos = pos + len(prefix)
-                        if start_pos < len(cell_name_str):
-                            sub_part = cell_name_str[start_pos:start_pos + 3]
-                            # Cek apakah karakter pertama adalah A/B/C/D
-                            if len(sub_part) > 0 and sub_part[0] in 'ABCD':
-                                return prefix + sub_part
-                
-                # If no pattern with letter A/B/C/D found, return blank
-                return ""
-            
-            # Apply Class_Cell
-            if 'CELL_NAME' in transformed_df.columns:
-                transformed_df.loc[:, 'Class_Cell'] = transformed_df['CELL_NAME'].apply(extract_class_cell)
+            if 'CELL_NAME' in df.columns:
+                class_cell = self.transform_rules.extract_class_cell(df['CELL_NAME'])
             else:
-                transformed_df.loc[:, 'Class_Cell'] = ""
+                class_cell = ""
             
-            # 3. INDOOR site handling - divide antenna size by 4 (sesuai macro VBA)
+            # 3. INDOOR site handling - divide antenna size by indoor_divisor (default 4, sesuai macro VBA)
             # Cek kolom SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR dulu, fallback ke SITE_NAME
             indoor_col = None
-            if 'SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR' in transformed_df.columns:
+            if 'SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR' in df.columns:
                 indoor_col = 'SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR'
-                indoor_mask = transformed_df[indoor_col] == 'INDOOR'
-            elif 'SITE_NAME' in transformed_df.columns:
+                indoor_mask = df[indoor_col] == 'INDOOR'
+            elif 'SITE_NAME' in df.columns:
                 indoor_col = 'SITE_NAME'
-                indoor_mask = transformed_df[indoor_col].str.contains('INDOOR', case=False, na=False)
+                indoor_mask = df[indoor_col].str.contains('INDOOR', case=False, na=False)
             
             if indoor_col is not None:
-                transformed_df.loc[indoor_mask, 'Fixed_Ant_Size'] = transformed_df.loc[indoor_mask, 'Fixed_Ant_Size'] / 4
+                ant_size = ant_size.mask(indoor_mask, ant_size / self.transform_rules.indoor_divisor)
+            
+            transformed_df = df.copy(deep=False)
+            transformed_df['Fixed_Ant_Size'] = ant_size
+            transformed_df['Class_Cell'] = class_cell
             
-            log_message("SUCCESS", "Transformasi data selesai")
+            if verbose:
+                log_message("SUCCESS", "Transformasi data selesai")
             return transformed_df
             
         except Exception as e:
             log_message("ERROR", f"Transformation failed: {str(e)}")
             raise
     
-    def filter_allowed_columns(self, df):
+    def filter_allowed_columns(self, df, verbose=True):
         """Filter kolom yang diperbolehkan (dapat dikustomisasi dari GUI)"""
         try:
-            log_message("START", "Filtering kolom yang diperbolehkan...")
-            log_message("INFO", f"Using custom allowed columns: {len(self.allowed_columns_raw)} kolom")
+            if verbose:
+                log_message("START", "Filtering kolom yang diperbolehkan...")
+                log_message("INFO", f"Using custom allowed columns: {len(self.allowed_columns_raw)} kolom")
             
             # CATATAN: SECTORID/SectorID/Sector tidak disertakan dalam allowed columns
             # karena kita akan generate Sector sendiri dari regex extraction CELL_NAME
@@ -222,31 +739,257 @@ class NDBDataProcessor:
                 if col.upper() in allowed_columns_upper:
                     existing_columns.append(col)
             
-            filtered_df = df[existing_columns].copy()
+            # Subset tanpa .copy(): copy-on-write baru menyalin kolom jika diubah
+            filtered_df = df[existing_columns]
             
-            log_message("INFO", f"Kolom yang dipertahankan: {len(existing_columns)} dari {len(df.columns)}")
-            log_message("SUCCESS", "Filtering kolom selesai")
+            if verbose:
+                log_message("INFO", f"Kolom yang dipertahankan: {len(existing_columns)} dari {len(df.columns)}")
+                log_message("SUCCESS", "Filtering kolom selesai")
             
             return filtered_df
             
         except Exception as e:
             log_message("ERROR", f"Column filtering failed: {str(e)}")
             raise
+    
+    def iter_processed_chunks(self, reader, usecols, seen=None, category_columns=()):
+        """
+        Generator streaming mode: (jumlah baris dibaca, transformed_chunk, final_chunk) per chunk
+        
+        Jika seen diisi, dtype hasil inferensi per chunk dicatat (record_chunk_dtypes).
+        File tanpa baris data tetap menghasilkan 1 chunk kosong (untuk header).
+        """
+        has_chunks = False
+        
+        for chunk in reader:
+            rows_read = len(chunk)
+            
+            if seen is not None:
+                # Dtype dicatat sebelum filter baris, sama seperti inferensi load penuh
+                record_chunk_dtypes(seen, chunk)
+                for col in category_columns:
+                    if col in chunk.columns and chunk[col].dtype == object:
+                        chunk[col] = chunk[col].astype('category')
+            
+            # Predicate pushdown: hanya baris yang lolos filter yang di-transform
+            chunk = self.apply_row_filters(chunk)
+            
+            transformed_chunk = self.transform_data(chunk, verbose=False)
+            has_chunks = True
+            yield rows_read, transformed_chunk, self.filter_allowed_columns(transformed_chunk, verbose=False)
+        
+        if not has_chunks:
+            empty_df = pd.read_csv(self.csv_path, usecols=usecols, nrows=0)
+            transformed_chunk = self.transform_data(empty_df, verbose=False)
+            yield 0, transformed_chunk, self.filter_allowed_columns(transformed_chunk, verbose=False)
+    
+    def iter_chunk_passes(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Generator pass baca CSV streaming mode, setiap pass = generator iter_processed_chunks
+        
+        Pass pertama memakai inferensi dtype per chunk. Jika dtype sebuah kolom berbeda antar chunk
+        ("30" vs "30.0"), CSV dibaca ulang 1x dengan dtype seluruh file. Consumer harus menghabiskan
+        setiap pass dan menulis ulang outputnya dari awal. Jumlah pass disimpan di self.chunk_passes.
+        """
+        usecols = self.resolve_usecols()
+        self.chunk_passes = 1
+        
+        # Dengan site index, baris terfilter dibaca langsung sebagai 1 chunk
+        indexed_df = self.read_indexed_rows(usecols)
+        self.log_row_filters()
+        if indexed_df is not None:
+            yield self.iter_processed_chunks([indexed_df], usecols)
+            return
+        
+        category_columns = ()
+        if self.use_schema:
+            category_columns = list(get_schema_dtypes(read_csv_header(self.csv_path)).keys())
+        
+        seen = {}
+        reader = pd.read_csv(self.csv_path, usecols=usecols, chunksize=chunk_size, low_memory=False)
+        yield self.iter_processed_chunks(reader, usecols, seen, category_columns)
+        
+        dtypes = merge_chunk_dtypes(seen, category_columns)
+        if chunk_dtypes_consistent(seen, dtypes):
+            return
+        
+        # Dtype ditentukan untuk seluruh file supaya format angka sama di semua chunk
+        changed = [col for col, names in seen.items() if len(names - {'empty'}) > 1]
+        log_message("INFO", f"Dtype berbeda antar chunk ({', '.join(map(str, changed)) or 'kolom kosong'}), "
+                            "CSV dibaca ulang dengan dtype seluruh file")
+        self.chunk_passes = 2
+        reader = pd.read_csv(self.csv_path, usecols=usecols, dtype=dtypes, chunksize=chunk_size, low_memory=False)
+        yield self.iter_processed_chunks(reader, usecols)
+    
+    def process_chunked(self, output_file, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Streaming transform + filter per chunk, append ke output TXT"""
+        try:
+            log_message("START", f"Streaming CSV data per {chunk_size:,} baris...")
+            if self.reader_engine != 'pandas':
+                log_message("INFO", "Streaming mode memakai engine pandas (chunked reader)")
+            start_time = time.time()
+            
+            for chunks in self.iter_chunk_passes(chunk_size):
+                # Setiap pass menulis ulang output dari awal
+                total_rows = 0
+                rows_read = 0
+                columns = []
+                chunk_count = 0
+                
+                for chunk_rows, _, final_chunk in chunks:
+                    # Chunk pertama menulis header, chunk berikutnya append
+                    final_chunk.to_csv(output_file, sep='\t', index=False,
+                                       mode='w' if chunk_count == 0 else 'a',
+                                       header=chunk_count == 0)
+                    
+                    chunk_count += 1
+                    rows_read += chunk_rows
+                    total_rows += len(final_chunk)
+                    columns = list(final_chunk.columns)
+                    log_message("INFO", f"Chunk {chunk_count}: {total_rows:,} baris diproses")
+            
+            if self.has_row_filters():
+                log_message("FILTER", f"Rows: {rows_read:,} -> {total_rows:,}")
+            
+            stream_time = time.time() - start_time
+            log_message("SUCCESS", f"Streaming selesai dalam {stream_time:.2f} detik "
+                                   f"({chunk_count} chunk, {self.chunk_passes} pass baca CSV)")
+            
+            return total_rows, columns
+            
+        except Exception as e:
+            log_message("ERROR", f"Streaming processing failed: {str(e)}")
+            raise
+    
+    def process_partitioned(self, output_dir, output_names, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Streaming transform + filter per chunk, TXT ditulis terpisah per REGION
+        
+        Setiap region punya 1 file handle di output_dir/<REGION>/ yang di-append per chunk,
+        sehingga memory hanya sebesar 1 chunk berapa pun jumlah region.
+        Return {region: (path TXT, jumlah baris)}.
+        """
+        writers = {}
+        try:
+            log_message("START", f"Streaming CSV data per {chunk_size:,} baris, partisi per {REGION_COLUMN}...")
+            start_time = time.time()
+            
+            for chunks in self.iter_chunk_passes(chunk_size):
+                # Pass baru menulis ulang semua file region dari awal
+                for writer in writers.values():
+                    writer['handle'].close()
+                writers = {}
+                
+                for _, transformed_chunk, final_chunk in chunks:
+                    columns_upper = {str(col).upper(): col for col in transformed_chunk.columns}
+                    if REGION_COLUMN not in columns_upper:
+                        raise ValueError(f"Kolom {REGION_COLUMN} tidak ditemukan untuk partisi")
+                    
+                    # REGION diambil dari chunk sebelum filter kolom (bisa tidak termasuk allowed columns)
+                    regions = transformed_chunk[columns_upper[REGION_COLUMN]].astype(object)
+                    regions = regions.where(regions.notna(), "")
+                    
+                    for region, group in final_chunk.groupby(regions, sort=False):
+                        writer = writers.get(region)
+                        if writer is None:
+                            # Region berbeda dengan nama folder sama (mis. "A/B" dan "A_B") diberi suffix
+                            dirname = get_partition_dirname(region)
+                            used_dirs = {os.path.basename(os.path.dirname(w['path'])) for w in writers.values()}
+                            suffix = 2
+                            while dirname in used_dirs:
+                                dirname = f"{get_partition_dirname(region)}_{suffix}"
+                                suffix += 1
+                            region_dir = os.path.join(output_dir, dirname)
+                            os.makedirs(region_dir, exist_ok=True)
+                            path = os.path.join(region_dir, output_names['processed_txt'])
+                            writer = writers[region] = {
+                                'handle': open(path, 'w', encoding='utf-8', newline=''),
+                                'path': path,
+                                'rows': 0,
+                            }
+                            group.to_csv(writer['handle'], sep='\t', index=False)
+                        else:
+                            group.to_csv(writer['handle'], sep='\t', index=False, header=False)
+                        writer['rows'] += len(group)
+            
+            stream_time = time.time() - start_time
+            log_message("SUCCESS", f"Partisi selesai dalam {stream_time:.2f} detik "
+                                   f"({len(writers)} region, {self.chunk_passes} pass baca CSV)")
+            
+            return {region: (writer['path'], writer['rows']) for region, writer in writers.items()}
+            
+        except Exception as e:
+            log_message("ERROR", f"Partitioned processing failed: {str(e)}")
+            raise
+        
+        finally:
+            for writer in writers.values():
+                writer['handle'].close()
+
+class BackgroundWriter:
+    """Tulis DataFrame ke file di thread terpisah (side output)"""
+    
+    def __init__(self, df, output_file, sep='\t'):
+        self.df = df
+        self.output_file = output_file
+        self.sep = sep
+        self.error = None
+        self.thread = threading.Thread(target=self._write)
+        self.thread.start()
+        
+    def _write(self):
+        try:
+            self.df.to_csv(self.output_file, sep=self.sep, index=False)
+        except Exception as e:
+            self.error = e
+            
+    def wait(self):
+        """Tunggu penulisan selesai, return False jika gagal"""
+        self.thread.join()
+        # Lepas referensi supaya frame bisa di-free setelah Step 4
+        self.df = None
+        if self.error is not None:
+            log_message("ERROR", f"Failed to write {self.output_file}: {str(self.error)}")
+            return False
+        return True
 
 class FinalOutputGenerator:
     """Generate final output files"""
     
-    def __init__(self, processed_data_path):
+    # Kolom processed data -> kolom output RAWNDB
+    RAWNDB_COLUMN_MAPPING = {
+        'SITE_ID': 'Site ID',
+        'X_LONGITUDE': 'Longitude', 
+        'Y_LATITUDE': 'Latitude',
+        'ANTENNA_AZIMUTH_DEG': 'Dir',
+        'HORIZONTAL_BEAMWIDTH_DEG': 'Ant_BW',
+        'Fixed_Ant_Size': 'Ant Size',
+        'CELL_NAME': 'EUtranCell',
+        'CELL_ID': 'cellId',
+        'Class_Cell': 'Class_Cell'
+    }
+    
+    def __init__(self, processed_data_path=None, df=None):
         self.processed_data_path = processed_data_path
-        self.df = None
+        # DataFrame hasil Step 2 (in-memory handoff), jika None dibaca dari processed_data_path
+        self.df = df
+        # Terapkan NDB_DTYPE_SCHEMA saat parsing
+        self.use_schema = True
+        # Engine reader CSV (lihat processing_options.READER_ENGINES)
+        self.reader_engine = 'pandas'
         
     def load_processed_data(self):
         """Load processed data"""
         try:
+            if self.df is not None:
+                log_message("INFO", f"Memakai processed data in-memory dari Step 2, shape: {self.df.shape}")
+                return True
+            
             log_message("START", f"Loading processed data dari {self.processed_data_path}...")
             start_time = time.time()
             
-            self.df = pd.read_csv(self.processed_data_path, sep='\t', low_memory=False)
+            self.df = read_ndb_csv(self.processed_data_path, sep='\t', use_schema=self.use_schema,
+                                   engine=self.reader_engine)
             
             load_time = time.time() - start_time
             log_message("SUCCESS", f"Data loaded dalam {load_time:.2f} detik")
@@ -259,42 +1002,30 @@ class FinalOutputGenerator:
             log_message("ERROR", f"Failed to load processed data: {str(e)}")
             return False
     
-    def generate_rawndb_csv(self, output_name):
-        """Generate RAWNDB.csv output"""
+    def build_rawndb_frame(self, verbose=True):
+        """Build frame RAWNDB (TA and audit) yang sudah divalidasi dari processed data"""
         try:
-            log_message("START", f"Membuat output {output_name}...")
-            
-            # Column mapping
-            column_mapping = {
-                'SITE_ID': 'Site ID',
-                'X_LONGITUDE': 'Longitude', 
-                'Y_LATITUDE': 'Latitude',
-                'ANTENNA_AZIMUTH_DEG': 'Dir',
-                'HORIZONTAL_BEAMWIDTH_DEG': 'Ant_BW',
-                'Fixed_Ant_Size': 'Ant Size',
-                'CELL_NAME': 'EUtranCell',
-                'CELL_ID': 'cellId',
-                'Class_Cell': 'Class_Cell'
-            }
-            
             # Select and rename columns
-            available_columns = {k: v for k, v in column_mapping.items() if k in self.df.columns}
-            output_df = self.df[list(available_columns.keys())].copy()
-            output_df.rename(columns=available_columns, inplace=True)
+            available_columns = {k: v for k, v in self.RAWNDB_COLUMN_MAPPING.items() if k in self.df.columns}
+            output_df = self.df[list(available_columns.keys())].rename(columns=available_columns)
             
-            log_message("INFO", f"Kolom setelah rename: {list(output_df.columns)}")
+            if verbose:
+                log_message("INFO", f"Kolom setelah rename: {list(output_df.columns)}")
             
             # Generate Sector column dari CELL_NAME (EUtranCell) menggunakan regex extraction
             # TIDAK menggunakan kolom SECTORID/SectorID yang sudah ada di input CSV
             # Ambil HANYA 1 digit terakhir saja (bukan semua digit)
             if 'EUtranCell' in output_df.columns:
-                log_message("INFO", "Generating Sector column dari 1 digit terakhir CELL_NAME...")
+                if verbose:
+                    log_message("INFO", "Generating Sector column dari 1 digit terakhir CELL_NAME...")
                 sector_values = output_df['EUtranCell'].str.extract(r'(\d)$')
-                output_df.loc[:, 'Sector'] = pd.to_numeric(sector_values[0], errors='coerce')
-                log_message("INFO", "Sector extraction complete - mengambil 1 digit terakhir dari CELL_NAME.")
+                # astype(object) supaya hasil sama untuk kolom object maupun string Arrow-backed
+                output_df['Sector'] = pd.to_numeric(sector_values[0].astype(object), errors='coerce')
+                if verbose:
+                    log_message("INFO", "Sector extraction complete - mengambil 1 digit terakhir dari CELL_NAME.")
             else:
                 log_message("WARNING", "EUtranCell (CELL_NAME) column not found. Sector akan diisi dengan NaN.")
-                output_df.loc[:, 'Sector'] = pd.NA
+                output_df['Sector'] = pd.NA
             
             # Reorder columns to match required header order
             # Site ID,Longitude,Latitude,Dir,Ant_BW,Ant Size,Sector,EUtranCell,cellId,Class_Cell
@@ -305,30 +1036,50 @@ class FinalOutputGenerator:
             # Filter out rows with Site ID starting with '0'
             if 'Site ID' in output_df.columns:
                 exclude_prefixes = ['0']
-                log_message("INFO", f"Excluding rows dengan Site ID prefix: {exclude_prefixes}")
-                
-                log_message("START", "Filtering rows by Site ID prefixes...")
+                if verbose:
+                    log_message("INFO", f"Excluding rows dengan Site ID prefix: {exclude_prefixes}")
+                    log_message("START", "Filtering rows by Site ID prefixes...")
                 initial_count = len(output_df)
                 
                 for prefix in exclude_prefixes:
                     output_df = output_df[~output_df['Site ID'].astype(str).str.startswith(prefix)]
                 
                 final_count = len(output_df)
-                log_message("INFO", f"Filtered: {initial_count:,} -> {final_count:,} rows")
+                if verbose:
+                    log_message("INFO", f"Filtered: {initial_count:,} -> {final_count:,} rows")
             
             # Validate numeric columns
-            log_message("START", "Validating numeric columns...")
+            if verbose:
+                log_message("START", "Validating numeric columns...")
             numeric_columns = ['Longitude', 'Latitude', 'Dir', 'Ant_BW', 'Ant Size', 'cellId', 'Sector']
             
             for col in numeric_columns:
                 if col in output_df.columns:
-                    output_df.loc[:, col] = pd.to_numeric(output_df[col], errors='coerce')
+                    # Assign kolom baru (bukan .loc) supaya dtype string ikut berubah ke numerik
+                    output_df[col] = pd.to_numeric(output_df[col], errors='coerce')
             
             # Remove rows with invalid coordinates
             if 'Longitude' in output_df.columns and 'Latitude' in output_df.columns:
                 output_df = output_df.dropna(subset=['Longitude', 'Latitude'])
             
-            log_message("SUCCESS", f"Validation complete. Final rows: {len(output_df):,}")
+            if verbose:
+                log_message("SUCCESS", f"Validation complete. Final rows: {len(output_df):,}")
+            
+            return output_df
+            
+        except Exception as e:
+            log_message("ERROR", f"Failed to build RAWNDB frame: {str(e)}")
+            return None
+    
+    def generate_rawndb_csv(self, output_name, output_df=None):
+        """Generate RAWNDB.csv output (output_df = hasil build_rawndb_frame jika sudah ada)"""
+        try:
+            log_message("START", f"Membuat output {output_name}...")
+            
+            if output_df is None:
+                output_df = self.build_rawndb_frame()
+                if output_df is None:
+                    return False
             
             # Save file
             log_message("START", f"Saving {output_name}...")
@@ -347,39 +1098,44 @@ class FinalOutputGenerator:
             log_message("ERROR", f"Failed to generate {output_name}: {str(e)}")
             return False
     
-    def generate_rawndb_simple_csv(self, output_name):
-        """Generate RAWNDB_simple.csv output"""
+    def build_simple_frame(self, rawndb_df):
+        """Subset kolom 1st tier dari frame RAWNDB (sebelum deduplikasi)"""
+        # Required columns for simple output
+        required_columns = ['Site ID', 'Longitude', 'Latitude', 'Dir', 'Sector']
+        available_columns = [col for col in required_columns if col in rawndb_df.columns]
+        return rawndb_df[available_columns]
+    
+    def generate_rawndb_simple_csv(self, output_name, rawndb_df=None):
+        """Generate RAWNDB_simple.csv output dari frame RAWNDB in-memory"""
         try:
-            log_message("START", f"Membuat output {output_name}...")
+            from dedup import StreamingDeduplicator
             
-            # Required columns for simple output
-            required_columns = ['Site ID', 'Longitude', 'Latitude', 'Dir', 'Sector']
+            log_message("START", f"Membuat output {output_name}...")
             
-            # Check if we have the required columns from previous step
-            temp_df = pd.read_csv(output_name.replace('_for_raw_1st_tier.csv', '_for_raw_TA_and_audit.csv'))
+            # Subset langsung dari frame RAWNDB yang sudah divalidasi (tanpa baca ulang CSV)
+            if rawndb_df is None:
+                rawndb_df = self.build_rawndb_frame()
+                if rawndb_df is None:
+                    return False
             
             # Create subset
-            available_columns = [col for col in required_columns if col in temp_df.columns]
-            simple_df = temp_df[available_columns].copy()
-            
-            log_message("INFO", f"Subset created dengan kolom: {available_columns}")
-            
-            # Remove duplicates
-            initial_count = len(simple_df)
-            simple_df = simple_df.drop_duplicates()
-            final_count = len(simple_df)
+            simple_df = self.build_simple_frame(rawndb_df)
             
-            log_message("INFO", f"Removed duplicates: {initial_count:,} -> {final_count:,} rows")
+            log_message("INFO", f"Subset created dengan kolom: {list(simple_df.columns)}")
             
-            # Save file
+            # Remove duplicates (digest 64-bit per baris, urutan kemunculan pertama) dan save
             log_message("START", f"Saving {output_name}...")
-            simple_df.to_csv(output_name, index=False)
+            dedup = StreamingDeduplicator(output_name)
+            dedup.add(simple_df)
+            final_count = dedup.finish()
+            
+            log_message("INFO", f"Removed duplicates: {dedup.rows_in:,} -> {final_count:,} rows")
             
             # File info
             file_size = os.path.getsize(output_name) / (1024 * 1024)
             log_message("SUCCESS", f"{output_name} tersimpan: {os.path.abspath(output_name)}")
             log_message("INFO", f"Ukuran file: {file_size:.2f} MB")
-            log_message("INFO", f"Jumlah baris: {len(simple_df):,}")
+            log_message("INFO", f"Jumlah baris: {final_count:,}")
             log_message("INFO", f"Jumlah kolom: {len(simple_df.columns)}")
             
             return True
@@ -394,12 +1150,17 @@ class FinalOutputGenerator:
             if not self.load_processed_data():
                 return False
             
+            # Frame RAWNDB dibangun sekali, kedua output diturunkan dari frame yang sama
+            rawndb_df = self.build_rawndb_frame()
+            if rawndb_df is None:
+                return False
+            
             # Generate RAWNDB.csv
-            if not self.generate_rawndb_csv(output_names['rawndb_csv']):
+            if not self.generate_rawndb_csv(output_names['rawndb_csv'], rawndb_df):
                 return False
             
             # Generate RAWNDB_simple.csv
-            if not self.generate_rawndb_simple_csv(output_names['rawndb_simple_csv']):
+            if not self.generate_rawndb_simple_csv(output_names['rawndb_simple_csv'], rawndb_df):
                 return False
             
             return True
@@ -407,16 +1168,167 @@ class FinalOutputGenerator:
         except Exception as e:
             log_message("ERROR", f"Final outputs generation failed: {str(e)}")
             return False
+    
+    def iter_processed_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE, dtypes=None):
+        """Generator chunk processed data (TXT Step 2), hanya kolom yang dipakai output RAWNDB"""
+        header = read_csv_header(self.processed_data_path, sep='\t')
+        usecols = [col for col in header if col in self.RAWNDB_COLUMN_MAPPING]
+        
+        reader = pd.read_csv(self.processed_data_path, sep='\t', usecols=usecols, dtype=dtypes,
+                             chunksize=chunk_size, low_memory=False)
+        has_chunks = False
+        
+        for chunk in reader:
+            has_chunks = True
+            yield chunk
+        
+        # TXT tanpa baris data tetap menghasilkan header output
+        if not has_chunks:
+            yield pd.read_csv(self.processed_data_path, sep='\t', usecols=usecols, nrows=0)
+    
+    def generate_final_outputs_chunked(self, output_names, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Streaming Step 4: RAWNDB di-append per chunk, 1st tier di-dedup lintas chunk
+        
+        Memory sebesar 1 chunk + digest 64-bit per baris unik 1st tier
+        (spill ke disk jika melewati batas, lihat dedup.py).
+        
+        Pass pertama memakai inferensi dtype per chunk. Jika dtype kolom TXT atau RAWNDB berbeda
+        antar chunk (format angka dan digest dedup ikut berbeda), TXT dibaca ulang 1x dengan
+        dtype gabungan seluruh file.
+        """
+        from dedup import StreamingDeduplicator
+        
+        dedup = None
+        try:
+            log_message("START", f"Streaming processed data per {chunk_size:,} baris...")
+            start_time = time.time()
+            
+            rawndb_csv = output_names['rawndb_csv']
+            txt_dtypes = None
+            rawndb_dtypes = {}
+            
+            for chunk_pass in (1, 2):
+                dedup = StreamingDeduplicator(output_names['rawndb_simple_csv'])
+                seen_txt = {}
+                seen_rawndb = {}
+                rawndb_rows = 0
+                chunk_count = 0
+                
+                for chunk in self.iter_processed_chunks(chunk_size, txt_dtypes):
+                    if txt_dtypes is None:
+                        record_chunk_dtypes(seen_txt, chunk)
+                        # Kolom yang kosong di seluruh chunk terbaca float, dipakai sebagai text seperti load penuh
+                        empty_columns = [col for col in chunk.columns
+                                         if chunk[col].dtype == 'float64' and len(chunk) and chunk[col].isna().all()]
+                        if empty_columns:
+                            chunk = chunk.astype(dict.fromkeys(empty_columns, object))
+                    
+                    self.df = chunk
+                    rawndb_df = self.build_rawndb_frame(verbose=False)
+                    if rawndb_df is None:
+                        return False
+                    
+                    if txt_dtypes is None:
+                        # Sector dihitung sebelum filter baris, kolom lain hanya dari baris yang tersisa
+                        record_chunk_dtypes(seen_rawndb, rawndb_df if len(rawndb_df) else rawndb_df.filter(['Sector']))
+                    
+                    # Dtype sama di semua chunk sebelum ditulis dan di-hash
+                    casts = {col: dtype for col, dtype in rawndb_dtypes.items()
+                             if col in rawndb_df.columns and rawndb_df[col].dtype != dtype}
+                    if casts:
+                        rawndb_df = rawndb_df.astype(casts)
+                    
+                    rawndb_df.to_csv(rawndb_csv, index=False, mode='w' if chunk_count == 0 else 'a',
+                                     header=chunk_count == 0)
+                    dedup.add(self.build_simple_frame(rawndb_df))
+                    
+                    chunk_count += 1
+                    rawndb_rows += len(rawndb_df)
+                    log_message("INFO", f"Chunk {chunk_count}: {rawndb_rows:,} baris RAWNDB")
+                
+                if chunk_pass == 2:
+                    break
+                
+                txt_dtypes = merge_chunk_dtypes(seen_txt)
+                rawndb_dtypes = merge_chunk_dtypes(seen_rawndb)
+                simple_columns = self.build_simple_frame(rawndb_df).columns
+                if (chunk_dtypes_consistent(seen_txt, txt_dtypes)
+                        and chunk_dtypes_consistent(seen_rawndb, rawndb_dtypes, simple_columns)):
+                    break
+                
+                log_message("INFO", "Dtype berbeda antar chunk, TXT dibaca ulang dengan dtype seluruh file")
+                dedup.cleanup()
+            
+            simple_rows = dedup.finish()
+            self.df = None
+            
+            log_message("SUCCESS", f"{rawndb_csv} tersimpan: {rawndb_rows:,} baris")
+            log_message("SUCCESS", f"{output_names['rawndb_simple_csv']} tersimpan: {dedup.rows_in:,} -> {simple_rows:,} baris (tanpa duplikat)")
+            log_message("SUCCESS", f"Streaming Step 4 selesai dalam {time.time() - start_time:.2f} detik "
+                                   f"({chunk_count} chunk, {chunk_pass} pass baca TXT)")
+            
+            return True
+            
+        except Exception as e:
+            log_message("ERROR", f"Final outputs generation failed: {str(e)}")
+            return False
+        
+        finally:
+            if dedup is not None:
+                dedup.cleanup()
 
-def process_step2(csv_path, output_names):
+def process_step2(csv_path, output_names, chunk_size=None, engine='pandas', handoff=None,
+                  regions=None, site_ids=None, use_site_index=False, spatial=None, allowed_columns=None):
     """
     Step 2: Transform dan filter data CSV
+    
+    Jika chunk_size diisi, data diproses per chunk (streaming mode) sehingga
+    pemakaian memory tergantung ukuran chunk, bukan ukuran file.
+    
+    Jika handoff (dict) diisi dan data diload penuh, frame hasil disimpan di
+    handoff['df'] untuk Step 4 dan TXT ditulis di background (handoff['writer']).
+    
+    regions (list) / site_ids (list, text atau SiteIdFilter) / spatial (bbox, WKT, GeoJSON atau
+    SpatialFilter) memfilter baris saat baca CSV, sebelum transform.
+    Dengan use_site_index, baris terfilter dibaca lewat sidecar index (site_index.py).
+    allowed_columns = kolom output TXT (default kolom bawaan NDBDataProcessor).
     """
     try:
         log_message("STEP2", "=== Data Transformation ===")
         
+        # Site index sudah membaca baris terfilter saja, engine polars tidak diperlukan
+        use_index = use_site_index and bool(regions or site_ids)
+        
+        if resolve_processing_engine(engine) == 'polars' and not use_index:
+            if chunk_size:
+                log_message("INFO", "Engine polars mengatur memory sendiri, chunk size diabaikan")
+            if run_polars_steps(csv_path, output_names, ('step2',), allowed_columns, regions=regions,
+                                site_ids=site_ids, spatial=spatial):
+                log_message("COMPLETE", f"Step 2 completed: {output_names['processed_txt']}")
+                return True
+            engine = 'pandas'
+        
         # Create processor instance
         processor = NDBDataProcessor(csv_path)
+        if allowed_columns is not None:
+            processor.allowed_columns_raw = allowed_columns
+        processor.reader_engine = engine
+        processor.region_filter = list(regions or [])
+        processor.site_id_filter = SiteIdFilter.coerce(site_ids)
+        processor.spatial_filter = SpatialFilter.coerce(spatial)
+        processor.use_site_index = use_site_index
+        
+        if chunk_size:
+            # Streaming mode
+            output_file = output_names['processed_txt']
+            total_rows, columns = processor.process_chunked(output_file, chunk_size)
+            
+            log_message("COMPLETE", f"Step 2 completed: {output_file}")
+            log_message("INFO", f"Final shape: ({total_rows}, {len(columns)})")
+            log_message("INFO", f"Kolom yang dipertahankan: {len(columns)}")
+            
+            return True
         
         # Load data
         if not processor.load_data():
@@ -432,7 +1344,11 @@ def process_step2(csv_path, output_names):
         
         # Save processed data
         output_file = output_names['processed_txt']
-        final_df.to_csv(output_file, sep='\t', index=False)
+        if handoff is not None:
+            handoff['df'] = final_df
+            handoff['writer'] = BackgroundWriter(final_df, output_file)
+        else:
+            final_df.to_csv(output_file, sep='\t', index=False)
         
         log_message("COMPLETE", f"Step 2 completed: {output_file}")
         log_message("INFO", f"Final shape: {final_df.shape}")
@@ -444,22 +1360,37 @@ def process_step2(csv_path, output_names):
         log_message("ERROR", f"Step 2 failed: {str(e)}")
         return False
 
-def process_step4(output_names):
+def process_step4(output_names, engine='pandas', df=None, chunk_size=None):
     """
     Step 4: Generate final outputs (RAWNDB files)
+    
+    Jika df diisi (frame hasil Step 2), TXT tidak dibaca ulang dari disk.
+    Jika chunk_size diisi (dan df kosong), TXT diproses per chunk (streaming mode).
     """
     try:
         log_message("STEP4", "=== Final Outputs Generator ===")
         
         # Check if processed data exists
         processed_file = output_names['processed_txt']
-        if not os.path.exists(processed_file):
+        if df is None and not os.path.exists(processed_file):
             raise Exception(f"{processed_file} not found. Run Step 2 first.")
         
+        if df is None and resolve_processing_engine(engine) == 'polars':
+            if run_polars_steps(None, output_names, ('step4',)):
+                log_message("COMPLETE", "Step 4 completed successfully!")
+                return True
+            engine = 'pandas'
+        
         # Generate final outputs
-        generator = FinalOutputGenerator(processed_file)
+        generator = FinalOutputGenerator(processed_file, df=df)
+        generator.reader_engine = engine
         
-        if generator.generate_final_outputs(output_names):
+        if df is None and chunk_size:
+            success = generator.generate_final_outputs_chunked(output_names, chunk_size)
+        else:
+            success = generator.generate_final_outputs(output_names)
+        
+        if success:
             log_message("COMPLETE", "Step 4 completed successfully!")
             
             # Show results
@@ -477,39 +1408,59 @@ def process_step4(output_names):
         log_message("ERROR", f"Step 4 failed: {str(e)}")
         return False
 
-def process_all_steps(csv_path):
+def process_all_steps(csv_path, chunk_size=None, engine='pandas', regions=None, site_ids=None,
+                      use_site_index=False, spatial=None, output_dir=None, allowed_columns=None):
     """
-    Run all processing steps
+    Run all processing steps (regions / site_ids / spatial = filter baris opsional)
+    
+    Output ditulis ke output_dir (default folder kerja), allowed_columns = kolom output TXT.
     """
     try:
         log_message("START", "=== NDB CSV Processing Started ===")
         log_message("INPUT", f"CSV File: {csv_path}")
         
         # Generate output names based on input
-        output_names = generate_output_names(csv_path)
-        log_message("INFO", f"Output files akan dibuat:")
+        output_names = generate_output_names(csv_path, output_dir)
+        log_message("INFO", "Output files akan dibuat:")
         for key, name in output_names.items():
             log_message("INFO", f"- {name}")
         
         overall_start = time.time()
         
-        # Step 2: Transform data
+        # Engine polars: Step 2 -> Step 4 sebagai satu lazy query plan
+        if resolve_processing_engine(engine) == 'polars' and not (use_site_index and (regions or site_ids)):
+            if run_polars_steps(csv_path, output_names, ('step2', 'step4'), allowed_columns, regions=regions,
+                                site_ids=site_ids, spatial=spatial):
+                total_time = time.time() - overall_start
+                log_message("COMPLETE", "=== ALL PROCESSING COMPLETED ===")
+                log_message("TIMING", f"Total processing time: {total_time:.2f} seconds")
+                return True
+            engine = 'pandas'
+        
+        # Step 2: Transform data (frame diteruskan langsung ke Step 4)
+        handoff = {}
         step2_start = time.time()
-        if not process_step2(csv_path, output_names):
+        if not process_step2(csv_path, output_names, chunk_size, engine, handoff=handoff,
+                             regions=regions, site_ids=site_ids, use_site_index=use_site_index,
+                             spatial=spatial, allowed_columns=allowed_columns):
             return False
         step2_time = time.time() - step2_start
         log_message("TIMING", f"Step 2 took {step2_time:.2f} seconds")
         
-        # Step 4: Generate final outputs
+        # Step 4: Generate final outputs, TXT Step 2 ditulis bersamaan di background
         step4_start = time.time()
-        if not process_step4(output_names):
+        step4_ok = process_step4(output_names, engine, df=handoff.pop('df', None), chunk_size=chunk_size)
+        writer = handoff.get('writer')
+        if writer is not None and not writer.wait():
+            return False
+        if not step4_ok:
             return False
         step4_time = time.time() - step4_start
         log_message("TIMING", f"Step 4 took {step4_time:.2f} seconds")
         
         # Summary
         total_time = time.time() - overall_start
-        log_message("COMPLETE", f"=== ALL PROCESSING COMPLETED ===")
+        log_message("COMPLETE", "=== ALL PROCESSING COMPLETED ===")
         log_message("TIMING", f"Total processing time: {total_time:.2f} seconds")
         
         return True
@@ -518,6 +1469,254 @@ def process_all_steps(csv_path):
         log_message("ERROR", f"Processing failed: {str(e)}")
         return False
 
+def process_partitioned(csv_path, output_dir=None, chunk_size=None, engine='pandas', regions=None,
+                        site_ids=None, use_site_index=False, allowed_columns=None, partitions=None,
+                        spatial=None):
+    """
+    Partition by REGION: scan CSV streaming (1x, 2x jika dtype berbeda antar chunk), lalu Step 4 per region
+    
+    Output tiap region ditulis ke output_dir/<REGION>/ dengan nama file yang sama seperti
+    mode biasa. Jika partitions (dict) diisi, berisi {region: output names} setelah selesai.
+    """
+    try:
+        log_message("START", "=== NDB CSV Processing (Partition by REGION) ===")
+        log_message("INPUT", f"CSV File: {csv_path}")
+        overall_start = time.time()
+        
+        output_dir = output_dir or os.getcwd()
+        output_names = generate_output_names(csv_path)
+        
+        if resolve_processing_engine(engine) == 'polars':
+            log_message("INFO", "Partition mode memakai streaming engine pandas")
+            engine = 'pandas'
+        
+        processor = NDBDataProcessor(csv_path)
+        if allowed_columns is not None:
+            processor.allowed_columns_raw = allowed_columns
+        processor.region_filter = list(regions or [])
+        processor.site_id_filter = SiteIdFilter.coerce(site_ids)
+        processor.spatial_filter = SpatialFilter.coerce(spatial)
+        processor.use_site_index = use_site_index
+        # REGION selalu di-parse untuk menentukan partisi
+        processor.transform_input_columns = processor.transform_input_columns + [REGION_COLUMN]
+        
+        # Step 2: 1x scan, TXT per region
+        region_txts = processor.process_partitioned(output_dir, output_names, chunk_size or DEFAULT_CHUNK_SIZE)
+        
+        # Step 4 per region, memory sebesar 1 region
+        for region, (txt_path, rows) in region_txts.items():
+            log_message("STEP4", f"=== Region {region or '(kosong)'}: {rows:,} baris ===")
+            region_dir = os.path.dirname(txt_path)
+            region_names = {key: os.path.join(region_dir, name) for key, name in output_names.items()}
+            
+            generator = FinalOutputGenerator(txt_path)
+            generator.reader_engine = engine
+            if chunk_size:
+                success = generator.generate_final_outputs_chunked(region_names, chunk_size)
+            else:
+                success = generator.generate_final_outputs(region_names)
+            if not success:
+                raise Exception(f"Failed to generate final outputs untuk region {region}")
+            
+            if partitions is not None:
+                partitions[region] = region_names
+        
+        total_time = time.time() - overall_start
+        log_message("COMPLETE", f"=== PARTITION PROCESSING COMPLETED ({len(region_txts)} region) ===")
+        log_message("TIMING", f"Total processing time: {total_time:.2f} seconds")
+        
+        return True
+        
+    except Exception as e:
+        log_message("ERROR", f"Partition processing failed: {str(e)}")
+        return False
+
+def get_available_memory():
+    """Memory fisik yang tersedia (byte), None jika tidak bisa dibaca"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    
+    try:
+        if os.path.exists('/proc/meminfo'):
+            with open('/proc/meminfo', 'r') as f:
+                for line in f:
+                    if line.startswith('MemAvailable:'):
+                        return int(line.split()[1]) * 1024
+        
+        if sys.platform == 'win32':
+            import ctypes
+            
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                            ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                            ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                            ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                            ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+            
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys
+            return None
+        
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def estimate_batch_memory(csv_path, chunk_size=None):
+    """Estimasi peak memory (byte) untuk memproses 1 file"""
+    data_size = os.path.getsize(csv_path)
+    if chunk_size:
+        data_size = min(data_size, chunk_size * ESTIMATED_ROW_BYTES)
+    return int(data_size * BATCH_MEMORY_FACTOR)
+
+def get_batch_workers(csv_paths, chunk_size=None, max_workers=None):
+    """Jumlah worker batch: dibatasi jumlah core, jumlah file dan memory tersedia / file terbesar"""
+    workers = min(max_workers or os.cpu_count() or 1, len(csv_paths))
+    
+    available = get_available_memory()
+    if available and csv_paths:
+        peak = max(estimate_batch_memory(path, chunk_size) for path in csv_paths)
+        if peak > 0:
+            workers = min(workers, available // peak)
+    
+    return max(1, int(workers))
+
+def _run_batch_file(csv_path, output_dir, options):
+    """Worker batch (process terpisah): proses 1 file, log ditulis ke <output_dir>/<input>_batch.log"""
+    start_time = time.time()
+    log_path = os.path.join(output_dir, f"{get_base_filename(csv_path)}_batch.log")
+    
+    with open(log_path, 'w', encoding='utf-8') as log_file, contextlib.redirect_stdout(log_file):
+        success = process_all_steps(csv_path, output_dir=output_dir, **options)
+    
+    output_names = generate_output_names(csv_path, output_dir)
+    output_size = sum(os.path.getsize(path) for path in output_names.values() if os.path.exists(path))
+    
+    return {
+        'csv_path': csv_path,
+        'success': success,
+        'seconds': time.time() - start_time,
+        'input_mb': os.path.getsize(csv_path) / (1024 * 1024),
+        'output_mb': output_size / (1024 * 1024),
+        'log': log_path,
+    }
+
+def find_output_collisions(csv_paths):
+    """
+    Input berbeda yang menghasilkan nama output sama (nama file sama di folder berbeda)
+    
+    Nama dibandingkan case-insensitive (Windows). Return {nama: [path, ...]}.
+    """
+    by_name = {}
+    for path in dict.fromkeys(os.path.abspath(path) for path in csv_paths):
+        by_name.setdefault(get_base_filename(path).lower(), []).append(path)
+    return {name: paths for name, paths in by_name.items() if len(paths) > 1}
+
+def print_batch_summary(results, wall_time):
+    """Tabel waktu per file dan ringkasan throughput batch"""
+    name_width = max([len(os.path.basename(r['csv_path'])) for r in results] + [4])
+    
+    log_message("RESULTS", "Batch summary:")
+    print(f"{'File':<{name_width}}  {'Status':<6}  {'Input MB':>9}  {'Output MB':>9}  {'Waktu (s)':>9}  {'MB/s':>7}")
+    print("-" * (name_width + 53))
+    for r in results:
+        status = 'OK' if r['success'] else 'GAGAL'
+        rate = r['input_mb'] / r['seconds'] if r['seconds'] > 0 else 0
+        print(f"{os.path.basename(r['csv_path']):<{name_width}}  {status:<6}  {r['input_mb']:>9.1f}  "
+              f"{r['output_mb']:>9.1f}  {r['seconds']:>9.2f}  {rate:>7.1f}")
+    
+    total_input = sum(r['input_mb'] for r in results)
+    serial_time = sum(r['seconds'] for r in results)
+    failed = sum(1 for r in results if not r['success'])
+    log_message("TIMING", f"Total: {len(results)} file ({failed} gagal), {total_input:.1f} MB dalam {wall_time:.2f} detik "
+                          f"({total_input / wall_time if wall_time > 0 else 0:.1f} MB/s)")
+    log_message("TIMING", f"Waktu serial {serial_time:.2f} detik, speedup {serial_time / wall_time if wall_time > 0 else 0:.2f}x")
+
+def process_batch(csv_paths=None, output_dir=None, chunk_size=None, engine='pandas', regions=None,
+                  site_ids=None, spatial=None, max_workers=None, results=None, allowed_columns=None,
+                  use_site_index=False):
+    """
+    Batch: proses banyak CSV (default semua CSV di folder Input) paralel di process pool
+    
+    Setiap input menghasilkan 1 set output di output_dir (default folder kerja) dan log
+    <input>_batch.log, sehingga input dengan nama file sama (di folder berbeda) ditolak.
+    Jumlah worker dibatasi core dan memory (get_batch_workers).
+    Jika results (list) diisi, berisi hasil per file setelah selesai.
+    """
+    try:
+        log_message("START", "=== NDB CSV Batch Processing ===")
+        
+        csv_paths = list(csv_paths) if csv_paths is not None else find_input_csvs()
+        if not csv_paths:
+            raise Exception("Tidak ada file CSV untuk diproses")
+        
+        # File yang sama disebut 2x cukup diproses sekali
+        csv_paths = list({os.path.abspath(path): path for path in csv_paths}.values())
+        collisions = find_output_collisions(csv_paths)
+        if collisions:
+            for name, paths in collisions.items():
+                log_message("ERROR", f"Output '{name}_*' dipakai {len(paths)} input: {', '.join(paths)}")
+            raise Exception("Input dengan nama file sama akan saling menimpa output, proses ke output folder terpisah")
+        
+        output_dir = os.path.abspath(output_dir or os.getcwd())
+        os.makedirs(output_dir, exist_ok=True)
+        
+        workers = get_batch_workers(csv_paths, chunk_size, max_workers)
+        available = get_available_memory()
+        memory_text = f"{available / (1024 ** 3):.1f} GB" if available else "tidak diketahui"
+        log_message("INFO", f"{len(csv_paths)} file, {workers} worker (core: {os.cpu_count()}, memory tersedia: {memory_text})")
+        
+        options = {
+            'chunk_size': chunk_size,
+            'engine': engine,
+            'regions': list(regions or []),
+            'site_ids': site_ids,
+            'spatial': spatial,
+            'allowed_columns': allowed_columns,
+            'use_site_index': use_site_index,
+        }
+        
+        overall_start = time.time()
+        batch_results = {}
+        
+        # Spawn: perilaku sama di Windows dan Linux, aman untuk thread pool pandas / polars
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # File terbesar dulu supaya file besar tidak tertinggal di akhir batch
+            by_size = sorted(csv_paths, key=os.path.getsize, reverse=True)
+            futures = {executor.submit(_run_batch_file, path, output_dir, options): path for path in by_size}
+            
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'csv_path': path, 'success': False, 'seconds': time.time() - overall_start,
+                              'input_mb': os.path.getsize(path) / (1024 * 1024), 'output_mb': 0.0, 'error': str(e)}
+                    log_message("ERROR", f"{os.path.basename(path)}: {str(e)}")
+                
+                batch_results[path] = result
+                status = 'selesai' if result['success'] else f"GAGAL (lihat {result.get('log', 'log')})"
+                log_message("BATCH", f"[{len(batch_results)}/{len(csv_paths)}] {os.path.basename(path)} {status} "
+                                     f"dalam {result['seconds']:.2f} detik")
+        
+        ordered = [batch_results[path] for path in csv_paths]
+        print_batch_summary(ordered, time.time() - overall_start)
+        
+        if results is not None:
+            results.extend(ordered)
+        
+        return all(r['success'] for r in ordered)
+        
+    except Exception as e:
+        log_message("ERROR", f"Batch processing failed: {str(e)}")
+        return False
+
 def main():
     """Main console interface"""
     try:
@@ -529,36 +1728,69 @@ def main():
         print("1. Jalankan semua proses")
         print("2. Hanya transform data (Step 2)")
         print("3. Hanya generate outputs (Step 4)")
-        print("4. Keluar")
+        print("4. Jalankan semua proses, output per REGION (subfolder)")
+        print("5. Incremental: proses hanya baris yang berubah dari run sebelumnya")
+        print("6. Batch: proses semua CSV di folder Input (paralel)")
+        print("7. Keluar")
         print("=" * 60)
         print("Output files akan dinamai berdasarkan input file:")
         print("- [input]_for_qgis_make_sector_NDB.txt")
         print("- [input]_for_raw_TA_and_audit.csv")
         print("- [input]_for_raw_1st_tier.csv")
         
-        choice = input("Pilih opsi (1-4): ").strip()
+        choice = input("Pilih opsi (1-7): ").strip()
         
         if choice == "1":
             # Run all steps
             csv_path = get_csv_input()
             if csv_path:
-                return process_all_steps(csv_path)
+                return process_all_steps(csv_path, get_chunk_size_input(), get_engine_input(),
+                                         site_ids=get_site_filter_input(), spatial=get_spatial_filter_input())
         
         elif choice == "2":
             # Only Step 2
             csv_path = get_csv_input()
             if csv_path:
                 output_names = generate_output_names(csv_path)
-                return process_step2(csv_path, output_names)
+                return process_step2(csv_path, output_names, get_chunk_size_input(), get_engine_input(),
+                                     site_ids=get_site_filter_input(), spatial=get_spatial_filter_input())
         
         elif choice == "3":
             # Only Step 4
             csv_path = get_csv_input()
             if csv_path:
                 output_names = generate_output_names(csv_path)
-                return process_step4(output_names)
+                chunk_size = get_chunk_size_input()
+                return process_step4(output_names, get_engine_input(), chunk_size=chunk_size)
         
         elif choice == "4":
+            # Partition by REGION
+            csv_path = get_csv_input()
+            if csv_path:
+                return process_partitioned(csv_path, chunk_size=get_chunk_size_input(),
+                                           site_ids=get_site_filter_input(), spatial=get_spatial_filter_input())
+        
+        elif choice == "5":
+            # Incremental (delta) terhadap state run sebelumnya di folder kerja
+            from delta_processor import process_incremental
+            
+            csv_path = get_csv_input()
+            if csv_path:
+                return process_incremental(csv_path, site_ids=get_site_filter_input(),
+                                           spatial=get_spatial_filter_input(), engine=get_engine_input())
+        
+        elif choice == "6":
+            # Batch: semua CSV di folder Input, 1 set output per input
+            csv_paths = find_input_csvs()
+            if not csv_paths:
+                print("❌ Tidak ada file CSV di folder Input!")
+                return False
+            
+            log_message("INFO", f"{len(csv_paths)} file CSV di folder Input")
+            return process_batch(csv_paths, chunk_size=get_chunk_size_input(), engine=get_engine_input(),
+                                 site_ids=get_site_filter_input(), spatial=get_spatial_filter_input())
+        
+        elif choice == "7":
             print("👋 Sampai jumpa!")
             return True
         
@@ -574,7 +1806,204 @@ def main():
         log_message("ERROR", f"Main process failed: {str(e)}")
         return False
 
+def positive_int(value):
+    """Type argparse: bilangan bulat > 0"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"harus bilangan bulat: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"harus lebih dari 0: {number}")
+    return number
+
+def non_negative_int(value):
+    """Type argparse: bilangan bulat >= 0"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"harus bilangan bulat: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"tidak boleh negatif: {number}")
+    return number
+
+def build_cli_parser():
+    """Argument parser CLI non-interaktif"""
+    parser = argparse.ArgumentParser(
+        prog='ndb-csv-processor-cli',
+        description="NDB CSV Processor tanpa prompt (untuk cron / scheduler)",
+        epilog=f"Exit code: {EXIT_OK} = sukses, {EXIT_FAILED} = ada file gagal, {EXIT_USAGE} = argumen tidak valid, "
+               f"{EXIT_NO_INPUT} = tidak ada input CSV")
+    parser.add_argument('inputs', nargs='*',
+                        help="File CSV atau folder berisi CSV (default: semua CSV di folder Input)")
+    parser.add_argument('-o', '--output-dir', default=None, help="Folder output (default: folder kerja)")
+    parser.add_argument('-s', '--step', choices=CLI_STEPS, default='all',
+                        help="all = Step 2 + 4, 2 = transform saja, 4 = output dari TXT yang sudah ada, "
+                             "partition = output per REGION, incremental = delta dari run sebelumnya")
+    parser.add_argument('-r', '--region', action='append', default=[],
+                        help="Filter REGION (boleh berulang atau dipisah koma)")
+    parser.add_argument('--site-ids', default=None, help="Filter SITE_ID: daftar ID / pattern atau path file .txt/.csv")
+    parser.add_argument('--area', default=None, help="Filter area: bbox, WKT polygon atau path file .geojson/.wkt")
+    parser.add_argument('--columns-file', default=None,
+                        help="File JSON allowed columns (format column_settings.json), default kolom bawaan")
+    parser.add_argument('-e', '--engine', choices=PROCESSING_ENGINES, default='pandas')
+    parser.add_argument('-c', '--chunk-size', type=positive_int, default=None, help="Streaming mode: jumlah baris per chunk")
+    parser.add_argument('--use-site-index', action='store_true', help="Pakai sidecar site index untuk filter")
+    parser.add_argument('-w', '--workers', type=non_negative_int, default=1,
+                        help="Process paralel untuk banyak input dengan step all (0 = otomatis sesuai core dan memory)")
+    parser.add_argument('--json', action='store_true',
+                        help="Print ringkasan timing JSON ke stdout (log dipindah ke stderr)")
+    return parser
+
+def validate_cli_args(parser, args):
+    """Tolak opsi yang tidak dipakai step yang dipilih (parser.error -> exit code EXIT_USAGE)"""
+    unused = [flag for flag, dest in CLI_UNUSED_OPTIONS.get(args.step, []) if getattr(args, dest)]
+    if unused:
+        parser.error(f"{', '.join(unused)} tidak dipakai --step {args.step}")
+    if args.workers != 1 and args.step != 'all':
+        parser.error(f"--workers hanya dipakai dengan --step all (bukan {args.step})")
+
+def resolve_cli_inputs(inputs):
+    """Daftar file CSV dari argumen (file atau folder), default folder Input"""
+    csv_paths = []
+    for path in inputs or [get_input_dir()]:
+        if os.path.isdir(path):
+            csv_paths.extend(find_input_csvs(path))
+        elif os.path.isfile(path) and path.lower().endswith('.csv'):
+            csv_paths.append(path)
+        else:
+            log_message("ERROR", f"Input tidak ditemukan / bukan file CSV: {path}")
+    return csv_paths
+
+def run_cli_file(csv_path, args, options, outputs=None):
+    """
+    Jalankan step yang dipilih untuk 1 file, return True jika sukses
+    
+    Jika outputs (list) diisi, berisi path output yang ditulis step ini (yang ada di disk).
+    """
+    output_names = generate_output_names(csv_path, args.output_dir)
+    if args.step == 'all':
+        success = process_all_steps(csv_path, args.chunk_size, args.engine, output_dir=args.output_dir, **options)
+        paths = list(output_names.values())
+    elif args.step == '2':
+        success = process_step2(csv_path, output_names, args.chunk_size, args.engine, **options)
+        paths = [output_names['processed_txt']]
+    elif args.step == '4':
+        success = process_step4(output_names, args.engine, chunk_size=args.chunk_size)
+        paths = [output_names['rawndb_csv'], output_names['rawndb_simple_csv']]
+    elif args.step == 'partition':
+        # Output per region ada di subfolder <output_dir>/<REGION>/
+        partitions = {}
+        success = process_partitioned(csv_path, args.output_dir, args.chunk_size, args.engine,
+                                      partitions=partitions, **options)
+        paths = [path for region_names in partitions.values() for path in region_names.values()]
+    else:
+        from delta_processor import process_incremental, get_delta_filename
+        
+        options = {key: value for key, value in options.items() if key != 'use_site_index'}
+        success = process_incremental(csv_path, engine=args.engine, output_dir=args.output_dir, **options)
+        paths = list(output_names.values()) + [os.path.join(args.output_dir or '', get_delta_filename(csv_path))]
+    
+    if outputs is not None:
+        outputs.extend(path for path in paths if os.path.exists(path))
+    return success
+
+def run_cli(args, report):
+    """Isi report (dict) dan return exit code"""
+    csv_paths = resolve_cli_inputs(args.inputs)
+    if not csv_paths:
+        log_message("ERROR", "Tidak ada file CSV untuk diproses")
+        return EXIT_NO_INPUT
+    
+    # Semua input menulis ke 1 output folder, nama file sama akan saling menimpa
+    collisions = find_output_collisions(csv_paths)
+    if collisions:
+        for name, paths in collisions.items():
+            log_message("ERROR", f"Output '{name}_*' dipakai {len(paths)} input: {', '.join(paths)}")
+        return EXIT_USAGE
+    
+    try:
+        regions = [region.strip() for value in args.region for region in value.split(',') if region.strip()]
+        site_ids = None
+        if args.site_ids:
+            site_ids = (SiteIdFilter.from_file(args.site_ids) if os.path.isfile(args.site_ids)
+                        else SiteIdFilter.from_text(args.site_ids))
+        spatial = SpatialFilter.coerce(args.area)
+        allowed_columns = read_column_settings_file(args.columns_file) if args.columns_file else None
+    except Exception as e:
+        log_message("ERROR", f"Argumen tidak valid: {str(e)}")
+        return EXIT_USAGE
+    
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    
+    options = {
+        'regions': regions or None,
+        'site_ids': site_ids,
+        'spatial': spatial,
+        'allowed_columns': allowed_columns,
+        'use_site_index': args.use_site_index,
+    }
+    
+    if args.step == 'all' and len(csv_paths) > 1 and args.workers != 1:
+        # Banyak input: process pool (lihat process_batch)
+        batch_results = []
+        process_batch(csv_paths, args.output_dir, args.chunk_size, args.engine, max_workers=args.workers or None,
+                      results=batch_results, **options)
+        for result in batch_results:
+            output_names = generate_output_names(result['csv_path'], args.output_dir)
+            report['files'].append({
+                'input': result['csv_path'],
+                'success': result['success'],
+                'seconds': round(result['seconds'], 3),
+                'outputs': [path for path in output_names.values() if os.path.exists(path)],
+            })
+    else:
+        for csv_path in csv_paths:
+            start_time = time.time()
+            outputs = []
+            success = run_cli_file(csv_path, args, options, outputs)
+            report['files'].append({
+                'input': csv_path,
+                'success': bool(success),
+                'seconds': round(time.time() - start_time, 3),
+                'outputs': outputs,
+            })
+    
+    report['success'] = bool(report['files']) and all(item['success'] for item in report['files'])
+    return EXIT_OK if report['success'] else EXIT_FAILED
+
+def cli_main(argv=None):
+    """Entry point CLI non-interaktif (console script ndb-csv-processor-cli), return exit code"""
+    parser = build_cli_parser()
+    args = parser.parse_args(argv)
+    validate_cli_args(parser, args)
+    
+    report = {'step': args.step, 'engine': args.engine, 'success': False, 'files': []}
+    start_time = time.time()
+    
+    # Dengan --json, stdout hanya berisi JSON
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        try:
+            exit_code = run_cli(args, report)
+        except KeyboardInterrupt:
+            log_message("ERROR", "Proses dihentikan oleh user")
+            exit_code = EXIT_FAILED
+    
+    report['exit_code'] = exit_code
+    report['total_seconds'] = round(time.time() - start_time, 3)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    
+    return exit_code
+
 if __name__ == "__main__":
+    # Process pool batch di executable Windows (spawn)
+    multiprocessing.freeze_support()
+    
+    # Ada argumen -> CLI non-interaktif, tanpa argumen -> menu console
+    if len(sys.argv) > 1:
+        sys.exit(cli_main())
+    
     try:
         if main():
             print("\n✅ Program selesai dengan sukses!")
@@ -19,11 +19,12 @@ import time
 import os
 import sys
 import ctypes
+import importlib
 from pathlib import Path
-import pandas as pd
 
-# Import processing functions
-from main_processor import NDBDataProcessor, FinalOutputGenerator, generate_output_names
+# Opsi processing tanpa pandas / numpy. Modul processing (main_processor, site_filter, spatial_filter,
+# delta_processor, transform_rules) di-import di method yang memakainya, supaya window tampil lebih dulu
+from processing_options import DEFAULT_CHUNK_SIZE, READER_ENGINES, PROCESSING_ENGINES
 
 # Login handling imports
 from device_id import get_device_id
@@ -34,6 +35,14 @@ from login import login_menu
 # Column settings imports
 from column_settings import save_column_settings, load_column_settings, get_default_columns
 
+# Result cache dan transform rules (bagian dari key cache)
+from result_cache import ResultCache, build_cache_key, save_cache_settings
+from dataset_cache import DatasetCache, build_dataset_key
+
+# Modul yang di-import di background thread setelah frame pertama tampil (urutan = urutan import)
+WARMUP_MODULES = ['numpy', 'pandas', 'main_processor', 'site_filter', 'spatial_filter', 'transform_rules',
+                  'delta_processor']
+
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     try:
@@ -76,6 +85,33 @@ class NDBProcessorGUI:
         
         self.selected_regions = []
         self.site_id_filter = ""
+        # Daftar SITE_ID dari file .txt/.csv (sudah di-compile saat file dipilih)
+        self.site_id_file = ""
+        self.site_id_file_filter = None
+        # Filter area: bbox / WKT dari text input atau file .geojson/.wkt
+        self.spatial_text = ""
+        self.spatial_file_filter = None
+        # Output terpisah per REGION (1x scan, subfolder per region)
+        self.partition_by_region = False
+        
+        # Performance options (0 = load penuh tanpa chunk)
+        self.chunk_size = 0
+        self.engine = 'pandas'
+        # Sidecar site index untuk filter region / site ID (site_index.py)
+        self.use_site_index = False
+        # Incremental mode: hanya baris yang berubah dari run sebelumnya (delta_processor.py)
+        self.incremental = False
+        
+        # Cache hasil run lengkap (result_cache.py), batas 0 MB = nonaktif
+        self.result_cache = ResultCache()
+        # Frame hasil load + transform per sesi (dataset_cache.py), batas 0 MB = nonaktif
+        self.dataset_cache = DatasetCache()
+        # Set setelah modul processing selesai di-import di background (warmup_engine)
+        self.engine_ready = threading.Event()
+        
+        # Frame hasil Step 2 untuk Step 4 (in-memory handoff) dan writer TXT background
+        self.processed_df = None
+        self.processed_writer = None
         
         # Processing results
         self.results = {
@@ -217,74 +253,111 @@ class NDBProcessorGUI:
         ):
             pass
         
-    def apply_filters(self):
-        """Apply region and site ID filters to processed data"""
-        try:
-            processed_file = os.path.join(self.output_dir, self.output_names['processed_txt'])
-            if not os.path.exists(processed_file):
-                self.log_message("ERROR", f"{self.output_names['processed_txt']} tidak ditemukan. Jalankan proses transformasi dulu.")
-                return False
-                
-            self.log_message("FILTER", "Menerapkan filter region dan site ID...")
-            
-            # Load processed data
-            df = pd.read_csv(processed_file, sep='\t', low_memory=False)
-            original_rows = len(df)
-            
-            # Apply region filter
-            if self.selected_regions and "ALL REGIONS" not in self.selected_regions:
-                df = df[df['REGION'].isin(self.selected_regions)]
-                self.log_message("FILTER", f"Filter region: {', '.join(self.selected_regions)}")
-                
-            # Apply site ID filter
-            if self.site_id_filter.strip():
-                site_ids = [s.strip() for s in self.site_id_filter.split(',') if s.strip()]
-                if site_ids:
-                    df = df[df['SITE_ID'].isin(site_ids)]
-                    self.log_message("FILTER", f"Filter site ID: {', '.join(site_ids)}")
-                    
-            filtered_rows = len(df)
-            self.log_message("FILTER", f"Rows: {original_rows:,} -> {filtered_rows:,}")
+    def get_region_filter(self):
+        """Get list region untuk filter baris (kosong = semua region)"""
+        if not self.selected_regions or "ALL REGIONS" in self.selected_regions:
+            return []
+        return list(self.selected_regions)
+        
+    def get_site_id_filter(self):
+        """Get SiteIdFilter dari text input + file site list (kosong = semua site)"""
+        from site_filter import SiteIdFilter
+        
+        site_filter = SiteIdFilter.from_text(self.site_id_filter)
+        if self.site_id_file_filter is not None:
+            site_filter = site_filter.combine(self.site_id_file_filter)
+        return site_filter
+        
+    def browse_site_id_file(self):
+        """Open file browser untuk daftar SITE_ID (.txt / .csv)"""
+        def file_selected(sender, app_data):
+            file_path = app_data['file_path_name']
+            try:
+                from site_filter import SiteIdFilter
+                site_filter = SiteIdFilter.from_file(file_path)
+            except Exception as e:
+                dpg.set_value("error_popup_text", f"Gagal membaca file SITE_ID: {str(e)}")
+                dpg.show_item("error_popup")
+                return
             
-            # Save filtered data with new naming
-            filtered_file = os.path.join(self.output_dir, f"FILTERED_{self.output_names['processed_txt']}")
-            df.to_csv(filtered_file, sep='\t', index=False)
+            self.site_id_file = file_path
+            self.site_id_file_filter = site_filter
+            dpg.set_value("site_id_file_text", f"{Path(file_path).name} ({site_filter.describe()})")
+            self.log_message("FILTER", f"Site ID file: {Path(file_path).name} - {site_filter.describe()}")
+                
+        with dpg.file_dialog(
+            directory_selector=False, 
+            show=True, 
+            callback=file_selected, 
+            file_count=1,
+            default_path=self.default_input_dir,
+            width=700, 
+            height=400,
+            modal=True
+        ):
+            dpg.add_file_extension(".txt", color=(86, 205, 86, 255))
+            dpg.add_file_extension(".csv", color=(205, 86, 86, 255))
+            dpg.add_file_extension(".*", color=(150, 150, 150, 255))
             
-            self.log_message("FILTER", f"Data terfilter disimpan: {filtered_file}")
-            return True
+    def get_spatial_filter(self):
+        """Get SpatialFilter dari file atau text input (None = tanpa filter area)"""
+        if self.spatial_file_filter is not None:
+            return self.spatial_file_filter
+        if self.spatial_text.strip():
+            from spatial_filter import SpatialFilter
+            return SpatialFilter.from_text(self.spatial_text)
+        return None
+        
+    def browse_spatial_file(self):
+        """Open file browser untuk polygon area (.geojson / .wkt)"""
+        def file_selected(sender, app_data):
+            file_path = app_data['file_path_name']
+            try:
+                from spatial_filter import SpatialFilter
+                spatial = SpatialFilter.from_file(file_path)
+            except Exception as e:
+                dpg.set_value("error_popup_text", f"Gagal membaca file area: {str(e)}")
+                dpg.show_item("error_popup")
+                return
             
-        except Exception as e:
-            self.log_message("ERROR", f"Filter gagal: {str(e)}")
-            return False
+            self.spatial_file_filter = spatial
+            dpg.set_value("spatial_file_text", spatial.describe())
+            self.log_message("FILTER", f"Filter area: {spatial.describe()}")
+                
+        with dpg.file_dialog(
+            directory_selector=False, 
+            show=True, 
+            callback=file_selected, 
+            file_count=1,
+            default_path=self.default_input_dir,
+            width=700, 
+            height=400,
+            modal=True
+        ):
+            dpg.add_file_extension(".geojson", color=(86, 205, 86, 255))
+            dpg.add_file_extension(".json", color=(86, 205, 86, 255))
+            dpg.add_file_extension(".wkt", color=(205, 86, 86, 255))
+            dpg.add_file_extension(".*", color=(150, 150, 150, 255))
             
-    def cleanup_intermediate_files(self):
-        """Clean up intermediate files after processing"""
-        try:
-            # Only cleanup filtered intermediate file if filters were applied
-            # Keep the main processed .txt file as final output
-            if hasattr(self, 'selected_regions') and (self.selected_regions or self.site_id_filter.strip()):
-                # If filters were applied, remove the non-filtered intermediate file
-                unfiltered_file = os.path.join(self.output_dir, self.output_names['processed_txt'])
-                if os.path.exists(unfiltered_file):
-                    os.remove(unfiltered_file)
-                    self.log_message("CLEANUP", f"Removed unfiltered intermediate: {Path(unfiltered_file).name}")
-                    
-                # Rename filtered file to final name
-                filtered_file = os.path.join(self.output_dir, f"FILTERED_{self.output_names['processed_txt']}")
-                final_file = os.path.join(self.output_dir, self.output_names['processed_txt'])
-                if os.path.exists(filtered_file):
-                    os.rename(filtered_file, final_file)
-                    self.log_message("CLEANUP", f"Renamed filtered file to: {Path(final_file).name}")
-            else:
-                # No filters applied, keep the main file as is
-                self.log_message("CLEANUP", "No filters applied, keeping main processed file")
-                    
-        except Exception as e:
-            self.log_message("WARNING", f"Cleanup failed: {str(e)}")
+    def clear_spatial_file(self):
+        """Hapus filter file area"""
+        self.spatial_file_filter = None
+        dpg.set_value("spatial_file_text", "Belum ada file")
+        self.log_message("FILTER", "File area dihapus")
+            
+    def clear_site_id_file(self):
+        """Hapus filter file SITE_ID"""
+        self.site_id_file = ""
+        self.site_id_file_filter = None
+        dpg.set_value("site_id_file_text", "Belum ada file")
+        self.log_message("FILTER", "Site ID file dihapus")
             
     def process_step2(self):
         """Step 2: Process and transform CSV data"""
         try:
+            from main_processor import (NDBDataProcessor, BackgroundWriter, generate_output_names,
+                                        resolve_processing_engine, run_polars_steps)
+            
             self.update_progress(20, "Processing and transforming CSV data...")
             self.log_message("STEP2", "Starting CSV data transformation...")
             
@@ -294,21 +367,56 @@ class NDBProcessorGUI:
             # Create processor instance with custom allowed columns
             processor = NDBDataProcessor(self.input_file)
             processor.allowed_columns_raw = self.allowed_columns_raw  # Use GUI settings
+            processor.reader_engine = self.get_reader_engine()
+            
+            # Filter region / site ID diterapkan saat baca CSV, sebelum transform
+            processor.region_filter = self.get_region_filter()
+            processor.site_id_filter = self.get_site_id_filter()
+            processor.spatial_filter = self.get_spatial_filter()
+            processor.use_site_index = self.use_site_index
+            use_index = self.use_site_index and bool(processor.region_filter or processor.site_id_filter)
             
-            # Load and process data
-            if not processor.load_data():
-                raise Exception("Failed to load CSV data")
-                
             self.update_progress(40, "Transforming data...")
             self.log_message("STEP2", f"Using {len(self.allowed_columns_raw)} allowed columns untuk TXT output")
             
-            # Transform data
-            transformed_df = processor.transform_data(processor.df)
-            final_df = processor.filter_allowed_columns(transformed_df)
-            
             # Save processed data with new naming
             output_file = os.path.join(self.output_dir, self.output_names['processed_txt'])
-            final_df.to_csv(output_file, sep='\t', index=False)
+            self.processed_df = None
+            self.processed_writer = None
+            
+            if resolve_processing_engine(self.engine) == 'polars' and not use_index and run_polars_steps(
+                    self.input_file, {'processed_txt': output_file}, ('step2',), self.allowed_columns_raw,
+                    regions=processor.region_filter, site_ids=processor.site_id_filter,
+                    spatial=processor.spatial_filter):
+                # Engine polars: lazy query plan
+                self.log_message("STEP2", "Data diproses dengan engine polars")
+            elif self.chunk_size > 0:
+                # Streaming mode: transform + filter per chunk
+                self.log_message("STEP2", f"Streaming mode: {self.chunk_size:,} baris per chunk")
+                total_rows, columns = processor.process_chunked(output_file, self.chunk_size)
+                self.log_message("STEP2", f"Rows diproses: {total_rows:,}")
+            else:
+                # Frame transform dari dataset cache (tanpa parse ulang) jika tersedia
+                transformed_df = self.get_cached_dataset(processor, allow_load=not use_index)
+                if transformed_df is not None:
+                    if processor.has_row_filters():
+                        processor.log_row_filters()
+                        rows_before = len(transformed_df)
+                        transformed_df = processor.apply_row_filters(transformed_df)
+                        self.log_message("FILTER", f"Rows: {rows_before:,} -> {len(transformed_df):,}")
+                else:
+                    # Load and process data
+                    if not processor.load_data():
+                        raise Exception("Failed to load CSV data")
+                    
+                    # Transform data
+                    transformed_df = processor.transform_data(processor.df)
+                
+                final_df = processor.filter_allowed_columns(transformed_df)
+                
+                # Frame diteruskan ke Step 4, TXT ditulis di background
+                self.processed_df = final_df
+                self.processed_writer = BackgroundWriter(final_df, output_file)
             
             self.update_progress(60, "Data transformation completed!")
             self.results['step2'] = True
@@ -319,9 +427,57 @@ class NDBProcessorGUI:
             self.log_message("ERROR", f"Step 2 failed: {str(e)}")
             return False
             
+    def get_cached_dataset(self, processor, allow_load=True):
+        """
+        Frame load + transform seluruh baris (tanpa filter baris) untuk input saat ini
+        
+        Dari dataset cache jika input, transform rules dan kolom yang dibutuhkan cocok. Jika tidak
+        dan allow_load, CSV di-parse sekali (termasuk kolom filter) lalu disimpan ke cache.
+        Return None jika cache nonaktif / frame tidak ada (pemanggil load seperti biasa).
+        """
+        if not self.dataset_cache.enabled:
+            return None
+        
+        try:
+            from main_processor import NDBDataProcessor, read_csv_header, REGION_COLUMN, SITE_ID_COLUMN
+            from spatial_filter import LONGITUDE_COLUMNS, LATITUDE_COLUMNS
+            
+            key = build_dataset_key(self.input_file, processor.transform_rules, processor.use_schema)
+            header = read_csv_header(self.input_file)
+            required = [header[i] for i in processor.get_required_columns(header)]
+            
+            transformed_df = self.dataset_cache.get(key, required)
+            if transformed_df is not None:
+                self.log_message("CACHE", f"Dataset cache hit: {transformed_df.shape[0]:,} baris, tanpa parse ulang CSV")
+                return transformed_df
+            if not allow_load:
+                return None
+            
+            # Parse tanpa filter baris, kolom filter ikut dibaca supaya filter bisa diganti tanpa parse ulang
+            loader = NDBDataProcessor(self.input_file)
+            loader.allowed_columns_raw = processor.allowed_columns_raw
+            loader.reader_engine = processor.reader_engine
+            loader.use_schema = processor.use_schema
+            loader.transform_rules = processor.transform_rules
+            loader.transform_input_columns = (processor.transform_input_columns + [REGION_COLUMN, SITE_ID_COLUMN] +
+                                              LONGITUDE_COLUMNS + LATITUDE_COLUMNS)
+            if not loader.load_data():
+                raise Exception("Failed to load CSV data")
+            
+            transformed_df = loader.transform_data(loader.df)
+            if self.dataset_cache.put(key, loader.df.columns, transformed_df):
+                self.log_message("CACHE", f"Dataset disimpan di memory ({self.dataset_cache.nbytes / (1024 * 1024):.1f} MB dipakai)")
+            return transformed_df
+            
+        except Exception as e:
+            self.log_message("WARNING", f"Dataset cache dilewati: {str(e)}")
+            return None
+            
     def process_step4(self):
         """Step 4: Create final outputs"""
         try:
+            from main_processor import FinalOutputGenerator, resolve_processing_engine, run_polars_steps
+            
             self.update_progress(70, "Creating final outputs...")
             self.log_message("STEP4", "Creating RAWNDB outputs...")
             
@@ -330,12 +486,26 @@ class NDBProcessorGUI:
             os.chdir(self.output_dir)
             
             try:
-                # Check if we have filtered data, otherwise use processed data
-                filtered_file = f"FILTERED_{self.output_names['processed_txt']}"
-                input_file = filtered_file if os.path.exists(filtered_file) else self.output_names['processed_txt']
+                # Processed data sudah terfilter sejak Step 2
+                input_file = self.output_names['processed_txt']
+                
+                success = False
+                if self.processed_df is None and resolve_processing_engine(self.engine) == 'polars':
+                    polars_names = dict(self.output_names, processed_txt=input_file)
+                    success = run_polars_steps(None, polars_names, ('step4',))
+                    
+                if not success:
+                    generator = FinalOutputGenerator(input_file, df=self.processed_df)
+                    generator.reader_engine = self.get_reader_engine()
+                    if self.processed_df is None and self.chunk_size > 0:
+                        # Streaming mode: RAWNDB per chunk, 1st tier di-dedup lintas chunk
+                        success = generator.generate_final_outputs_chunked(self.output_names, self.chunk_size)
+                    else:
+                        success = generator.generate_final_outputs(self.output_names)
                 
-                generator = FinalOutputGenerator(input_file)
-                success = generator.generate_final_outputs(self.output_names)
+                # Tunggu TXT Step 2 selesai ditulis
+                if not self.wait_processed_txt():
+                    success = False
                 
                 if success:
                     self.update_progress(90, "Final outputs created!")
@@ -357,6 +527,87 @@ class NDBProcessorGUI:
             self.log_message("ERROR", f"Step 4 failed: {str(e)}")
             return False
             
+    def process_region_partitions(self):
+        """Partition by REGION: 1x scan, 3 output per region di subfolder output directory"""
+        try:
+            from main_processor import generate_output_names, process_partitioned
+            
+            self.update_progress(20, "Processing and partitioning CSV data per REGION...")
+            self.log_message("STEP2", "Starting partitioned processing per REGION...")
+            
+            self.output_names = generate_output_names(self.input_file)
+            partitions = {}
+            
+            success = process_partitioned(
+                self.input_file, self.output_dir, chunk_size=self.chunk_size or DEFAULT_CHUNK_SIZE,
+                engine=self.get_reader_engine(), regions=self.get_region_filter(),
+                site_ids=self.get_site_id_filter(), use_site_index=self.use_site_index,
+                allowed_columns=self.allowed_columns_raw, partitions=partitions,
+                spatial=self.get_spatial_filter())
+            if not success:
+                raise Exception("Failed to generate partitioned outputs")
+            
+            for region, region_names in partitions.items():
+                for filepath in region_names.values():
+                    if os.path.exists(filepath):
+                        self.results['files'].append((os.path.relpath(filepath, self.output_dir), filepath))
+            
+            self.update_progress(90, f"Output {len(partitions)} region selesai!")
+            self.results['step2'] = True
+            self.results['step4'] = True
+            return True
+            
+        except Exception as e:
+            self.log_message("ERROR", f"Partition processing failed: {str(e)}")
+            return False
+            
+    def process_incremental_run(self):
+        """Incremental mode: bandingkan dengan state di output directory, proses baris yang berubah saja"""
+        try:
+            from main_processor import generate_output_names
+            from delta_processor import process_incremental, get_delta_filename
+            
+            self.update_progress(20, "Processing changed rows (incremental)...")
+            self.log_message("STEP2", "Starting incremental processing...")
+            
+            self.output_names = generate_output_names(self.input_file)
+            
+            # State delta dan output ditulis di output directory
+            old_cwd = os.getcwd()
+            os.chdir(self.output_dir)
+            try:
+                success = process_incremental(
+                    self.input_file, regions=self.get_region_filter(), site_ids=self.get_site_id_filter(),
+                    spatial=self.get_spatial_filter(), allowed_columns=self.allowed_columns_raw,
+                    engine=self.get_reader_engine())
+            finally:
+                os.chdir(old_cwd)
+            if not success:
+                raise Exception("Failed to generate incremental outputs")
+            
+            for filename in list(self.output_names.values()) + [get_delta_filename(self.input_file)]:
+                filepath = os.path.join(self.output_dir, filename)
+                if os.path.exists(filepath):
+                    self.results['files'].append((filename, filepath))
+            
+            self.update_progress(90, "Incremental outputs created!")
+            self.results['step2'] = True
+            self.results['step4'] = True
+            return True
+            
+        except Exception as e:
+            self.log_message("ERROR", f"Incremental processing failed: {str(e)}")
+            return False
+            
+    def wait_processed_txt(self):
+        """Tunggu writer TXT background dan lepas frame in-memory"""
+        writer = self.processed_writer
+        self.processed_df = None
+        self.processed_writer = None
+        if writer is None:
+            return True
+        return writer.wait()
+        
     def process_all_parallel(self):
         """Process all steps in parallel thread"""
         def worker():
@@ -364,23 +615,38 @@ class NDBProcessorGUI:
                 self.is_processing = True
                 self.update_progress(5, "Starting processing...")
                 
-                # Step 2: Transform CSV data
-                if not self.process_step2():
+                if not self.engine_ready.is_set():
+                    self.log_message("INFO", "Menunggu engine processing selesai di-load...")
+                    self.engine_ready.wait()
+                
+                # Input + setting sama dengan run sebelumnya: salin output dari cache
+                cache_key = self.get_result_cache_key()
+                if cache_key and self.restore_cached_results(cache_key):
+                    self.update_progress(100, "Output diambil dari cache!")
+                    self.log_message("SUCCESS", "All processing completed (cache hit)!")
+                    self.open_output_folder()
                     return
-                    
-                # Apply filters if any
-                if self.selected_regions or self.site_id_filter.strip():
-                    self.update_progress(65, "Applying filters...")
-                    if not self.apply_filters():
+                files_before = len(self.results['files'])
+                
+                if self.partition_by_region:
+                    # Step 2 + Step 4 per REGION dalam 1x scan
+                    if not self.process_region_partitions():
                         return
-                        
-                # Step 4: Create final outputs
-                if not self.process_step4():
-                    return
-                    
-                # Cleanup intermediate files
-                self.update_progress(95, "Cleaning up intermediate files...")
-                self.cleanup_intermediate_files()
+                elif self.incremental:
+                    # Transform hanya baris yang berubah, sisanya disalin dari output sebelumnya
+                    if not self.process_incremental_run():
+                        return
+                else:
+                    # Step 2: Transform CSV data (termasuk filter region / site ID)
+                    if not self.process_step2():
+                        return
+                            
+                    # Step 4: Create final outputs
+                    if not self.process_step4():
+                        return
+                
+                if cache_key:
+                    self.store_cached_results(cache_key, self.results['files'][files_before:])
                     
                 self.update_progress(100, "Processing completed successfully!")
                 self.log_message("SUCCESS", "All processing completed!")
@@ -397,6 +663,86 @@ class NDBProcessorGUI:
         thread = threading.Thread(target=worker, daemon=True)
         thread.start()
         
+    def get_result_cache_key(self):
+        """Key result cache untuk input dan setting saat ini, None jika cache nonaktif / gagal"""
+        # Incremental mode selalu jalan supaya state delta ikut diperbarui
+        if not self.result_cache.enabled or (self.incremental and not self.partition_by_region):
+            return None
+        
+        try:
+            from main_processor import generate_output_names
+            from transform_rules import get_transform_rules
+            
+            return build_cache_key(
+                self.input_file, self.allowed_columns_raw, regions=self.get_region_filter(),
+                site_filter=self.get_site_id_filter(), spatial_filter=self.get_spatial_filter(),
+                rules=get_transform_rules(),
+                mode={
+                    'output_names': generate_output_names(self.input_file),
+                    'chunk_size': self.chunk_size,
+                    'partition_by_region': self.partition_by_region,
+                    'use_site_index': self.use_site_index,
+                })
+        except Exception as e:
+            self.log_message("WARNING", f"Result cache dilewati: {str(e)}")
+            return None
+            
+    def restore_cached_results(self, cache_key):
+        """Salin output dari result cache ke output directory, return True jika cache hit"""
+        try:
+            restored = self.result_cache.restore(cache_key, self.output_dir)
+        except Exception as e:
+            self.log_message("WARNING", f"Gagal membaca result cache: {str(e)}")
+            return False
+        
+        if not restored:
+            return False
+        
+        self.log_message("CACHE", f"Cache hit: {len(restored)} output disalin dari cache")
+        self.results['files'].extend(restored)
+        self.results['step2'] = True
+        self.results['step4'] = True
+        return True
+        
+    def store_cached_results(self, cache_key, files):
+        """Simpan output run ini ke result cache"""
+        relative_paths = [os.path.relpath(filepath, self.output_dir) for _, filepath in files
+                          if os.path.exists(filepath)]
+        if relative_paths and self.result_cache.store(cache_key, self.output_dir, relative_paths):
+            self.log_message("CACHE", f"{len(relative_paths)} output disimpan ke result cache")
+            
+    def update_cache_size(self, sender, app_data):
+        """Update batas ukuran result cache (MB)"""
+        self.result_cache.max_size_mb = max(0, int(app_data))
+        save_cache_settings(self.result_cache.max_size_mb)
+        self.result_cache.evict()
+        if self.result_cache.enabled:
+            self.log_message("SETTING", f"Result cache: maks {self.result_cache.max_size_mb:,} MB")
+        else:
+            self.log_message("SETTING", "Result cache nonaktif")
+            
+    def update_dataset_cache_size(self, sender, app_data):
+        """Update batas memory dataset cache (MB)"""
+        self.dataset_cache.max_size_mb = max(0, int(app_data))
+        self.dataset_cache.evict()
+        if self.dataset_cache.enabled:
+            self.log_message("SETTING", f"Dataset cache: maks {self.dataset_cache.max_size_mb:,} MB")
+        else:
+            self.log_message("SETTING", "Dataset cache nonaktif")
+            
+    def release_memory(self):
+        """Lepas frame di dataset cache"""
+        if self.is_processing:
+            self.log_message("WARNING", "Tunggu proses selesai sebelum melepas memory")
+            return
+        released = self.dataset_cache.release()
+        self.log_message("CACHE", f"Memory dilepas: {released / (1024 * 1024):.1f} MB")
+            
+    def clear_result_cache(self):
+        """Hapus semua isi result cache"""
+        self.result_cache.clear()
+        self.log_message("CACHE", "Result cache dikosongkan")
+        
     def stop_processing(self):
         """Stop current processing"""
         self.is_processing = False
@@ -755,8 +1101,75 @@ class NDBProcessorGUI:
                 dpg.add_spacer(height=10)
                 dpg.add_text("Filter berdasarkan SITE_ID (pisahkan dengan koma):", color=(234, 235, 208))
                 dpg.add_input_text(tag="site_id_filter", width=400, 
-                                 hint="Contoh: SITE001,SITE002,SITE003",
+                                 hint="Contoh: SITE001,SITE002,JKT*,BDG?01",
                                  callback=lambda s, a: self.update_site_id_filter(s, a))
+                dpg.add_text("Pattern: * = karakter apa saja, ? = 1 karakter", color=(160, 160, 160))
+                
+                dpg.add_text("Atau load daftar SITE_ID dari file (.txt per baris / .csv kolom SITE_ID):", color=(234, 235, 208))
+                with dpg.group(horizontal=True):
+                    dpg.add_button(label="Load dari file...", callback=lambda: self.browse_site_id_file())
+                    dpg.add_button(label="Hapus", callback=lambda: self.clear_site_id_file())
+                    dpg.add_text("Belum ada file", tag="site_id_file_text", color=(160, 160, 160))
+                
+                dpg.add_spacer(height=10)
+                dpg.add_text("Filter area (Longitude/Latitude): bbox atau WKT POLYGON:", color=(234, 235, 208))
+                dpg.add_input_text(tag="spatial_filter", width=400,
+                                 hint="Contoh: 106.6,-6.4,107.0,-6.1 (min_lon,min_lat,max_lon,max_lat)",
+                                 callback=lambda s, a: self.update_spatial_filter(s, a))
+                with dpg.group(horizontal=True):
+                    dpg.add_button(label="Load polygon...", callback=lambda: self.browse_spatial_file())
+                    dpg.add_button(label="Hapus", callback=lambda: self.clear_spatial_file())
+                    dpg.add_text("Belum ada file", tag="spatial_file_text", color=(160, 160, 160))
+                
+                dpg.add_spacer(height=10)
+                dpg.add_checkbox(label="Output terpisah per REGION (subfolder per region, 1x scan)",
+                               tag="partition_checkbox", default_value=self.partition_by_region,
+                               callback=lambda s, a: self.update_partition_by_region(s, a))
+                                 
+            # Performance section
+            with dpg.collapsing_header(label="Opsi Performa (Opsional)", default_open=False):
+                dpg.add_text("Streaming mode - jumlah baris per chunk (0 = load penuh):", color=(234, 235, 208))
+                dpg.add_text(f"Gunakan untuk file besar agar memory tetap rendah (contoh: {DEFAULT_CHUNK_SIZE})", color=(160, 160, 160))
+                dpg.add_input_int(tag="chunk_size_input", width=200, default_value=self.chunk_size,
+                                min_value=0, min_clamped=True, step=50000,
+                                callback=lambda s, a: self.update_chunk_size(s, a))
+                
+                dpg.add_spacer(height=10)
+                dpg.add_text("Engine processing:", color=(234, 235, 208))
+                dpg.add_text("pyarrow = reader multithread, polars = lazy query plan (fallback ke pandas jika tidak terinstall)", color=(160, 160, 160))
+                dpg.add_combo(PROCESSING_ENGINES, tag="engine_combo", width=200,
+                            default_value=self.engine,
+                            callback=lambda s, a: self.update_engine(s, a))
+                
+                dpg.add_spacer(height=10)
+                dpg.add_checkbox(label="Gunakan site index untuk filter region / site ID", tag="site_index_checkbox",
+                               default_value=self.use_site_index,
+                               callback=lambda s, a: self.update_site_index(s, a))
+                dpg.add_text("Index (.ndbidx.npz) dibuat di samping file input, dibuat ulang otomatis jika input berubah", color=(160, 160, 160))
+                
+                dpg.add_spacer(height=10)
+                dpg.add_checkbox(label="Incremental mode (proses hanya baris yang berubah dari run sebelumnya)",
+                               tag="incremental_checkbox", default_value=self.incremental,
+                               callback=lambda s, a: self.update_incremental(s, a))
+                dpg.add_text("Key CELL_NAME + CELL_ID, state ([input]_delta_state.npz) dan daftar perubahan (_delta.csv) di output directory", color=(160, 160, 160))
+                
+                dpg.add_spacer(height=10)
+                dpg.add_text("Result cache - batas ukuran (MB, 0 = nonaktif):", color=(234, 235, 208))
+                dpg.add_text("File dan setting yang sama diproses ulang -> output langsung disalin dari cache", color=(160, 160, 160))
+                with dpg.group(horizontal=True):
+                    dpg.add_input_int(tag="cache_size_input", width=200, default_value=self.result_cache.max_size_mb,
+                                    min_value=0, min_clamped=True, step=512,
+                                    callback=lambda s, a: self.update_cache_size(s, a))
+                    dpg.add_button(label="Hapus cache", callback=lambda: self.clear_result_cache())
+                
+                dpg.add_spacer(height=10)
+                dpg.add_text("Dataset cache di memory - batas (MB, 0 = nonaktif):", color=(234, 235, 208))
+                dpg.add_text("Run ulang file yang sama dengan filter / kolom lain tanpa parse ulang CSV", color=(160, 160, 160))
+                with dpg.group(horizontal=True):
+                    dpg.add_input_int(tag="dataset_cache_input", width=200, default_value=self.dataset_cache.max_size_mb,
+                                    min_value=0, min_clamped=True, step=512,
+                                    callback=lambda s, a: self.update_dataset_cache_size(s, a))
+                    dpg.add_button(label="Lepas memory", callback=lambda: self.release_memory())
                                  
             dpg.add_spacer(height=15)
             
@@ -807,6 +1220,44 @@ class NDBProcessorGUI:
         if self.site_id_filter.strip():
             self.log_message("FILTER", f"Site ID filter: {self.site_id_filter}")
         
+    def update_spatial_filter(self, sender, app_data):
+        """Update filter area (bbox / WKT)"""
+        self.spatial_text = app_data
+        if self.spatial_text.strip():
+            self.log_message("FILTER", f"Filter area: {self.spatial_text}")
+        
+    def update_partition_by_region(self, sender, app_data):
+        """Update mode output per REGION"""
+        self.partition_by_region = app_data
+        self.log_message("SETTING", f"Output per REGION: {'aktif' if self.partition_by_region else 'nonaktif'}")
+        
+    def update_chunk_size(self, sender, app_data):
+        """Update chunk size untuk streaming mode"""
+        self.chunk_size = max(0, int(app_data))
+        if self.chunk_size > 0:
+            self.log_message("SETTING", f"Streaming mode aktif: {self.chunk_size:,} baris per chunk")
+        else:
+            self.log_message("SETTING", "Streaming mode nonaktif (load penuh)")
+        
+    def update_engine(self, sender, app_data):
+        """Update engine processing"""
+        self.engine = app_data
+        self.log_message("SETTING", f"Engine processing: {self.engine}")
+        
+    def update_site_index(self, sender, app_data):
+        """Update opsi site index"""
+        self.use_site_index = app_data
+        self.log_message("SETTING", f"Site index: {'aktif' if self.use_site_index else 'nonaktif'}")
+        
+    def update_incremental(self, sender, app_data):
+        """Update opsi incremental mode"""
+        self.incremental = app_data
+        self.log_message("SETTING", f"Incremental mode: {'aktif' if self.incremental else 'nonaktif'}")
+        
+    def get_reader_engine(self):
+        """Engine pembaca CSV untuk path pandas (polars memakai reader pandas saat fallback)"""
+        return self.engine if self.engine in READER_ENGINES else "pandas"
+        
     def open_output_folder(self):
         """Open output folder in Windows Explorer"""
         try:
@@ -819,8 +1270,25 @@ class NDBProcessorGUI:
         except Exception as e:
             self.log_message("ERROR", f"Failed to open output folder: {str(e)}")
 
-    def run(self):
-        """Run the GUI application"""
+    def warmup_engine(self):
+        """Import modul processing (pandas, numpy, main_processor, ...) di background thread"""
+        def worker():
+            start_time = time.time()
+            try:
+                for module_name in WARMUP_MODULES:
+                    importlib.import_module(module_name)
+                self.log_message("INFO", f"Engine processing siap ({time.time() - start_time:.1f} detik)")
+            except Exception as e:
+                # Import diulang saat proses dimulai, error asli muncul di log saat itu
+                self.log_message("WARNING", f"Warmup engine gagal: {str(e)}")
+            finally:
+                self.engine_ready.set()
+                
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        
+    def setup_viewport(self):
+        """Build window dan tampilkan viewport (belum render frame)"""
         self.create_gui()
         
         # Setup viewport without icon
@@ -830,6 +1298,14 @@ class NDBProcessorGUI:
         dpg.show_viewport()
         dpg.set_primary_window("main_window", True)
         
+    def run(self):
+        """Run the GUI application"""
+        self.setup_viewport()
+        
+        # Frame pertama tampil dulu, baru engine processing di-load di background
+        dpg.render_dearpygui_frame()
+        self.warmup_engine()
+        
         # Main loop with UI updates
         while dpg.is_dearpygui_running():
             self.update_ui()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Polars Engine
+Lazy query plan untuk pipeline Step 2 -> Step 4 (load, transform, filter kolom,
+RAWNDB dan RAWNDB simple) dengan projection/predicate pushdown dan eksekusi
+multithread dari Polars.
+
+Output dibuat sama byte-per-byte dengan engine pandas: tipe kolom mengikuti
+inferensi pandas (integer dengan nilai kosong menjadi float) dan nilai float ditulis
+dengan format repr seperti pandas (lihat format_float_columns). NDB_DTYPE_SCHEMA
+hanya berisi kolom category yang ditulis sama seperti hasil inferensi, jadi tidak
+perlu di-override di sini.
+"""
+
+import os
+import re
+import csv
+import time
+
+from main_processor import log_message, NDBDataProcessor, REGION_COLUMN, SITE_ID_COLUMN
+from site_filter import SiteIdFilter
+from spatial_filter import SpatialFilter, find_coordinate_columns
+
+# Nilai yang dianggap kosong oleh parser pandas
+PANDAS_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+RAWNDB_COLUMN_MAPPING = {
+    'SITE_ID': 'Site ID',
+    'X_LONGITUDE': 'Longitude',
+    'Y_LATITUDE': 'Latitude',
+    'ANTENNA_AZIMUTH_DEG': 'Dir',
+    'HORIZONTAL_BEAMWIDTH_DEG': 'Ant_BW',
+    'Fixed_Ant_Size': 'Ant Size',
+    'CELL_NAME': 'EUtranCell',
+    'CELL_ID': 'cellId',
+    'Class_Cell': 'Class_Cell'
+}
+RAWNDB_COLUMN_ORDER = ['Site ID', 'Longitude', 'Latitude', 'Dir', 'Ant_BW', 'Ant Size', 'Sector', 'EUtranCell', 'cellId', 'Class_Cell']
+RAWNDB_NUMERIC_COLUMNS = ['Longitude', 'Latitude', 'Dir', 'Ant_BW', 'Ant Size', 'cellId', 'Sector']
+RAWNDB_SIMPLE_COLUMNS = ['Site ID', 'Longitude', 'Latitude', 'Dir', 'Sector']
+
+def is_polars_available():
+    """Cek apakah polars terinstall"""
+    try:
+        import polars  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _read_raw_header(csv_path, sep):
+    """Read header asli (tanpa mangling nama duplikat)"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return next(csv.reader(f, delimiter=sep), [])
+
+def build_row_filter(columns, regions=None, site_ids=None, spatial=None):
+    """Expression filter REGION / SITE_ID / area (sama seperti NDBDataProcessor.apply_row_filters)"""
+    import polars as pl
+
+    columns_upper = {col.upper(): col for col in columns}
+    row_filter = None
+
+    if regions:
+        if REGION_COLUMN not in columns_upper:
+            raise ValueError(f"Kolom {REGION_COLUMN} tidak ditemukan untuk filter region")
+        row_filter = pl.col(columns_upper[REGION_COLUMN]).cast(pl.String).is_in(list(regions)).fill_null(False)
+
+    if site_ids:
+        if SITE_ID_COLUMN not in columns_upper:
+            raise ValueError(f"Kolom {SITE_ID_COLUMN} tidak ditemukan untuk filter site ID")
+        site_filter = SiteIdFilter.coerce(site_ids).polars_expr(columns_upper[SITE_ID_COLUMN])
+        row_filter = site_filter if row_filter is None else row_filter & site_filter
+
+    if spatial is not None:
+        lon_col, lat_col = find_coordinate_columns(columns)
+        if lon_col is None or lat_col is None:
+            raise ValueError("Kolom Longitude/Latitude tidak ditemukan untuk filter area")
+        area_filter = SpatialFilter.coerce(spatial).polars_expr(lon_col, lat_col)
+        row_filter = area_filter if row_filter is None else row_filter & area_filter
+
+    return row_filter
+
+def scan_ndb_csv(csv_path, sep=',', columns=None, regions=None, site_ids=None, spatial=None):
+    """
+    Scan CSV secara lazy dengan tipe kolom yang sama seperti read_ndb_csv (pandas)
+
+    Return (LazyFrame, sector_is_float). sector_is_float menandakan ada CELL_NAME
+    tanpa digit terakhir (pada baris yang lolos filter) sehingga pandas menyimpan
+    Sector sebagai float.
+    """
+    import polars as pl
+
+    header = _read_raw_header(csv_path, sep)
+    if len(set(header)) != len(header):
+        raise ValueError("Header berisi nama kolom duplikat, tidak didukung engine polars")
+
+    columns = header if columns is None else columns
+
+    lf = pl.scan_csv(csv_path, separator=sep, infer_schema_length=None, null_values=PANDAS_NA_VALUES)
+    lf = lf.select(columns)
+    schema = lf.collect_schema()
+
+    # Profiling 1x scan (hanya kolom yang perlu dicek) untuk meniru inferensi pandas
+    profile_exprs = []
+    for col, dtype in schema.items():
+        if dtype.is_integer():
+            profile_exprs.append(pl.col(col).null_count().alias(f"nulls:{col}"))
+    # Tipe kolom mengikuti seluruh file (sama seperti pandas), filter baris dipasang sesudahnya
+    row_filter = build_row_filter(columns, regions, site_ids, spatial)
+    if 'CELL_NAME' in schema:
+        no_sector = ~pl.col('CELL_NAME').cast(pl.String).str.contains(r"\d$").fill_null(False)
+        if row_filter is not None:
+            no_sector = no_sector.filter(row_filter)
+        profile_exprs.append(no_sector.any().alias("sector_float"))
+    profile = lf.select(profile_exprs).collect().row(0, named=True) if profile_exprs else {}
+
+    casts = []
+    for col, dtype in schema.items():
+        if dtype.is_integer() and profile[f"nulls:{col}"] > 0:
+            # pandas menyimpan integer dengan nilai kosong sebagai float64
+            casts.append(pl.col(col).cast(pl.Float64))
+        elif dtype == pl.Boolean:
+            casts.append(pl.when(pl.col(col)).then(pl.lit("True")).otherwise(pl.lit("False")).alias(col))
+    if casts:
+        lf = lf.with_columns(casts)
+    if row_filter is not None:
+        lf = lf.filter(row_filter)
+
+    # Tanpa CELL_NAME, Sector diisi kosong (float) oleh pandas
+    sector_is_float = profile.get("sector_float", True)
+
+    return lf, sector_is_float
+
+def build_transform_plan(lf, allowed_columns, rules):
+    """Lazy plan untuk transform_data + filter_allowed_columns (rules = CompiledTransformRules)"""
+    import polars as pl
+
+    columns = lf.collect_schema().names()
+
+    # 1. Fixed_Ant_Size mapping based on CELL_SYSTEM_INFO
+    if 'CELL_SYSTEM_INFO' in columns:
+        system_info = pl.col('CELL_SYSTEM_INFO').cast(pl.String).str.to_uppercase()
+        ant_size = pl.when(system_info.is_null()).then(pl.lit(rules.default_ant_size))
+        for prefix, size in rules.fixed_ant_size_prefixes:
+            ant_size = ant_size.when(system_info.str.starts_with(prefix)).then(pl.lit(size))
+        ant_size = ant_size.otherwise(pl.lit(rules.default_ant_size))
+    else:
+        ant_size = pl.lit(rules.missing_column_ant_size)
+
+    # 2. Class_Cell: prefix pertama (urutan list) yang diikuti sector letter (A/B/C/D)
+    # Class_Cell kosong disimpan sebagai null supaya ditulis tanpa quote seperti pandas
+    if 'CELL_NAME' in columns:
+        cell_name = pl.col('CELL_NAME').cast(pl.String).str.to_uppercase()
+        class_cell = pl.lit(None, dtype=pl.String)
+        letter_pattern = "^[" + "".join(re.escape(letter) for letter in rules.class_cell_letters) + "]"
+        for prefix in reversed(rules.class_cell_prefixes):
+            rest = cell_name.str.splitn(prefix, 2).struct.field("field_1")
+            class_cell = pl.when(rest.str.contains(letter_pattern).fill_null(False)) \
+                .then(pl.lit(prefix) + rest.str.slice(0, rules.class_cell_length)) \
+                .otherwise(class_cell)
+    else:
+        class_cell = pl.lit(None, dtype=pl.String)
+
+    lf = lf.with_columns(ant_size.cast(pl.Float64).alias('Fixed_Ant_Size'), class_cell.alias('Class_Cell'))
+
+    # 3. INDOOR site handling - divide antenna size by indoor_divisor
+    indoor_mask = None
+    if 'SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR' in columns:
+        indoor_mask = pl.col('SITE_TYPE_GF_OR_RT_OR_MICROCELL_OR_INDOOR').cast(pl.String) == 'INDOOR'
+    elif 'SITE_NAME' in columns:
+        indoor_mask = pl.col('SITE_NAME').cast(pl.String).str.to_uppercase().str.contains('INDOOR', literal=True)
+    if indoor_mask is not None:
+        lf = lf.with_columns(
+            pl.when(indoor_mask.fill_null(False))
+            .then(pl.col('Fixed_Ant_Size') / rules.indoor_divisor)
+            .otherwise(pl.col('Fixed_Ant_Size'))
+            .alias('Fixed_Ant_Size')
+        )
+
+    # 4. Filter allowed columns (case-insensitive, urutan kolom dipertahankan)
+    allowed_upper = {col.upper() for col in allowed_columns}
+    existing_columns = [col for col in lf.collect_schema().names() if col.upper() in allowed_upper]
+
+    return lf.select(existing_columns)
+
+def build_rawndb_plan(processed_lf, sector_is_float):
+    """Lazy plan untuk generate_rawndb_csv"""
+    import polars as pl
+
+    columns = processed_lf.collect_schema().names()
+    available = {k: v for k, v in RAWNDB_COLUMN_MAPPING.items() if k in columns}
+    lf = processed_lf.select([pl.col(k).alias(v) for k, v in available.items()])
+
+    # Sector dari 1 digit terakhir CELL_NAME
+    sector_dtype = pl.Float64 if sector_is_float else pl.Int64
+    if 'EUtranCell' in available.values():
+        sector = pl.col('EUtranCell').cast(pl.String).str.extract(r"(\d)$", 1).cast(sector_dtype)
+    else:
+        sector = pl.lit(None, dtype=pl.Float64)
+    lf = lf.with_columns(sector.alias('Sector'))
+
+    existing_order = [col for col in RAWNDB_COLUMN_ORDER if col in lf.collect_schema().names()]
+    lf = lf.select(existing_order)
+
+    # Filter out rows with Site ID starting with '0'
+    if 'Site ID' in existing_order:
+        lf = lf.filter(~pl.col('Site ID').cast(pl.String).str.starts_with('0').fill_null(False))
+
+    # Validate numeric columns
+    schema = lf.collect_schema()
+    lf = lf.with_columns([
+        pl.col(col).cast(pl.Float64, strict=False)
+        for col in RAWNDB_NUMERIC_COLUMNS if col in schema and not schema[col].is_numeric()
+    ])
+
+    # Remove rows with invalid coordinates
+    if 'Longitude' in existing_order and 'Latitude' in existing_order:
+        lf = lf.drop_nulls(subset=['Longitude', 'Latitude'])
+
+    return lf
+
+def build_rawndb_simple_plan(rawndb_lf):
+    """Lazy plan untuk generate_rawndb_simple_csv (subset + deduplikasi urutan pertama)"""
+    columns = rawndb_lf.collect_schema().names()
+    available = [col for col in RAWNDB_SIMPLE_COLUMNS if col in columns]
+    return rawndb_lf.select(available).unique(maintain_order=True)
+
+def format_float_columns(df):
+    """
+    Kolom float ke string dengan format repr Python (sama seperti DataFrame.to_csv pandas)
+
+    write_csv polars menulis |x| < 1e-4 tanpa notasi eksponen (-0.00006, bukan -6e-05)
+    dan NaN sebagai "NaN". Hanya nilai tersebut yang diformat ulang per elemen.
+    """
+    import polars as pl
+
+    float_columns = [col for col, dtype in df.schema.items() if dtype in (pl.Float32, pl.Float64)]
+    if not float_columns:
+        return df
+
+    formatted = []
+    for col in float_columns:
+        values = df[col].cast(pl.Float64)
+        text = values.cast(pl.String)
+        text = text.set(values.is_nan().fill_null(False), None)
+        small = ((values.abs() < 1e-4) & (values != 0)).fill_null(False)
+        if small.any():
+            indices = small.arg_true()
+            text = text.scatter(indices, [repr(value) for value in values.gather(indices).to_list()])
+        formatted.append(text.alias(col))
+    return df.with_columns(formatted)
+
+def _write_output(df, output_name, sep=','):
+    """Write DataFrame polars dengan format yang sama seperti DataFrame.to_csv pandas"""
+    format_float_columns(df).write_csv(output_name, separator=sep, null_value='', line_terminator=os.linesep)
+
+    file_size = os.path.getsize(output_name) / (1024 * 1024)
+    log_message("SUCCESS", f"{output_name} tersimpan: {os.path.abspath(output_name)}")
+    log_message("INFO", f"Ukuran file: {file_size:.2f} MB")
+    log_message("INFO", f"Jumlah baris: {df.height:,}")
+    log_message("INFO", f"Jumlah kolom: {df.width}")
+
+def run_polars_pipeline(csv_path, output_names, allowed_columns=None, steps=('step2', 'step4'),
+                        regions=None, site_ids=None, spatial=None):
+    """
+    Jalankan pipeline dengan engine polars
+
+    steps berisi 'step2' (CSV -> TXT) dan/atau 'step4' (TXT/hasil Step 2 -> RAWNDB).
+    Jika keduanya dijalankan, ketiga output dieksekusi sebagai satu query plan.
+    regions / site_ids / spatial difilter langsung saat scan CSV (predicate pushdown).
+    """
+    import polars as pl
+
+    start_time = time.time()
+    plans = []
+    names = []
+
+    if 'step2' in steps:
+        log_message("START", "Membangun lazy query plan polars (Step 2)...")
+        processor = NDBDataProcessor(csv_path)
+        if allowed_columns is not None:
+            processor.allowed_columns_raw = allowed_columns
+        processor.region_filter = list(regions or [])
+        processor.site_id_filter = SiteIdFilter.coerce(site_ids)
+        processor.spatial_filter = SpatialFilter.coerce(spatial)
+        processor.log_row_filters()
+
+        # Projection pushdown: kolom yang dibutuhkan pipeline
+        header = _read_raw_header(csv_path, ',')
+        required = [header[i] for i in processor.get_required_columns(header)]
+        log_message("INFO", f"Projection: scan {len(required)} dari {len(header)} kolom")
+
+        source_lf, sector_is_float = scan_ndb_csv(csv_path, columns=required, regions=processor.region_filter,
+                                                  site_ids=processor.site_id_filter, spatial=processor.spatial_filter)
+        processed_lf = build_transform_plan(source_lf, processor.allowed_columns_raw, processor.transform_rules)
+        plans.append(processed_lf)
+        names.append((output_names['processed_txt'], '\t'))
+    else:
+        processed_lf, sector_is_float = scan_ndb_csv(output_names['processed_txt'], sep='\t')
+
+    if 'step4' in steps:
+        log_message("START", "Membangun lazy query plan polars (Step 4)...")
+        rawndb_lf = build_rawndb_plan(processed_lf, sector_is_float)
+        simple_lf = build_rawndb_simple_plan(rawndb_lf)
+        plans.extend([rawndb_lf, simple_lf])
+        names.extend([(output_names['rawndb_csv'], ','), (output_names['rawndb_simple_csv'], ',')])
+
+    # Eksekusi semua output sekaligus, sub-plan yang sama hanya dihitung sekali
+    log_message("START", f"Eksekusi query plan polars ({len(plans)} output)...")
+    results = pl.collect_all(plans)
+
+    for df, (output_name, sep) in zip(results, names):
+        _write_output(df, output_name, sep)
+
+    log_message("SUCCESS", f"Pipeline polars selesai dalam {time.time() - start_time:.2f} detik")
+    return True
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Processing Options
+Konstanta opsi processing yang dibutuhkan GUI saat membangun window
+
+Modul ini sengaja tanpa pandas / numpy supaya GUI bisa tampil sebelum engine processing di-load.
+"""
+
+# Default jumlah baris per chunk untuk streaming mode
+DEFAULT_CHUNK_SIZE = 200000
+
+# Engine reader CSV yang tersedia
+READER_ENGINES = ['pandas', 'pyarrow']
+# Engine processing: reader engine + lazy query plan polars
+PROCESSING_ENGINES = READER_ENGINES + ['polars']
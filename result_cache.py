@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Result Cache
+Cache hasil run lengkap (3 output) di folder Documents/NDB CSV Processor/cache
+
+Key cache = hash dari fingerprint input (ukuran, mtime, hash sampel isi), allowed columns,
+filter region / site ID / area, versi transform rules dan mode processing. Run ulang
+dengan file dan setting yang sama cukup menyalin output dari cache.
+Ukuran cache dibatasi, entry yang paling lama tidak dipakai dihapus lebih dulu (LRU).
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+
+from column_settings import get_settings_file
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_SIZE_MB = 2048
+MANIFEST_NAME = 'manifest.json'
+
+def get_cache_settings_file():
+    """Get path to result cache settings file (satu folder dengan column_settings.json)"""
+    return os.path.join(os.path.dirname(get_settings_file()), 'result_cache.json')
+
+def get_cache_dir():
+    """Get folder cache hasil (Documents/NDB CSV Processor/cache/results)"""
+    app_folder = os.path.dirname(os.path.dirname(get_settings_file()))
+    cache_dir = os.path.join(app_folder, 'cache', 'results')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def save_cache_settings(max_size_mb):
+    """Save batas ukuran cache (MB, 0 = cache nonaktif)"""
+    try:
+        with open(get_cache_settings_file(), 'w', encoding='utf-8') as f:
+            json.dump({'max_size_mb': int(max_size_mb), 'version': '1.0'}, f, indent=2)
+        return True
+
+    except Exception as e:
+        print(f"Failed to save cache settings: {e}")
+        return False
+
+def load_cache_settings():
+    """Load batas ukuran cache (MB), default DEFAULT_CACHE_SIZE_MB"""
+    try:
+        settings_file = get_cache_settings_file()
+        if not os.path.exists(settings_file):
+            return DEFAULT_CACHE_SIZE_MB
+
+        with open(settings_file, 'r', encoding='utf-8') as f:
+            max_size_mb = json.load(f).get('max_size_mb', DEFAULT_CACHE_SIZE_MB)
+        return max(int(max_size_mb), 0)
+
+    except Exception as e:
+        print(f"Failed to load cache settings: {e}")
+        return DEFAULT_CACHE_SIZE_MB
+
+def build_cache_key(csv_path, allowed_columns, regions=None, site_filter=None, spatial_filter=None,
+                    rules=None, mode=None):
+    """
+    Hash key cache dari semua input yang mempengaruhi output
+
+    site_filter / spatial_filter = SiteIdFilter / SpatialFilter (atau None),
+    rules = CompiledTransformRules, mode = dict opsi lain (chunk size, partisi, dll).
+    """
+    from site_index import compute_fingerprint
+
+    payload = {
+        'format': CACHE_FORMAT_VERSION,
+        'input': compute_fingerprint(csv_path),
+        'allowed_columns': list(allowed_columns),
+        'regions': sorted(regions or []),
+        'site_filter': site_filter.cache_key() if site_filter else None,
+        'spatial_filter': spatial_filter.cache_key() if spatial_filter is not None else None,
+        'rules': [rules.version, rules.rules_hash] if rules is not None else None,
+        'mode': mode or {},
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+class ResultCache:
+    """Cache output per key dengan LRU eviction berdasarkan total ukuran"""
+
+    def __init__(self, cache_dir=None, max_size_mb=None):
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.max_size_mb = load_cache_settings() if max_size_mb is None else max_size_mb
+
+    @property
+    def enabled(self):
+        return self.max_size_mb > 0
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _read_manifest(self, entry_dir):
+        try:
+            with open(os.path.join(entry_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _write_manifest(self, entry_dir, manifest):
+        temp_path = os.path.join(entry_dir, MANIFEST_NAME + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, os.path.join(entry_dir, MANIFEST_NAME))
+
+    def restore(self, key, output_dir):
+        """
+        Salin output dari cache ke output_dir
+
+        Return list (path relatif, path output) jika cache hit, None jika miss.
+        """
+        if not self.enabled:
+            return None
+
+        entry_dir = self._entry_dir(key)
+        manifest = self._read_manifest(entry_dir)
+        if manifest is None:
+            return None
+
+        files = manifest.get('files', [])
+        if not all(os.path.exists(os.path.join(entry_dir, 'files', path)) for path in files):
+            # Entry rusak (file hilang), hapus supaya di-store ulang
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        restored = []
+        for path in files:
+            target = os.path.join(output_dir, path)
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            # Copy (bukan hardlink): run berikutnya menimpa output di tempat
+            shutil.copyfile(os.path.join(entry_dir, 'files', path), target)
+            restored.append((path, target))
+
+        manifest['last_used'] = time.time()
+        self._write_manifest(entry_dir, manifest)
+        return restored
+
+    def store(self, key, output_dir, relative_paths):
+        """Simpan output (path relatif terhadap output_dir) ke cache, return True jika tersimpan"""
+        if not self.enabled:
+            return False
+
+        try:
+            total_size = sum(os.path.getsize(os.path.join(output_dir, path)) for path in relative_paths)
+            if total_size > self.max_size_mb * 1024 * 1024:
+                print(f"Output {total_size / (1024 * 1024):.1f} MB melebihi batas cache, tidak disimpan")
+                return False
+
+            # Tulis ke folder sementara lalu rename, entry tidak pernah setengah jadi
+            entry_dir = self._entry_dir(key)
+            temp_dir = entry_dir + f".tmp{os.getpid()}"
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            for path in relative_paths:
+                target = os.path.join(temp_dir, 'files', path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(os.path.join(output_dir, path), target)
+
+            now = time.time()
+            self._write_manifest(temp_dir, {
+                'key': key,
+                'files': list(relative_paths),
+                'size': total_size,
+                'created': now,
+                'last_used': now,
+            })
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temp_dir, entry_dir)
+
+            self.evict()
+            return True
+
+        except Exception as e:
+            print(f"Failed to store result cache: {e}")
+            return False
+
+    def entries(self):
+        """List (last_used, size, entry_dir) semua entry cache"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            manifest = self._read_manifest(entry_dir)
+            if manifest is not None:
+                entries.append((manifest.get('last_used', 0), manifest.get('size', 0), entry_dir))
+        return entries
+
+    def evict(self):
+        """Hapus entry paling lama tidak dipakai sampai total ukuran <= batas"""
+        limit = self.max_size_mb * 1024 * 1024
+        entries = sorted(self.entries())
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, entry_dir in entries:
+            if total_size <= limit:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+    def clear(self):
+        """Hapus semua entry cache"""
+        for _, _, entry_dir in self.entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
@@ -46,12 +46,18 @@ setup(
         "Environment :: X11 Applications",
         "Environment :: MacOS X",
     ],
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        # Engine opsional, tanpa dependency ini engine fallback ke pandas
+        "arrow": ["pyarrow>=12.0.0"],
+        "polars": ["polars>=1.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "ndb-csv-processor=ndb_processor_gui:main",
+            "ndb-csv-processor-cli=main_processor:cli_main",
         ],
     },
     keywords=[
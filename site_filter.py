@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Site ID Filter
+Filter SITE_ID untuk daftar besar (20k+ ID) dari text atau file .txt/.csv
+
+- ID biasa di-compile ke hash set (frozenset), dicek dengan isin
+- Pattern prefix/wildcard (JKT*, *01, BDG?1*) di-compile ke 1 regex
+- Evaluasi vectorized per nilai unik SITE_ID, sehingga biaya filter linear
+"""
+
+import os
+import re
+import csv
+
+import numpy as np
+import pandas as pd
+
+# Pemisah ID di text dan file .txt: koma, titik koma, spasi/tab dan newline
+SITE_ID_SEPARATORS = r'[,;\s]+'
+WILDCARD_CHARS = ('*', '?')
+
+def _wildcard_to_regex(pattern):
+    """Wildcard ke regex: * = karakter apa saja, ? = 1 karakter (sintaks juga valid untuk polars)"""
+    parts = []
+    for char in pattern:
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        elif char.isalnum() or char in '_ ':
+            parts.append(char)
+        else:
+            parts.append('\\' + char)
+    return ''.join(parts)
+
+class SiteIdFilter:
+    """Compiled SITE_ID filter: hash set untuk ID exact + 1 regex untuk prefix/wildcard"""
+
+    def __init__(self, site_ids=()):
+        exact = set()
+        patterns = []
+        for site_id in site_ids:
+            site_id = str(site_id).strip()
+            if not site_id:
+                continue
+            if any(char in site_id for char in WILDCARD_CHARS):
+                patterns.append(site_id)
+            else:
+                exact.add(site_id)
+
+        self.exact_ids = frozenset(exact)
+        # Urutan pattern dipertahankan, duplikat dibuang
+        self.patterns = list(dict.fromkeys(patterns))
+        self.regex = None
+        self.matcher = None
+        if self.patterns:
+            self.regex = "^(?:" + "|".join(_wildcard_to_regex(p) for p in self.patterns) + ")$"
+            self.matcher = re.compile(self.regex, re.DOTALL)
+
+    def __bool__(self):
+        return bool(self.exact_ids or self.patterns)
+
+    def __len__(self):
+        return len(self.exact_ids) + len(self.patterns)
+
+    def describe(self):
+        """Ringkasan filter untuk log"""
+        if len(self.exact_ids) <= 10 and len(self.patterns) <= 10:
+            return ', '.join(sorted(self.exact_ids) + self.patterns)
+        return f"{len(self.exact_ids):,} site ID + {len(self.patterns):,} pattern"
+
+    def cache_key(self):
+        """Representasi stabil filter (untuk key result cache)"""
+        return {'exact': sorted(self.exact_ids), 'patterns': self.patterns}
+
+    @classmethod
+    def from_text(cls, text):
+        """Parse daftar ID dari text (pisahkan dengan koma, spasi atau newline)"""
+        return cls(re.split(SITE_ID_SEPARATORS, text or ''))
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Load daftar ID dari file .txt atau .csv
+
+        File .csv memakai kolom SITE_ID jika ada di header (case-insensitive),
+        selain itu kolom pertama.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File site ID tidak ditemukan: {file_path}")
+
+        if not str(file_path).lower().endswith('.csv'):
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                return cls.from_text(f.read())
+
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            return cls()
+
+        header_upper = [col.strip().upper() for col in rows[0]]
+        if 'SITE_ID' in header_upper:
+            position = header_upper.index('SITE_ID')
+            rows = rows[1:]
+        else:
+            position = 0
+
+        return cls(row[position] for row in rows if len(row) > position)
+
+    @classmethod
+    def coerce(cls, site_ids):
+        """SiteIdFilter dari SiteIdFilter, list ID atau text"""
+        if isinstance(site_ids, cls):
+            return site_ids
+        if site_ids is None:
+            return cls()
+        if isinstance(site_ids, str):
+            return cls.from_text(site_ids)
+        return cls(site_ids)
+
+    def combine(self, other):
+        """Gabungkan 2 filter (OR)"""
+        return SiteIdFilter(list(self.exact_ids) + self.patterns + list(other.exact_ids) + other.patterns)
+
+    def mask(self, values):
+        """
+        Boolean mask (numpy) SITE_ID yang cocok, vectorized per nilai unik
+
+        Nilai dibandingkan sebagai text supaya SITE_ID numerik tetap cocok.
+        """
+        values = pd.Series(values, copy=False)
+        codes, uniques = pd.factorize(values)
+        unique_text = pd.Series(np.asarray(uniques, dtype=object), dtype=object).map(str)
+
+        hit = unique_text.isin(self.exact_ids).to_numpy(dtype=bool)
+        if self.matcher is not None:
+            hit = hit | unique_text.str.match(self.matcher).to_numpy(dtype=bool)
+
+        # Kode -1 (nilai kosong) tidak pernah cocok
+        return np.append(hit, False)[codes]
+
+    def polars_expr(self, column):
+        """Expression polars yang sama dengan mask() untuk engine polars"""
+        import polars as pl
+
+        text = pl.col(column).cast(pl.String)
+        expr = text.is_in(list(self.exact_ids))
+        if self.regex is not None:
+            expr = expr | text.str.contains(self.regex)
+        return expr.fill_null(False)
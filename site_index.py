@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Site Index
+Sidecar index byte-offset baris CSV NDB per SITE_ID, CELL_ID dan REGION, sehingga
+filter beberapa site cukup seek + read baris yang dibutuhkan tanpa parse seluruh file.
+
+Index disimpan di samping input (<input>.ndbidx.npz) bersama fingerprint file
+(ukuran, mtime dan hash sampel isi). Jika input berubah, index dibuat ulang otomatis.
+
+Key index dan dtype kolom diambil dari parsing seluruh file (sama seperti load penuh), sehingga
+baris yang dibaca lewat index sama dengan hasil filter setelah load penuh ("00123" -> 123,
+"NA" = kosong dan tidak pernah cocok).
+"""
+
+import os
+import json
+import time
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from main_processor import log_message, infer_csv_dtypes, REGION_COLUMN, SITE_ID_COLUMN
+from site_filter import SiteIdFilter
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = '.ndbidx.npz'
+INDEX_COLUMNS = [SITE_ID_COLUMN, 'CELL_ID', REGION_COLUMN]
+
+# Ukuran blok scan newline dan ukuran sampel hash (awal, tengah, akhir file)
+SCAN_BLOCK_SIZE = 64 * 1024 * 1024
+HASH_SAMPLE_SIZE = 1024 * 1024
+
+def get_index_path(csv_path):
+    """Get path sidecar index untuk file CSV"""
+    return str(csv_path) + INDEX_SUFFIX
+
+def compute_fingerprint(csv_path):
+    """
+    Fingerprint file CSV: ukuran, mtime dan hash isi
+
+    Hash dihitung dari sampel awal, tengah dan akhir file supaya validasi index
+    tetap cepat untuk file multi-GB.
+    """
+    stat = os.stat(csv_path)
+    hasher = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for position in sorted({0, max(stat.st_size // 2 - HASH_SAMPLE_SIZE // 2, 0),
+                                max(stat.st_size - HASH_SAMPLE_SIZE, 0)}):
+            f.seek(position)
+            hasher.update(f.read(HASH_SAMPLE_SIZE))
+
+    return {'version': INDEX_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'hash': hasher.hexdigest()}
+
+def scan_record_offsets(csv_path):
+    """
+    Byte offset awal setiap record CSV (header = record 0) plus ukuran file di akhir
+
+    Newline di dalam field ber-quote bukan batas record (paritas jumlah '"').
+    Baris kosong dilewati seperti parser pandas.
+    """
+    boundaries = [np.zeros(1, dtype=np.int64)]
+    quote_parity = 0
+    base = 0
+
+    with open(csv_path, 'rb') as f:
+        while True:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+            buf = np.frombuffer(block, dtype=np.uint8)
+            newlines = np.flatnonzero(buf == 10)
+            quotes = np.flatnonzero(buf == 34)
+
+            # Jumlah quote sebelum setiap newline menentukan apakah newline ada di dalam quote
+            quotes_before = np.searchsorted(quotes, newlines) + quote_parity
+            boundaries.append(newlines[quotes_before % 2 == 0].astype(np.int64) + base + 1)
+
+            quote_parity = (quote_parity + len(quotes)) % 2
+            base += len(block)
+
+    starts = np.concatenate(boundaries)
+    starts = starts[starts < base]
+    offsets = np.append(starts, base)
+
+    # Buang baris kosong ("\n" atau "\r\n")
+    lengths = np.diff(offsets)
+    candidates = np.flatnonzero(lengths <= 2)
+    if len(candidates):
+        blank = np.zeros(len(starts), dtype=bool)
+        with open(csv_path, 'rb') as f:
+            for i in candidates:
+                f.seek(starts[i])
+                blank[i] = f.read(lengths[i]).strip(b'\r\n') == b''
+        starts = starts[~blank]
+        offsets = np.append(starts, base)
+
+    return offsets
+
+class SiteIndex:
+    """Index byte-offset baris CSV per nilai SITE_ID, CELL_ID dan REGION"""
+
+    def __init__(self, csv_path, fingerprint, starts, ends, columns, dtypes=None, numeric_columns=None):
+        self.csv_path = csv_path
+        self.fingerprint = fingerprint
+        # starts[0]/ends[0] = header, starts[1:]/ends[1:] = baris data
+        self.starts = starts
+        self.ends = ends
+        # {kolom: (nilai unik terurut, row id terurut per nilai, batas per nilai)}
+        self.columns = columns
+        # Dtype semua kolom hasil inferensi seluruh file (dipakai saat baca baris terpilih)
+        self.dtypes = dtypes or {}
+        # {kolom index numerik: dtype}, key kolom ini = text nilai hasil parsing (123, 123.0)
+        self.numeric_columns = numeric_columns or {}
+
+    @property
+    def row_count(self):
+        return len(self.starts) - 1
+
+    @classmethod
+    def build(cls, csv_path):
+        """Build index dari CSV dan simpan ke sidecar file, return None jika gagal"""
+        try:
+            log_message("INDEX", f"Membangun site index untuk {os.path.basename(csv_path)}...")
+            start_time = time.time()
+
+            fingerprint = compute_fingerprint(csv_path)
+            offsets = scan_record_offsets(csv_path)
+            starts, ends = offsets[:-1], offsets[1:]
+
+            header = pd.read_csv(csv_path, nrows=0).columns
+            columns_upper = {str(col).upper(): col for col in header}
+            key_columns = [columns_upper[col] for col in INDEX_COLUMNS if col in columns_upper]
+            if not key_columns:
+                log_message("WARNING", f"Kolom index ({', '.join(INDEX_COLUMNS)}) tidak ditemukan, index tidak dibuat")
+                return None
+
+            # Key diparse dengan dtype seluruh file (seperti load penuh), lalu disimpan sebagai text nilainya
+            dtypes = infer_csv_dtypes(csv_path)
+            keys = pd.read_csv(csv_path, usecols=key_columns, dtype={col: dtypes[col] for col in key_columns},
+                               low_memory=False)
+            if len(keys) != len(starts) - 1:
+                log_message("WARNING", f"Jumlah baris index ({len(starts) - 1:,}) berbeda dengan CSV ({len(keys):,}), index tidak dibuat")
+                return None
+
+            columns = {}
+            numeric_columns = {}
+            for col in key_columns:
+                if dtypes[col] != 'object':
+                    numeric_columns[str(col).upper()] = dtypes[col]
+                # Nilai kosong (kode -1) tidak masuk index, sama seperti filter yang tidak pernah cocok dengan NaN
+                text = keys[col].map(str, na_action='ignore')
+                # Factorize (hash) lalu urutkan nilai unik saja, lookup memakai searchsorted
+                codes, uniques = pd.factorize(text)
+                sorter = np.argsort(np.asarray(uniques, dtype=object), kind='stable')
+                rank = np.empty(len(sorter), dtype=np.int64)
+                rank[sorter] = np.arange(len(sorter))
+                valid = np.flatnonzero(codes >= 0)
+                codes = rank[codes[valid]]
+                values = np.asarray(uniques, dtype=object)[sorter].astype(str)
+
+                order = valid[np.argsort(codes, kind='stable')].astype(np.int64) + 1
+                bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(values)))]).astype(np.int64)
+                columns[str(col).upper()] = (values, order, bounds)
+
+            index = cls(csv_path, fingerprint, starts, ends, columns, dtypes, numeric_columns)
+            index.save()
+
+            log_message("INDEX", f"Site index selesai dalam {time.time() - start_time:.2f} detik ({index.row_count:,} baris)")
+            return index
+
+        except Exception as e:
+            log_message("WARNING", f"Gagal membangun site index: {str(e)}")
+            return None
+
+    def save(self):
+        """Simpan index ke sidecar file (.npz tanpa pickle)"""
+        arrays = {
+            'fingerprint': np.array(json.dumps(self.fingerprint)),
+            'dtypes': np.array(json.dumps(self.dtypes)),
+            'numeric_columns': np.array(json.dumps(self.numeric_columns)),
+            'starts': self.starts,
+            'ends': self.ends,
+        }
+        for col, (values, order, bounds) in self.columns.items():
+            arrays[f"{col}__values"] = values
+            arrays[f"{col}__order"] = order
+            arrays[f"{col}__bounds"] = bounds
+
+        # Tulis ke file sementara dulu supaya index lama tidak rusak jika gagal
+        index_path = get_index_path(self.csv_path)
+        temp_path = index_path + '.tmp.npz'
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, index_path)
+
+    @classmethod
+    def load(cls, csv_path):
+        """Load index jika ada dan masih sesuai dengan CSV, selain itu return None"""
+        index_path = get_index_path(csv_path)
+        if not os.path.exists(index_path):
+            return None
+
+        try:
+            with np.load(index_path, allow_pickle=False) as data:
+                fingerprint = json.loads(str(data['fingerprint']))
+                if fingerprint != compute_fingerprint(csv_path):
+                    log_message("INDEX", "Input CSV berubah, site index akan dibuat ulang")
+                    return None
+
+                columns = {}
+                for name in data.files:
+                    if name.endswith('__values'):
+                        col = name[:-len('__values')]
+                        columns[col] = (data[name], data[f"{col}__order"], data[f"{col}__bounds"])
+
+                return cls(csv_path, fingerprint, data['starts'], data['ends'], columns,
+                           json.loads(str(data['dtypes'])), json.loads(str(data['numeric_columns'])))
+
+        except Exception as e:
+            log_message("WARNING", f"Site index tidak bisa dibaca ({str(e)}), index akan dibuat ulang")
+            return None
+
+    @classmethod
+    def get_or_build(cls, csv_path):
+        """Load index yang masih valid atau build ulang"""
+        return cls.load(csv_path) or cls.build(csv_path)
+
+    def lookup(self, column, values):
+        """
+        Row id (urut posisi di file) untuk nilai kolom yang diminta
+
+        Sama seperti isin pada load penuh: nilai text hanya cocok dengan kolom text,
+        nilai angka hanya cocok dengan kolom numerik.
+        """
+        if column.upper() not in self.columns:
+            raise ValueError(f"Kolom {column} tidak ada di site index")
+
+        uniques, order, bounds = self.columns[column.upper()]
+        dtype = self.numeric_columns.get(column.upper())
+        if dtype is None:
+            keys = [value for value in values if isinstance(value, str)]
+        else:
+            # Angka di-cast ke dtype kolom dulu (123 -> "123.0" untuk kolom float)
+            numbers = pd.to_numeric(pd.Series([value for value in values if not isinstance(value, str)], dtype=object),
+                                    errors='coerce').dropna()
+            cast = numbers.astype(dtype)
+            keys = [str(value) for value in cast[cast == numbers]]
+        keys = np.asarray(keys, dtype=str)
+        if len(uniques) == 0 or len(keys) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        positions = np.searchsorted(uniques, keys)
+        found = (positions < len(uniques)) & (uniques[np.minimum(positions, len(uniques) - 1)] == keys)
+        positions = positions[found]
+
+        rows = [order[bounds[p]:bounds[p + 1]] for p in np.unique(positions)]
+        return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+    def lookup_matching(self, column, site_filter):
+        """Row id untuk nilai kolom yang cocok dengan SiteIdFilter (exact + prefix/wildcard)"""
+        if column.upper() not in self.columns:
+            raise ValueError(f"Kolom {column} tidak ada di site index")
+
+        uniques, order, bounds = self.columns[column.upper()]
+        # Filter cukup dievaluasi pada nilai unik di index, bukan per baris
+        positions = np.flatnonzero(site_filter.mask(uniques))
+
+        rows = [order[bounds[p]:bounds[p + 1]] for p in positions]
+        return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+    def lookup_filters(self, regions=None, site_ids=None):
+        """Row id yang lolos filter region dan site ID (irisan jika keduanya diisi)"""
+        rows = None
+        if regions:
+            rows = self.lookup(REGION_COLUMN, regions)
+        if site_ids:
+            site_rows = self.lookup_matching(SITE_ID_COLUMN, SiteIdFilter.coerce(site_ids))
+            rows = site_rows if rows is None else np.intersect1d(rows, site_rows)
+        return rows if rows is not None else np.arange(1, self.row_count + 1, dtype=np.int64)
+
+    def read_rows(self, rows):
+        """Baca header + baris yang diminta langsung dari byte offset (range berurutan digabung)"""
+        chunks = []
+        with open(self.csv_path, 'rb') as f:
+            f.seek(self.starts[0])
+            chunks.append(f.read(self.ends[0] - self.starts[0]))
+
+            if len(rows):
+                # Gabungkan row id berurutan menjadi 1 range read
+                breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+                for run in np.split(rows, breaks):
+                    start, end = self.starts[run[0]], self.ends[run[-1]]
+                    f.seek(start)
+                    data = f.read(end - start)
+                    if not data.endswith(b'\n'):
+                        data += b'\n'
+                    chunks.append(data)
+
+        if not chunks[0].endswith(b'\n'):
+            chunks[0] += b'\n'
+        return b''.join(chunks)
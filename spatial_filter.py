@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spatial Filter
+Filter baris berdasarkan Longitude/Latitude: bounding box atau polygon (GeoJSON / WKT)
+
+- Point-in-polygon vectorized (ray casting, aturan even-odd) di atas array koordinat
+- Uniform grid pre-filter: cell yang seluruhnya di dalam / di luar polygon langsung
+  diputuskan, test per edge hanya untuk titik di cell yang dilewati edge polygon
+"""
+
+import os
+import re
+import json
+import hashlib
+
+import numpy as np
+
+# Kolom koordinat (case-insensitive), kandidat pertama yang ada dipakai
+LONGITUDE_COLUMNS = ['X_LONGITUDE', 'LONGITUDE', 'LONG', 'LON']
+LATITUDE_COLUMNS = ['Y_LATITUDE', 'LATITUDE', 'LAT']
+
+# Batas ukuran grid (cell per sisi) dan elemen matrix titik x edge per blok
+MIN_GRID_SIZE = 16
+MAX_GRID_SIZE = 512
+CROSSING_BLOCK_SIZE = 4000000
+
+# Status cell grid
+CELL_OUTSIDE = 0
+CELL_INSIDE = 1
+CELL_BOUNDARY = 2
+
+def find_coordinate_columns(columns):
+    """Get (kolom longitude, kolom latitude) dari list kolom, None jika tidak ada"""
+    columns_upper = {str(col).upper(): col for col in columns}
+    lon_col = next((columns_upper[col] for col in LONGITUDE_COLUMNS if col in columns_upper), None)
+    lat_col = next((columns_upper[col] for col in LATITUDE_COLUMNS if col in columns_upper), None)
+    return lon_col, lat_col
+
+def _parse_numbers(text):
+    return [float(value) for value in re.split(r'[,;\s]+', text.strip()) if value]
+
+def _geojson_rings(geometry):
+    """Kumpulkan semua ring dari object GeoJSON (Feature, FeatureCollection, Polygon, MultiPolygon)"""
+    geo_type = geometry.get('type')
+    if geo_type == 'FeatureCollection':
+        return [ring for feature in geometry.get('features', []) for ring in _geojson_rings(feature)]
+    if geo_type == 'Feature':
+        return _geojson_rings(geometry.get('geometry') or {})
+    if geo_type == 'GeometryCollection':
+        return [ring for item in geometry.get('geometries', []) for ring in _geojson_rings(item)]
+    if geo_type == 'Polygon':
+        return list(geometry['coordinates'])
+    if geo_type == 'MultiPolygon':
+        return [ring for polygon in geometry['coordinates'] for ring in polygon]
+    raise ValueError(f"Geometry GeoJSON tidak didukung: {geo_type}")
+
+class SpatialFilter:
+    """
+    Compiled spatial filter: bounding box atau polygon dengan uniform grid index
+
+    Semua ring (outer, hole, multipolygon) dievaluasi dengan aturan even-odd,
+    sehingga hole otomatis dikecualikan.
+    """
+
+    def __init__(self, rings=None, bbox=None, description=None):
+        self.rings = []
+        for ring in rings or []:
+            ring = np.asarray(ring, dtype=np.float64)[:, :2]
+            if len(ring) >= 3:
+                self.rings.append(ring)
+
+        if rings is not None and not self.rings:
+            raise ValueError("Polygon tidak memiliki ring yang valid (minimal 3 titik)")
+
+        if self.rings:
+            points = np.concatenate(self.rings)
+            self.bbox = (points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max())
+            self._build_grid()
+        elif bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox)
+            if min_lon > max_lon or min_lat > max_lat:
+                raise ValueError("Bounding box harus berurutan min_lon, min_lat, max_lon, max_lat")
+            self.bbox = (min_lon, min_lat, max_lon, max_lat)
+        else:
+            raise ValueError("Spatial filter membutuhkan bounding box atau polygon")
+
+        self.description = description or self._default_description()
+
+    def _default_description(self):
+        if not self.rings:
+            return "bbox " + ", ".join(f"{value:g}" for value in self.bbox)
+        return f"polygon {len(self.rings)} ring, {self.edge_count:,} edge"
+
+    def describe(self):
+        """Ringkasan filter untuk log"""
+        return self.description
+
+    def cache_key(self):
+        """Representasi stabil filter (untuk key result cache)"""
+        if not self.rings:
+            return {'bbox': list(self.bbox)}
+        digest = hashlib.sha256()
+        for ring in self.rings:
+            digest.update(np.ascontiguousarray(ring).tobytes())
+            digest.update(b'|')
+        return {'polygon': digest.hexdigest()}
+
+    @classmethod
+    def from_bbox(cls, min_lon, min_lat, max_lon, max_lat):
+        return cls(bbox=(min_lon, min_lat, max_lon, max_lat))
+
+    @classmethod
+    def from_geojson(cls, geojson):
+        """Polygon dari GeoJSON (dict atau text)"""
+        if isinstance(geojson, str):
+            geojson = json.loads(geojson)
+        return cls(rings=_geojson_rings(geojson))
+
+    @classmethod
+    def from_wkt(cls, wkt):
+        """Polygon dari WKT POLYGON / MULTIPOLYGON"""
+        text = wkt.strip()
+        if not re.match(r'^(MULTI)?POLYGON\b', text, re.IGNORECASE):
+            raise ValueError("WKT harus berupa POLYGON atau MULTIPOLYGON")
+
+        # Setiap grup kurung paling dalam = 1 ring "x y, x y, ..."
+        rings = []
+        for ring_text in re.findall(r'\(([^()]+)\)', text):
+            ring = [_parse_numbers(point)[:2] for point in ring_text.split(',') if point.strip()]
+            rings.append(ring)
+        return cls(rings=rings)
+
+    @classmethod
+    def from_text(cls, text):
+        """Auto-detect bbox (min_lon,min_lat,max_lon,max_lat), GeoJSON atau WKT"""
+        text = (text or '').strip()
+        if not text:
+            raise ValueError("Spatial filter kosong")
+        if text.startswith('{'):
+            return cls.from_geojson(text)
+        if re.match(r'^(MULTI)?POLYGON\b', text, re.IGNORECASE):
+            return cls.from_wkt(text)
+
+        numbers = _parse_numbers(text)
+        if len(numbers) != 4:
+            raise ValueError("Bounding box harus 4 angka: min_lon,min_lat,max_lon,max_lat")
+        return cls.from_bbox(*numbers)
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load spatial filter dari file .geojson/.json, .wkt atau .txt (bbox / WKT)"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File spatial filter tidak ditemukan: {file_path}")
+
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            spatial = cls.from_text(f.read())
+        spatial.description = f"{os.path.basename(file_path)} ({spatial.description})"
+        return spatial
+
+    @classmethod
+    def coerce(cls, spatial):
+        """SpatialFilter dari SpatialFilter, text/path, dict GeoJSON atau tuple bbox (None = tanpa filter)"""
+        if spatial is None or isinstance(spatial, cls):
+            return spatial
+        if isinstance(spatial, dict):
+            return cls.from_geojson(spatial)
+        if isinstance(spatial, str):
+            return cls.from_file(spatial) if os.path.isfile(spatial) else cls.from_text(spatial)
+        return cls(bbox=spatial)
+
+    def _build_grid(self):
+        """Build uniform grid: edge per baris grid dan status setiap cell"""
+        starts = np.concatenate([ring for ring in self.rings])
+        ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in self.rings])
+        # Ring yang sudah tertutup (titik awal = akhir) menghasilkan edge nol, dibuang
+        keep = np.any(starts != ends, axis=1)
+        self.x1, self.y1 = starts[keep, 0], starts[keep, 1]
+        self.x2, self.y2 = ends[keep, 0], ends[keep, 1]
+        self.edge_count = len(self.x1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (self.x2 - self.x1) / (self.y2 - self.y1)
+        self.inverse_slope = np.where(np.isfinite(slope), slope, 0.0)
+
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        self.grid_size = int(np.clip(np.sqrt(self.edge_count) * 2, MIN_GRID_SIZE, MAX_GRID_SIZE))
+        self.cell_width = (max_lon - min_lon) / self.grid_size or 1.0
+        self.cell_height = (max_lat - min_lat) / self.grid_size or 1.0
+        size = self.grid_size
+
+        # Pasangan (edge, baris grid) yang dilewati edge, +-1 baris sebagai margin pembulatan
+        y_low = np.minimum(self.y1, self.y2)
+        y_high = np.maximum(self.y1, self.y2)
+        row_start = np.maximum(self._rows(y_low) - 1, 0)
+        row_end = np.minimum(self._rows(y_high) + 1, size - 1)
+        counts = row_end - row_start + 1
+        edge_ids = np.repeat(np.arange(self.edge_count), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = np.repeat(row_start, counts) + offsets
+
+        order = np.argsort(rows, kind='stable')
+        self.row_edge_ids = edge_ids[order]
+        self.row_bounds = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=size))])
+
+        # Rentang kolom yang dilewati edge di setiap baris -> cell boundary
+        band_low = np.clip(min_lat + rows * self.cell_height, y_low[edge_ids], y_high[edge_ids])
+        band_high = np.clip(min_lat + (rows + 1) * self.cell_height, y_low[edge_ids], y_high[edge_ids])
+        x_a = self.x1[edge_ids] + (band_low - self.y1[edge_ids]) * self.inverse_slope[edge_ids]
+        x_b = self.x1[edge_ids] + (band_high - self.y1[edge_ids]) * self.inverse_slope[edge_ids]
+        horizontal = self.y1[edge_ids] == self.y2[edge_ids]
+        x_low = np.where(horizontal, np.minimum(self.x1, self.x2)[edge_ids], np.minimum(x_a, x_b))
+        x_high = np.where(horizontal, np.maximum(self.x1, self.x2)[edge_ids], np.maximum(x_a, x_b))
+        col_start = np.maximum(self._cols(x_low) - 1, 0)
+        col_end = np.minimum(self._cols(x_high) + 1, size - 1)
+
+        diff = np.zeros((size, size + 1), dtype=np.int32)
+        np.add.at(diff, (rows, col_start), 1)
+        np.add.at(diff, (rows, col_end + 1), -1)
+        boundary = np.cumsum(diff[:, :size], axis=1) > 0
+
+        # Cell tanpa edge seluruhnya di dalam atau di luar: cukup test titik tengahnya
+        cell_rows, cell_cols = np.nonzero(~boundary)
+        centers_x = min_lon + (cell_cols + 0.5) * self.cell_width
+        centers_y = min_lat + (cell_rows + 0.5) * self.cell_height
+        inside = self._crossing_parity(centers_x, centers_y, cell_rows)
+
+        self.cell_state = np.full((size, size), CELL_OUTSIDE, dtype=np.uint8)
+        self.cell_state[boundary] = CELL_BOUNDARY
+        self.cell_state[cell_rows[inside], cell_cols[inside]] = CELL_INSIDE
+
+    def _rows(self, lat):
+        rows = np.floor((lat - self.bbox[1]) / self.cell_height)
+        return np.clip(rows, 0, self.grid_size - 1).astype(np.int64)
+
+    def _cols(self, lon):
+        cols = np.floor((lon - self.bbox[0]) / self.cell_width)
+        return np.clip(cols, 0, self.grid_size - 1).astype(np.int64)
+
+    def _crossing_parity(self, px, py, rows):
+        """Ray casting ke arah +longitude, hanya edge di baris grid yang sama dengan titik"""
+        result = np.zeros(len(px), dtype=bool)
+        order = np.argsort(rows, kind='stable')
+        point_bounds = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=self.grid_size))])
+
+        for row in np.flatnonzero(np.diff(point_bounds)):
+            edges = self.row_edge_ids[self.row_bounds[row]:self.row_bounds[row + 1]]
+            if len(edges) == 0:
+                continue
+            x1, y1, y2 = self.x1[edges], self.y1[edges], self.y2[edges]
+            inverse_slope = self.inverse_slope[edges]
+
+            point_ids = order[point_bounds[row]:point_bounds[row + 1]]
+            block = max(CROSSING_BLOCK_SIZE // len(edges), 1)
+            for start in range(0, len(point_ids), block):
+                ids = point_ids[start:start + block]
+                x = px[ids][:, None]
+                y = py[ids][:, None]
+                crosses = ((y1 > y) != (y2 > y)) & (x < x1 + (y - y1) * inverse_slope)
+                result[ids] = np.count_nonzero(crosses, axis=1) % 2 == 1
+
+        return result
+
+    def mask(self, lon, lat):
+        """Boolean mask (numpy) titik yang ada di dalam bbox / polygon, koordinat kosong = False"""
+        x = np.asarray(lon, dtype=np.float64)
+        y = np.asarray(lat, dtype=np.float64)
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+
+        with np.errstate(invalid='ignore'):
+            in_bbox = (x >= min_lon) & (x <= max_lon) & (y >= min_lat) & (y <= max_lat)
+        if not self.rings:
+            return in_bbox
+
+        result = np.zeros(len(x), dtype=bool)
+        candidates = np.flatnonzero(in_bbox)
+        px, py = x[candidates], y[candidates]
+        rows, cols = self._rows(py), self._cols(px)
+        state = self.cell_state[rows, cols]
+
+        result[candidates[state == CELL_INSIDE]] = True
+        boundary = np.flatnonzero(state == CELL_BOUNDARY)
+        if len(boundary):
+            result[candidates[boundary]] = self._crossing_parity(px[boundary], py[boundary], rows[boundary])
+
+        return result
+
+    def polars_expr(self, lon_col, lat_col):
+        """Expression polars yang sama dengan mask() untuk engine polars"""
+        import polars as pl
+
+        if not self.rings:
+            min_lon, min_lat, max_lon, max_lat = self.bbox
+            # Bandingkan sebagai Float64 seperti mask(), bukan di presisi kolom (Float32)
+            return (pl.col(lon_col).cast(pl.Float64, strict=False).is_between(min_lon, max_lon)
+                    & pl.col(lat_col).cast(pl.Float64, strict=False).is_between(min_lat, max_lat)).fill_null(False)
+
+        def evaluate(coordinates):
+            lon = coordinates.struct.field(lon_col).cast(pl.Float64, strict=False).fill_null(np.nan).to_numpy()
+            lat = coordinates.struct.field(lat_col).cast(pl.Float64, strict=False).fill_null(np.nan).to_numpy()
+            return pl.Series(self.mask(lon, lat), dtype=pl.Boolean)
+
+        return pl.struct([lon_col, lat_col]).map_batches(evaluate, return_dtype=pl.Boolean)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Fixture bersama untuk test pipeline NDB"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+@pytest.fixture(autouse=True)
+def isolated_settings(tmp_path_factory, monkeypatch):
+    """Settings (column_settings.json, transform_rules.json) di home sementara, bukan milik user"""
+    home = str(tmp_path_factory.mktemp('home'))
+    monkeypatch.setenv('HOME', home)
+    monkeypatch.setenv('USERPROFILE', home)
+    return home
+
+@pytest.fixture
+def sample_csv():
+    """CSV NDB kecil (termasuk koordinat rusak, koordinat dekat nol, nilai kosong dan baris duplikat)"""
+    return os.path.join(DATA_DIR, 'ndb_sample.csv')
+
+@pytest.fixture
+def expected_dir():
+    """Output baseline untuk ndb_sample.csv (hasil versi sebelum optimasi)"""
+    return os.path.join(DATA_DIR, 'expected')
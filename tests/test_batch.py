@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Batch: input dengan nama output sama ditolak sebelum diproses"""
+
+import os
+import shutil
+
+import main_processor
+
+def test_batch_rejects_output_name_collisions(sample_csv, tmp_path):
+    inputs = []
+    for folder, name in [('day1', 'dump.csv'), ('day2', 'DUMP.csv')]:
+        (tmp_path / folder).mkdir()
+        shutil.copy(sample_csv, tmp_path / folder / name)
+        inputs.append(str(tmp_path / folder / name))
+    output_dir = tmp_path / 'out'
+
+    assert main_processor.find_output_collisions(inputs) == {'dump': [os.path.abspath(path) for path in inputs]}
+    assert not main_processor.process_batch(inputs, str(output_dir))
+    assert not output_dir.exists() or not os.listdir(output_dir)
+
+def test_same_file_twice_is_not_a_collision(sample_csv):
+    assert main_processor.find_output_collisions([sample_csv, os.path.join(os.path.dirname(sample_csv), '.', 'ndb_sample.csv')]) == {}
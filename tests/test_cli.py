@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""CLI non-interaktif: validasi argumen dan laporan JSON"""
+
+import os
+import json
+
+import pytest
+
+import main_processor
+
+@pytest.mark.parametrize('argv', [
+    ['--chunk-size', '0'],
+    ['--chunk-size', 'abc'],
+    ['--workers', '-1'],
+    ['--step', '4', '--region', 'EAST JAVA'],
+    ['--step', '4', '--use-site-index'],
+    ['--step', 'incremental', '--chunk-size', '1000'],
+    ['--step', '2', '--workers', '4'],
+])
+def test_cli_rejects_unused_or_invalid_options(argv, sample_csv, tmp_path):
+    with pytest.raises(SystemExit) as exc:
+        main_processor.cli_main([sample_csv, '-o', str(tmp_path)] + argv)
+    assert exc.value.code == main_processor.EXIT_USAGE
+    assert not os.listdir(tmp_path)
+
+def test_cli_partition_report_lists_region_outputs(sample_csv, tmp_path, capsys):
+    exit_code = main_processor.cli_main([sample_csv, '-o', str(tmp_path), '--step', 'partition', '--json'])
+    assert exit_code == main_processor.EXIT_OK
+
+    report = json.loads(capsys.readouterr().out)
+    outputs = report['files'][0]['outputs']
+    region_dirs = {os.path.dirname(path) for path in outputs}
+    assert len(region_dirs) > 1
+    assert all(os.path.dirname(region_dir) == str(tmp_path) for region_dir in region_dirs)
+    assert len(outputs) == 3 * len(region_dirs)
+    assert all(os.path.exists(path) for path in outputs)
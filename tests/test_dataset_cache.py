@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Dataset cache: frame transform dipakai ulang selama file dan setting sama"""
+
+import os
+import shutil
+
+import main_processor
+from dataset_cache import DatasetCache, build_dataset_key
+from transform_rules import compile_transform_rules, get_default_rules
+
+def load_dataset(cache, csv_path, allowed_columns=None, rules=None):
+    """Alur GUI get_cached_dataset: cache hit atau load + transform lalu disimpan, return (frame, hit)"""
+    processor = main_processor.NDBDataProcessor(csv_path)
+    if allowed_columns is not None:
+        processor.allowed_columns_raw = allowed_columns
+    if rules is not None:
+        processor.transform_rules = rules
+
+    key = build_dataset_key(csv_path, processor.transform_rules, processor.use_schema)
+    header = main_processor.read_csv_header(csv_path)
+    required = [header[i] for i in processor.get_required_columns(header)]
+    cached = cache.get(key, required)
+    if cached is not None:
+        return cached, True
+
+    assert processor.load_data()
+    transformed_df = processor.transform_data(processor.df)
+    assert cache.put(key, processor.df.columns, transformed_df)
+    return transformed_df, False
+
+def test_same_file_and_settings_reuse_cached_frame(sample_csv, tmp_path):
+    csv_path = str(tmp_path / 'dump.csv')
+    shutil.copy(sample_csv, csv_path)
+    cache = DatasetCache(max_size_mb=64)
+
+    first, hit = load_dataset(cache, csv_path)
+    assert not hit
+    second, hit = load_dataset(cache, csv_path)
+    assert hit and second is first
+
+    # Subset allowed columns dari frame yang sama juga hit
+    subset, hit = load_dataset(cache, csv_path, allowed_columns=['SITE_ID', 'CELL_NAME', 'REGION'])
+    assert hit and subset is first
+
+def test_changed_file_columns_or_rules_miss(sample_csv, tmp_path):
+    csv_path = str(tmp_path / 'dump.csv')
+    shutil.copy(sample_csv, csv_path)
+    cache = DatasetCache(max_size_mb=64)
+    first, _ = load_dataset(cache, csv_path)
+
+    # Kolom yang tidak ada di frame cache -> parse ulang
+    allowed_columns = main_processor.NDBDataProcessor(csv_path).allowed_columns_raw + ['REMARK']
+    _, hit = load_dataset(cache, csv_path, allowed_columns=allowed_columns)
+    assert not hit
+
+    # Rules lain -> key lain
+    rules = get_default_rules()
+    rules['fixed_ant_size']['default'] = 0.07
+    _, hit = load_dataset(cache, csv_path, rules=compile_transform_rules(rules))
+    assert not hit
+
+    # mtime berubah -> key lain, entry lama file yang sama dibuang
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    reloaded, hit = load_dataset(cache, csv_path)
+    assert not hit and reloaded is not first
+    assert len(cache.entries) == 1
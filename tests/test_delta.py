@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""State delta per input di folder output"""
+
+import shutil
+
+import pandas as pd
+
+from delta_processor import process_incremental, get_delta_filename, get_state_filename
+
+def test_state_file_keyed_by_input_name(sample_csv, tmp_path):
+    other_csv = tmp_path / 'other_dump.csv'
+    shutil.copy(sample_csv, other_csv)
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+
+    assert process_incremental(sample_csv, output_dir=str(output_dir))
+    assert process_incremental(str(other_csv), output_dir=str(output_dir))
+    assert (output_dir / get_state_filename(sample_csv)).exists()
+    assert (output_dir / get_state_filename(str(other_csv))).exists()
+
+    # Run ulang input yang sama dibandingkan dengan state-nya sendiri: tidak ada perubahan
+    assert process_incremental(sample_csv, output_dir=str(output_dir))
+    delta = pd.read_csv(output_dir / get_delta_filename(sample_csv))
+    assert delta.empty
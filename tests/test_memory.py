@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Memory regression: peak RSS Step 2 (transform, filter, tulis TXT) terhadap ukuran frame hasil load
+
+Peak dihitung dari RSS sebelum load, jadi frame yang sudah di-load ikut terhitung; buffer sementara
+parser CSV tidak diukur (sudah dilepas sebelum transform dimulai).
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from conftest import ROOT_DIR
+from benchmarks.bench_stages import get_process_rss
+
+# Peak RSS (di atas RSS sebelum load) selama Step 2 maksimal 1.3x ukuran frame hasil load
+MAX_PEAK_RATIO = 1.3
+MEMORY_TEST_ROWS = 200000
+
+# Diukur di interpreter baru supaya RSS tidak dipengaruhi test lain
+STEP2_SNIPPET = """
+import os, sys, json, contextlib
+sys.path.insert(0, {root!r})
+from benchmarks.bench_stages import StageTimer, get_process_rss
+import main_processor
+
+csv_path, output_file = sys.argv[1], sys.argv[2]
+timer = StageTimer()
+with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    processor = main_processor.NDBDataProcessor(csv_path)
+    start_rss = get_process_rss()
+    assert processor.load_data()
+    frame_bytes = int(processor.df.memory_usage(index=True, deep=True).sum())
+    loaded_rss = get_process_rss() - start_rss
+    with timer.measure('step2'):
+        transformed_df = processor.transform_data(processor.df, verbose=False)
+        final_df = processor.filter_allowed_columns(transformed_df, verbose=False)
+        final_df.to_csv(output_file, sep='\\t', index=False)
+peak_mb = loaded_rss / (1024 * 1024) + timer.peak_mb['step2']
+print(json.dumps({{'frame_mb': frame_bytes / (1024 * 1024), 'peak_mb': peak_mb}}))
+"""
+
+@pytest.mark.skipif(get_process_rss() is None, reason="RSS process tidak bisa dibaca di platform ini")
+def test_step2_peak_rss_within_frame_ratio(tmp_path, isolated_settings):
+    from benchmarks.generate_ndb import generate_ndb_csv
+
+    csv_path = str(tmp_path / 'ndb_memory.csv')
+    generate_ndb_csv(csv_path, MEMORY_TEST_ROWS, seed=11)
+
+    env = dict(os.environ, HOME=isolated_settings, USERPROFILE=isolated_settings)
+    result = subprocess.run([sys.executable, '-c', STEP2_SNIPPET.format(root=ROOT_DIR), csv_path,
+                             str(tmp_path / 'ndb_memory.txt')],
+                            cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=600)
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report['peak_mb'] <= MAX_PEAK_RATIO * report['frame_mb'], report
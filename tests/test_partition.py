@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Partition by REGION: output per region sama dengan run biasa yang difilter region tersebut"""
+
+import pytest
+
+import main_processor
+
+OUTPUT_KEYS = ['processed_txt', 'rawndb_csv', 'rawndb_simple_csv']
+
+def read_outputs(output_names):
+    outputs = {}
+    for key in OUTPUT_KEYS:
+        with open(output_names[key], 'rb') as f:
+            outputs[key] = f.read()
+    return outputs
+
+@pytest.mark.parametrize('chunk_size', [None, 50])
+def test_partition_outputs_match_region_filtered_runs(chunk_size, sample_csv, tmp_path):
+    partitions = {}
+    assert main_processor.process_partitioned(sample_csv, str(tmp_path / 'partition'), chunk_size=chunk_size,
+                                              partitions=partitions)
+    assert len(partitions) > 1
+
+    full_dir = tmp_path / 'full'
+    full_dir.mkdir()
+    assert main_processor.process_all_steps(sample_csv, output_dir=str(full_dir))
+    full_txt = read_outputs(main_processor.generate_output_names(sample_csv, str(full_dir)))['processed_txt']
+
+    partition_rows = []
+    for index, (region, region_names) in enumerate(sorted(partitions.items())):
+        partition = read_outputs(region_names)
+        header, *rows = partition['processed_txt'].splitlines()
+        partition_rows.extend(rows)
+
+        # Baris REGION kosong tidak bisa dipilih dengan filter region
+        if not region:
+            continue
+        region_dir = tmp_path / f"region_{index}"
+        region_dir.mkdir()
+        assert main_processor.process_all_steps(sample_csv, chunk_size, output_dir=str(region_dir), regions=[region])
+        assert partition == read_outputs(main_processor.generate_output_names(sample_csv, str(region_dir))), region
+
+    # Gabungan TXT semua region = TXT run biasa (urutan baris per region)
+    full_header, *full_rows = full_txt.splitlines()
+    assert header == full_header
+    assert sorted(partition_rows) == sorted(full_rows)
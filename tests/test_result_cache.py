@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Result cache: hit / miss per key, entry rusak dan LRU eviction"""
+
+import os
+import shutil
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache, build_cache_key
+from site_filter import SiteIdFilter
+from spatial_filter import SpatialFilter
+from transform_rules import compile_transform_rules, get_default_rules
+
+OUTPUT_FILES = ['dump_for_raw_TA_and_audit.csv', os.path.join('EAST JAVA', 'dump_for_raw_1st_tier.csv')]
+
+class FakeClock:
+    """time.time() yang naik 1 detik per panggilan (urutan last_used pasti berbeda)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(result_cache, 'time', fake)
+    return fake
+
+def write_outputs(output_dir, size=10, fill=b'x'):
+    for path in OUTPUT_FILES:
+        target = os.path.join(output_dir, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(fill * size)
+
+def test_restore_after_store(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / 'cache'), max_size_mb=10)
+    write_outputs(tmp_path / 'run1', fill=b'a')
+
+    assert cache.restore('key', str(tmp_path / 'run2')) is None
+    assert cache.store('key', str(tmp_path / 'run1'), OUTPUT_FILES)
+
+    restored = cache.restore('key', str(tmp_path / 'run2'))
+    assert [path for path, _ in restored] == OUTPUT_FILES
+    for path, target in restored:
+        assert target == os.path.join(str(tmp_path / 'run2'), path)
+        with open(target, 'rb') as f:
+            assert f.read() == b'a' * 10
+
+def test_key_changes_with_every_input(sample_csv, tmp_path):
+    rules = compile_transform_rules(get_default_rules())
+    base = dict(allowed_columns=['SITE_ID', 'CELL_NAME'], regions=['EAST JAVA'],
+                site_filter=SiteIdFilter.coerce(['SBY*']), spatial_filter=SpatialFilter.from_text("100, -8, 115, 0"),
+                rules=rules, mode={'chunk_size': None})
+    key = build_cache_key(sample_csv, **base)
+    assert build_cache_key(sample_csv, **base) == key
+
+    changed_rules = get_default_rules()
+    changed_rules['fixed_ant_size']['default'] = 0.07
+    variants = [
+        dict(allowed_columns=['SITE_ID']),
+        dict(regions=['WEST JAVA']),
+        dict(site_filter=SiteIdFilter.coerce(['JKT*'])),
+        dict(spatial_filter=SpatialFilter.from_text("100, -8, 116, 0")),
+        dict(rules=compile_transform_rules(changed_rules)),
+        dict(mode={'chunk_size': 50000}),
+    ]
+    keys = {build_cache_key(sample_csv, **dict(base, **variant)) for variant in variants}
+    assert key not in keys and len(keys) == len(variants)
+
+    # Isi file berubah -> fingerprint input berubah
+    copy_path = tmp_path / 'copy.csv'
+    shutil.copy(sample_csv, copy_path)
+    copy_key = build_cache_key(str(copy_path), **base)
+    with open(copy_path, 'a', encoding='utf-8') as f:
+        f.write("NEW001,NEW001,NEW001L18_A11,1,106.8,-6.2,0,65,L18,EAST JAVA,PROV,01,URBAN,HUAWEI,1,1,1,RT,30,\n")
+    assert build_cache_key(str(copy_path), **base) != copy_key
+
+def test_entry_with_missing_file_is_dropped(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / 'cache'), max_size_mb=10)
+    write_outputs(tmp_path / 'run1')
+    assert cache.store('key', str(tmp_path / 'run1'), OUTPUT_FILES)
+
+    os.remove(os.path.join(str(tmp_path / 'cache'), 'key', 'files', OUTPUT_FILES[1]))
+    assert cache.restore('key', str(tmp_path / 'run2')) is None
+    assert not os.path.exists(os.path.join(str(tmp_path / 'cache'), 'key'))
+
+def test_lru_eviction_drops_least_recently_used(tmp_path, clock):
+    # 2 file x 200 KB = 400 KB per entry, batas 1 MB -> maksimal 2 entry
+    cache = ResultCache(str(tmp_path / 'cache'), max_size_mb=1)
+    write_outputs(tmp_path / 'run', size=200 * 1024)
+
+    assert cache.store('first', str(tmp_path / 'run'), OUTPUT_FILES)
+    assert cache.store('second', str(tmp_path / 'run'), OUTPUT_FILES)
+    # first dipakai lagi -> second yang paling lama tidak dipakai
+    assert cache.restore('first', str(tmp_path / 'restored')) is not None
+    assert cache.store('third', str(tmp_path / 'run'), OUTPUT_FILES)
+
+    assert sorted(os.path.basename(entry_dir) for _, _, entry_dir in cache.entries()) == ['first', 'third']
+    assert cache.restore('second', str(tmp_path / 'restored')) is None
+
+    # Batas dikecilkan: sisa entry paling baru dipakai saja
+    cache.max_size_mb = 0.5
+    cache.evict()
+    assert [os.path.basename(entry_dir) for _, _, entry_dir in cache.entries()] == ['third']
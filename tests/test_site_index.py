@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Baca lewat site index harus sama dengan filter setelah load penuh"""
+
+import shutil
+
+import pytest
+
+import main_processor
+from site_index import SiteIndex
+
+NUMERIC_SITE_CSV = """SITE_ID,CELL_NAME,CELL_ID,X_LONGITUDE,Y_LATITUDE,ANTENNA_AZIMUTH_DEG,CELL_SYSTEM_INFO,REGION,HEIGHT_ANTENNA_M
+00123,A_L18_A01,1,106.1,-6.1,0,LTE1800,WEST,30
+00123,A_L18_B02,2,106.1,-6.1,120,LTE1800,WEST,30
+123,B_L21_A01,3,106.2,-6.2,0,LTE2100,EAST,30.5
+0456,C_L18_C03,,106.3,-6.3,240,LTE1800,NA,
+NA,D_5G18_A01,5,106.4,-6.4,0,5G18,WEST,42
+,E_L18_A01,6,106.5,-6.5,0,LTE1800,,42
+789,F_L18_A01,7,106.6,-6.6,0,LTE1800,EAST,30
+"""
+
+TEXT_SITE_CSV = NUMERIC_SITE_CSV.replace('789,F_', 'JKT789,F_')
+
+FILTERS = [
+    {'site_ids': ['123']},
+    {'site_ids': ['00123']},
+    {'site_ids': ['NA']},
+    {'site_ids': ['12*', '4?6']},
+    {'regions': ['NA']},
+    {'regions': ['WEST']},
+    {'regions': ['EAST'], 'site_ids': ['789', 'JKT789']},
+]
+
+@pytest.mark.parametrize('content', [NUMERIC_SITE_CSV, TEXT_SITE_CSV], ids=['numeric', 'text'])
+@pytest.mark.parametrize('filters', FILTERS)
+def test_index_path_matches_full_scan(content, filters, tmp_path):
+    csv_path = tmp_path / 'ndb_index.csv'
+    csv_path.write_text(content)
+
+    outputs = {}
+    for use_site_index in (False, True):
+        output_dir = tmp_path / f"index_{use_site_index}"
+        output_dir.mkdir()
+        output_names = main_processor.generate_output_names(str(csv_path), str(output_dir))
+        assert main_processor.process_step2(str(csv_path), output_names, use_site_index=use_site_index,
+                                            **filters)
+        with open(output_names['processed_txt'], 'rb') as f:
+            outputs[use_site_index] = f.read()
+    assert outputs[True] == outputs[False]
+
+def test_index_keys_follow_parsed_values(tmp_path):
+    csv_path = tmp_path / 'ndb_index.csv'
+    csv_path.write_text(NUMERIC_SITE_CSV)
+    index = SiteIndex.build(str(csv_path))
+
+    # "00123" diparse menjadi 123, "NA" dan kosong tidak masuk index
+    assert index.lookup('SITE_ID', ['00123']).size == 0
+    assert index.lookup('SITE_ID', [123]).tolist() == [1, 2, 3]
+    assert index.lookup('REGION', ['NA']).size == 0
+    assert index.dtypes['HEIGHT_ANTENNA_M'] == 'float64'
+
+def test_index_reads_rows_with_file_dtypes(sample_csv, tmp_path):
+    csv_path = tmp_path / 'ndb_sample.csv'
+    shutil.copy(sample_csv, csv_path)
+
+    full = main_processor.NDBDataProcessor(str(csv_path))
+    full.site_id_filter = main_processor.SiteIdFilter(['SBY000'])
+    assert full.load_data()
+
+    indexed = main_processor.NDBDataProcessor(str(csv_path))
+    indexed.site_id_filter = main_processor.SiteIdFilter(['SBY000'])
+    indexed.use_site_index = True
+    assert indexed.load_data()
+
+    assert indexed.df.dtypes.astype(str).to_dict() == full.df.dtypes.astype(str).to_dict()
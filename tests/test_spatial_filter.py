@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Spatial filter: grid index sama dengan ray casting brute-force, parsing bbox / WKT / GeoJSON"""
+
+import json
+
+import numpy as np
+import pytest
+
+from spatial_filter import SpatialFilter
+
+SQUARE_WITH_HOLE_WKT = "POLYGON ((0 0, 10 0, 10 10, 0 10, 0 0), (4 4, 6 4, 6 6, 4 6, 4 4))"
+# (lon, lat, di dalam polygon): dalam ring luar, di dalam hole, di luar bbox, koordinat kosong
+SQUARE_WITH_HOLE_POINTS = [(1, 1, True), (5, 5, False), (8, 3, True), (11, 5, False), (-1, 5, False),
+                           (np.nan, 5, False)]
+
+def brute_force_mask(rings, lon, lat):
+    """Ray casting even-odd ke arah +longitude terhadap semua edge, tanpa grid"""
+    inside = np.zeros(len(lon), dtype=bool)
+    x, y = lon[:, None], lat[:, None]
+    for ring in rings:
+        ring = np.asarray(ring, dtype=np.float64)
+        x1, y1 = ring[:, 0], ring[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crosses = ((y1 > y) != (y2 > y)) & (x < x1 + (y - y1) * ((x2 - x1) / (y2 - y1)))
+        inside ^= np.count_nonzero(crosses, axis=1) % 2 == 1
+    return inside
+
+def random_star(rng, center, radius, vertices):
+    """Polygon bintang (tidak self-intersect) dengan radius acak per sudut"""
+    angles = np.sort(rng.uniform(0, 2 * np.pi, vertices))
+    radii = rng.uniform(0.5, 1.0, vertices) * radius
+    return np.column_stack([center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)])
+
+@pytest.mark.parametrize('seed', range(40))
+def test_grid_mask_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    rings = []
+    for _ in range(rng.integers(1, 4)):
+        center = rng.uniform([95, -11], [141, 6])
+        radius = rng.uniform(0.1, 5)
+        rings.append(random_star(rng, center, radius, rng.integers(3, 400)))
+        # Hole di dalam radius minimum ring luar
+        if rng.random() < 0.7:
+            rings.append(random_star(rng, center, radius * 0.4, rng.integers(3, 100)))
+    spatial = SpatialFilter(rings=rings)
+
+    points = np.concatenate(rings)
+    lon = np.concatenate([rng.uniform(points[:, 0].min() - 1, points[:, 0].max() + 1, 20000), points[:, 0]])
+    lat = np.concatenate([rng.uniform(points[:, 1].min() - 1, points[:, 1].max() + 1, 20000), points[:, 1]])
+
+    assert np.array_equal(spatial.mask(lon, lat), brute_force_mask(rings, lon, lat))
+
+def test_bbox_mask_includes_edges():
+    spatial = SpatialFilter.from_text("106.5, -6.5, 107, -6")
+    lon = np.array([106.5, 107.0, 106.7, 107.01, 106.7, np.nan])
+    lat = np.array([-6.5, -6.0, -6.2, -6.2, -5.9, -6.2])
+    assert spatial.mask(lon, lat).tolist() == [True, True, True, False, False, False]
+    with pytest.raises(ValueError):
+        SpatialFilter.from_text("107, -6.5, 106.5, -6")
+
+def test_wkt_polygon_excludes_hole():
+    spatial = SpatialFilter.from_text(SQUARE_WITH_HOLE_WKT)
+    lon, lat, expected = (np.array(values, dtype=np.float64) for values in zip(*SQUARE_WITH_HOLE_POINTS))
+    assert len(spatial.rings) == 2
+    assert spatial.mask(lon, lat).tolist() == expected.astype(bool).tolist()
+
+    multi = SpatialFilter.from_wkt("MULTIPOLYGON (((0 0, 1 0, 1 1, 0 0)), ((5 5, 6 5, 6 6, 5 5)))")
+    assert multi.mask(np.array([0.8, 5.8, 3.0]), np.array([0.2, 5.2, 3.0])).tolist() == [True, True, False]
+    with pytest.raises(ValueError):
+        SpatialFilter.from_text("POINT (1 2)")
+
+def test_geojson_matches_wkt():
+    geojson = json.dumps({
+        'type': 'FeatureCollection',
+        'features': [{
+            'type': 'Feature',
+            'properties': {},
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [[[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+                                [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]],
+            },
+        }],
+    })
+    from_geojson = SpatialFilter.from_text(geojson)
+    from_wkt = SpatialFilter.from_wkt(SQUARE_WITH_HOLE_WKT)
+    assert from_geojson.cache_key() == from_wkt.cache_key()
+
+    rng = np.random.default_rng(0)
+    lon, lat = rng.uniform(-1, 11, 5000), rng.uniform(-1, 11, 5000)
+    assert np.array_equal(from_geojson.mask(lon, lat), from_wkt.mask(lon, lat))
+
+@pytest.mark.parametrize('text', ["2, 2, 8, 5", SQUARE_WITH_HOLE_WKT])
+def test_polars_expr_matches_mask(text):
+    pl = pytest.importorskip('polars')
+    spatial = SpatialFilter.from_text(text)
+
+    rng = np.random.default_rng(1)
+    lon, lat = rng.uniform(-1, 11, 5000), rng.uniform(-1, 11, 5000)
+    lon[::97] = np.nan
+    df = pl.DataFrame({'X_LONGITUDE': lon, 'Y_LATITUDE': lat}).with_columns(
+        pl.when(pl.col('X_LONGITUDE').is_nan()).then(None).otherwise(pl.col('X_LONGITUDE')).alias('X_LONGITUDE'))
+
+    polars_mask = df.select(spatial.polars_expr('X_LONGITUDE', 'Y_LATITUDE').alias('inside'))['inside']
+    assert polars_mask.to_list() == spatial.mask(lon, lat).tolist()
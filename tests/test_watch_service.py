@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Watch service: settle time, retry worker crash, staging output dan state file"""
+
+import os
+import json
+import shutil
+from concurrent.futures import Future
+
+import main_processor
+import watch_service
+from watch_service import WatchService, STAGING_PREFIX, STATE_FILE_NAME, MAX_ATTEMPTS
+
+def queued_paths(service):
+    return [path for path, _, _ in service.queue]
+
+def test_scan_queues_file_after_settle_time(tmp_path):
+    input_dir = tmp_path / 'input'
+    input_dir.mkdir()
+    csv_path = input_dir / 'dump.csv'
+    csv_path.write_text("SITE_ID\nA\n")
+    (input_dir / 'empty.csv').write_text("")
+    (input_dir / 'notes.txt').write_text("bukan csv")
+    service = WatchService(str(input_dir), str(tmp_path / 'output'), settle_seconds=10)
+
+    service.scan(now=0)
+    service.scan(now=5)
+    assert queued_paths(service) == []
+
+    # File masih bertambah: settle time dihitung ulang dari perubahan terakhir
+    with open(csv_path, 'a') as f:
+        f.write("B\n")
+    service.scan(now=8)
+    service.scan(now=17)
+    assert queued_paths(service) == []
+
+    service.scan(now=18)
+    assert queued_paths(service) == [str(csv_path)]
+    path, signature, detected_at = service.queue[0]
+    assert signature == watch_service.file_signature(str(csv_path)) and detected_at == 0
+
+    # File kosong dan non-CSV tidak pernah masuk antrian, file yang sudah di antrian tidak dobel
+    service.scan(now=100)
+    assert queued_paths(service) == [str(csv_path)]
+
+def test_scan_skips_files_recorded_in_state(tmp_path):
+    input_dir = tmp_path / 'input'
+    input_dir.mkdir()
+    csv_path = input_dir / 'dump.csv'
+    csv_path.write_text("SITE_ID\nA\n")
+    service = WatchService(str(input_dir), str(tmp_path / 'output'), settle_seconds=0)
+    service.processed[str(csv_path)] = {'signature': watch_service.file_signature(str(csv_path))}
+
+    service.scan(now=0)
+    service.scan(now=1)
+    assert queued_paths(service) == []
+
+    # Isi berubah -> diproses lagi
+    with open(csv_path, 'a') as f:
+        f.write("B\n")
+    service.scan(now=2)
+    service.scan(now=3)
+    assert queued_paths(service) == [str(csv_path)]
+
+def test_worker_crash_is_retried_before_recorded_as_failed(tmp_path):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    service = WatchService(str(tmp_path), str(output_dir))
+    path = str(tmp_path / 'dump.csv')
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        future = Future()
+        future.set_exception(RuntimeError("worker crash"))
+        service.running[future] = {'path': path, 'signature': [1, 1], 'detected_at': 0, 'started_at': 0}
+        service.collect()
+        if attempt < MAX_ATTEMPTS:
+            # Belum dicatat: scan berikutnya memasukkan file ke antrian lagi
+            assert path not in service.processed and service.attempts[path] == attempt
+
+    assert service.processed[path]['success'] is False
+    assert path not in service.attempts
+    with open(output_dir / STATE_FILE_NAME, 'r', encoding='utf-8') as f:
+        assert json.load(f)['files'][path]['success'] is False
+
+def test_run_moves_outputs_from_staging_and_restart_skips_file(sample_csv, tmp_path):
+    input_dir = tmp_path / 'input'
+    output_dir = tmp_path / 'output'
+    input_dir.mkdir()
+    output_dir.mkdir()
+    csv_path = input_dir / 'dump.csv'
+    shutil.copy(sample_csv, csv_path)
+    # Sisa staging dari service yang berhenti di tengah proses
+    (output_dir / f"{STAGING_PREFIX}old").mkdir()
+
+    # Cycle 1 mencatat file, cycle 2 memasukkan ke antrian dan dispatch, run menunggu job selesai
+    service = WatchService(str(input_dir), str(output_dir), workers=1, poll_interval=0.01, settle_seconds=0)
+    assert service.run(max_cycles=2)
+
+    entry = service.processed[str(csv_path)]
+    assert entry['success'] is True
+    output_names = main_processor.generate_output_names(str(csv_path), str(output_dir))
+    for key in ['processed_txt', 'rawndb_csv', 'rawndb_simple_csv']:
+        assert os.path.basename(output_names[key]) in entry['outputs']
+        assert os.path.exists(output_names[key])
+    assert os.path.exists(output_dir / 'dump_watch.log')
+    assert not [name for name in os.listdir(output_dir) if name.startswith(STAGING_PREFIX)]
+
+    restarted = WatchService(str(input_dir), str(output_dir), workers=1, poll_interval=0.01, settle_seconds=0)
+    assert restarted.run(max_cycles=3)
+    assert restarted.processed[str(csv_path)]['processed_at'] == entry['processed_at']
+    assert not restarted.queue and not restarted.running
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transform Rules Manager
+Save, load dan compile rule transformasi (Fixed_Ant_Size dan Class_Cell)
+dari file JSON di samping column_settings.json
+"""
+
+import os
+import re
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from column_settings import get_settings_file
+
+RULES_FORMAT_VERSION = 1
+
+# Batas jumlah CELL_NAME unik yang di-memoize antar run
+CLASS_CELL_CACHE_LIMIT = 2000000
+# Jumlah CELL_NAME unik per batch regex (membatasi memory sementara str.upper / str.extract)
+CLASS_CELL_BATCH_SIZE = 50000
+
+def get_rules_file():
+    """Get path to transform rules file (satu folder dengan column_settings.json)"""
+    return os.path.join(os.path.dirname(get_settings_file()), 'transform_rules.json')
+
+def get_default_rules():
+    """Get default transform rules (sesuai macro VBA Module1.bas)"""
+    return {
+        'format_version': RULES_FORMAT_VERSION,
+        'version': '1.0',
+        'fixed_ant_size': {
+            # Prefix CELL_SYSTEM_INFO, urutan = prioritas
+            'prefixes': [
+                {'prefix': 'GSM900', 'size': 0.03},
+                {'prefix': 'LTE1800', 'size': 0.095},
+                {'prefix': 'LTE2100', 'size': 0.085},
+                {'prefix': 'LTE900', 'size': 0.1},
+                {'prefix': 'DCS1800', 'size': 0.02},
+                {'prefix': '5G18', 'size': 0.07},
+                {'prefix': '5G21', 'size': 0.065},
+                {'prefix': '5G_26G', 'size': 0.065},
+                {'prefix': 'L18', 'size': 0.09},
+                {'prefix': 'L21', 'size': 0.08},
+            ],
+            'default': 0.08,
+            'missing_column': 0.03,
+            'indoor_divisor': 4,
+        },
+        'class_cell': {
+            # Prefix CELL_NAME, urutan = prioritas
+            'prefixes': ['L18_', 'L21_', '5G18_', '5G21_'],
+            'sector_letters': 'ABCD',
+            'length': 3,
+        },
+    }
+
+def validate_rules(rules):
+    """Validate struktur rules, raise ValueError jika tidak valid"""
+    if not isinstance(rules, dict):
+        raise ValueError("Rules harus berupa object JSON")
+
+    fixed = rules.get('fixed_ant_size')
+    if not isinstance(fixed, dict) or not isinstance(fixed.get('prefixes'), list):
+        raise ValueError("fixed_ant_size.prefixes harus berupa list")
+    for item in fixed['prefixes']:
+        if not isinstance(item, dict) or not str(item.get('prefix', '')) or not isinstance(item.get('size'), (int, float)):
+            raise ValueError(f"Rule Fixed_Ant_Size tidak valid: {item}")
+    for key in ('default', 'missing_column', 'indoor_divisor'):
+        if not isinstance(fixed.get(key), (int, float)):
+            raise ValueError(f"fixed_ant_size.{key} harus berupa angka")
+
+    class_cell = rules.get('class_cell')
+    if not isinstance(class_cell, dict) or not isinstance(class_cell.get('prefixes'), list):
+        raise ValueError("class_cell.prefixes harus berupa list")
+    if not all(isinstance(prefix, str) and prefix for prefix in class_cell['prefixes']):
+        raise ValueError("class_cell.prefixes harus berisi text")
+    if not isinstance(class_cell.get('sector_letters'), str) or not class_cell['sector_letters']:
+        raise ValueError("class_cell.sector_letters harus berupa text")
+    if not isinstance(class_cell.get('length'), int) or class_cell['length'] < 1:
+        raise ValueError("class_cell.length harus berupa angka >= 1")
+
+    return rules
+
+def save_transform_rules(rules):
+    """Save transform rules to file"""
+    try:
+        validate_rules(rules)
+        with open(get_rules_file(), 'w', encoding='utf-8') as f:
+            json.dump(rules, f, indent=2, ensure_ascii=False)
+        return True
+
+    except Exception as e:
+        print(f"Failed to save transform rules: {e}")
+        return False
+
+def load_transform_rules():
+    """Load transform rules from file (file default dibuat jika belum ada)"""
+    try:
+        rules_file = get_rules_file()
+
+        if not os.path.exists(rules_file):
+            rules = get_default_rules()
+            save_transform_rules(rules)
+            return rules
+
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            return validate_rules(json.load(f))
+
+    except Exception as e:
+        print(f"Failed to load transform rules: {e}")
+        return get_default_rules()
+
+def get_rules_hash(rules):
+    """Hash isi rules (dipakai sebagai key cache compiled plan)"""
+    payload = json.dumps(rules, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+def compile_class_cell_pattern(prefixes, letters='ABCD', length=3):
+    """
+    Compile 1 regex untuk semua prefix Class_Cell
+
+    Setiap alternatif hanya cocok pada kemunculan PERTAMA prefix-nya ((?!prefix). sebelum
+    prefix) dan harus diikuti salah satu sector letter. Alternatif dicoba sesuai urutan
+    list, sehingga prefix pertama dalam list yang valid menang (sama seperti loop find()
+    di macro VBA).
+    """
+    letter_class = "[" + "".join(re.escape(letter) for letter in letters) + "]"
+    alternatives = []
+    for i, prefix in enumerate(prefixes):
+        escaped = re.escape(prefix)
+        alternatives.append(f"(?:(?:(?!{escaped}).)*{escaped}(?P<c{i}>{letter_class}.{{0,{length - 1}}}))")
+    return re.compile("^(?:" + "|".join(alternatives) + ")", re.DOTALL)
+
+class CompiledTransformRules:
+    """Rules yang sudah di-compile ke struktur lookup vectorized"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.version = str(rules.get('version', ''))
+        self.rules_hash = get_rules_hash(rules)
+
+        fixed = rules['fixed_ant_size']
+        self.fixed_ant_size_prefixes = [(str(item['prefix']).upper(), float(item['size'])) for item in fixed['prefixes']]
+        self.default_ant_size = float(fixed['default'])
+        self.missing_column_ant_size = float(fixed['missing_column'])
+        self.indoor_divisor = float(fixed['indoor_divisor'])
+
+        # Prefix table per panjang prefix: {panjang: {prefix: prioritas}}
+        # Prefix duplikat memakai prioritas tertinggi (kemunculan pertama)
+        self.prefix_table = {}
+        for priority, (prefix, _) in enumerate(self.fixed_ant_size_prefixes):
+            self.prefix_table.setdefault(len(prefix), {}).setdefault(prefix, priority)
+        self.prefix_lengths = sorted(self.prefix_table)
+        self.prefix_sizes = np.array([size for _, size in self.fixed_ant_size_prefixes] + [self.default_ant_size])
+
+        class_cell = rules['class_cell']
+        self.class_cell_prefixes = [prefix.upper() for prefix in class_cell['prefixes']]
+        self.class_cell_pattern = compile_class_cell_pattern(
+            self.class_cell_prefixes, class_cell['sector_letters'].upper(), class_cell['length'])
+        self.class_cell_letters = class_cell['sector_letters'].upper()
+        self.class_cell_length = class_cell['length']
+
+        # Memo CELL_NAME -> Class_Cell, cell yang sama berulang di dump harian
+        self._class_cell_cache = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_class_cell_cache'] = {}
+        return state
+
+    def map_fixed_ant_size(self, cell_system_info):
+        """
+        Vectorized mapping CELL_SYSTEM_INFO -> Fixed_Ant_Size
+
+        Setiap nilai unik hanya dievaluasi sekali (factorize): untuk tiap panjang prefix,
+        potongan awal nilai di-lookup ke prefix table, prioritas terkecil menang.
+        Hasilnya di-broadcast kembali ke semua baris lewat kode factorize.
+        """
+        codes, uniques = pd.factorize(cell_system_info)
+        unique_upper = pd.Series(np.asarray(uniques, dtype=object), dtype=object).map(str).str.upper()
+
+        no_match = len(self.fixed_ant_size_prefixes)
+        best = np.full(len(unique_upper), no_match, dtype=np.int64)
+        for length in self.prefix_lengths:
+            priority = unique_upper.str[:length].map(self.prefix_table[length])
+            priority = priority.fillna(no_match).to_numpy(dtype=np.int64)
+            np.minimum(best, priority, out=best)
+
+        # Kode -1 (nilai kosong) mengambil elemen terakhir = default
+        sizes = np.append(self.prefix_sizes[best], self.default_ant_size)
+
+        return pd.Series(sizes[codes], index=cell_system_info.index)
+
+    def _extract_class_cell_uncached(self, cell_names):
+        """Extract Class_Cell dari Series string CELL_NAME dengan regex compiled"""
+        extracted = cell_names.str.upper().str.extract(self.class_cell_pattern)
+        result = pd.Series("", index=cell_names.index, dtype=object)
+        for i, prefix in enumerate(self.class_cell_prefixes):
+            group = extracted[f"c{i}"]
+            hit = group.notna()
+            result[hit] = prefix + group[hit]
+        return result
+
+    def extract_class_cell(self, cell_name):
+        """
+        Vectorized extraction Class_Cell dari CELL_NAME
+
+        Regex hanya dijalankan sekali per CELL_NAME unik yang belum ada di memo.
+        """
+        codes, uniques = pd.factorize(cell_name)
+        unique_names = pd.Series(np.asarray(uniques, dtype=object), dtype=object).map(str)
+
+        classes = unique_names.map(self._class_cell_cache).astype(object)
+        missing = classes.isna()
+        if missing.any():
+            missing_names = unique_names[missing]
+            computed = pd.concat([self._extract_class_cell_uncached(missing_names.iloc[start:start + CLASS_CELL_BATCH_SIZE])
+                                  for start in range(0, len(missing_names), CLASS_CELL_BATCH_SIZE)])
+            classes[missing] = computed
+
+            if len(self._class_cell_cache) + len(computed) > CLASS_CELL_CACHE_LIMIT:
+                self._class_cell_cache.clear()
+            self._class_cell_cache.update(zip(unique_names[missing], computed))
+
+        # Kode -1 (nilai kosong) mengambil elemen terakhir = ""
+        values = np.append(classes.to_numpy(dtype=object), "")
+
+        return pd.Series(values[codes], index=cell_name.index, dtype=object)
+
+# Compiled plan yang sudah dipakai di proses ini, key = hash rules
+_compiled_rules = {}
+
+def compile_transform_rules(rules):
+    """
+    Compile rules ke CompiledTransformRules
+
+    Hasil compile di-cache di memory (key = hash rules), sehingga compile berikutnya
+    dengan rules yang sama di proses ini tidak perlu compile ulang.
+    """
+    rules_hash = get_rules_hash(rules)
+    if rules_hash not in _compiled_rules:
+        _compiled_rules[rules_hash] = CompiledTransformRules(rules)
+    return _compiled_rules[rules_hash]
+
+def get_transform_rules():
+    """Load dan compile transform rules dari file"""
+    return compile_transform_rules(load_transform_rules())
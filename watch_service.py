@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Watch Service
+Mode service headless: pantau folder input dan proses setiap CSV NDB baru secara otomatis
+
+- Folder input di-scan setiap interval (polling, tanpa dependency tambahan)
+- File baru masuk antrian setelah ukuran dan mtime tidak berubah selama settle time
+- Antrian diproses worker pool (process) dengan jumlah worker terbatas
+- Output ditulis ke folder staging lalu di-rename ke folder output (atomic)
+- File yang sudah diproses dicatat di state file, restart tidak memproses ulang
+
+Contoh:
+    python watch_service.py --input "D:/NDB/masuk" --output "D:/NDB/hasil" --workers 2
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from main_processor import (log_message, process_all_steps, get_base_filename, get_available_memory,
+                            estimate_batch_memory, PROCESSING_ENGINES)
+
+STATE_FILE_NAME = '.ndb_watch_state.json'
+STAGING_PREFIX = '.ndb_staging_'
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_SETTLE_SECONDS = 10.0
+# Worker crash (bukan error processing) dicoba ulang sebelum file dicatat gagal
+MAX_ATTEMPTS = 3
+
+def file_signature(path):
+    """Ukuran dan mtime file (None jika file hilang)"""
+    try:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+    except OSError:
+        return None
+
+def is_readable(path):
+    """Cek file bisa dibuka (file yang masih dicopy di Windows biasanya terkunci)"""
+    try:
+        with open(path, 'rb') as f:
+            f.read(1)
+        return True
+    except OSError:
+        return False
+
+def _process_watched_file(csv_path, output_dir, options):
+    """
+    Worker (process terpisah): proses 1 file ke folder staging lalu pindahkan ke output_dir
+
+    Output hanya muncul di output_dir setelah lengkap (os.replace di filesystem yang sama).
+    """
+    start_time = time.time()
+    staging_dir = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=output_dir)
+    log_name = f"{get_base_filename(csv_path)}_watch.log"
+
+    try:
+        with open(os.path.join(staging_dir, log_name), 'w', encoding='utf-8') as log_file, \
+                contextlib.redirect_stdout(log_file):
+            success = process_all_steps(csv_path, output_dir=staging_dir, **options)
+
+        outputs = []
+        for name in sorted(os.listdir(staging_dir)):
+            # Output hanya dipindah jika run sukses, log selalu dipindah
+            if success or name == log_name:
+                os.replace(os.path.join(staging_dir, name), os.path.join(output_dir, name))
+                outputs.append(name)
+
+        return {'success': success, 'seconds': time.time() - start_time, 'outputs': outputs}
+
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+class WatchService:
+    """Pantau folder input, antrikan file yang sudah stabil dan proses di worker pool"""
+
+    def __init__(self, input_dir, output_dir, workers=None, poll_interval=DEFAULT_POLL_INTERVAL,
+                 settle_seconds=DEFAULT_SETTLE_SECONDS, state_file=None, options=None):
+        self.input_dir = os.path.abspath(input_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.state_file = state_file or os.path.join(self.output_dir, STATE_FILE_NAME)
+        # Argumen process_all_steps (chunk_size, engine, regions, site_ids, spatial)
+        self.options = options or {}
+
+        # path -> {'signature', 'processed_at', 'success', 'seconds', 'outputs'}
+        self.processed = {}
+        # path -> (signature, waktu signature terakhir berubah, waktu pertama terlihat)
+        self.candidates = {}
+        # Antrian (path, signature, waktu terdeteksi) dan job yang sedang jalan
+        self.queue = deque()
+        self.running = {}
+        # path -> jumlah worker crash
+        self.attempts = {}
+        self.executor = None
+        self.stopped = False
+
+    def load_state(self):
+        """Load daftar file yang sudah diproses"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.processed = json.load(f).get('files', {})
+                log_message("INFO", f"State: {len(self.processed):,} file sudah diproses sebelumnya")
+        except Exception as e:
+            log_message("WARNING", f"State watch tidak bisa dibaca ({str(e)}), mulai dari kosong")
+            self.processed = {}
+
+    def save_state(self):
+        """Simpan state (tulis ke file sementara lalu rename)"""
+        temp_path = self.state_file + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self.processed}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.state_file)
+
+    def is_done(self, path, signature):
+        """File dengan ukuran dan mtime yang sama sudah pernah diproses"""
+        entry = self.processed.get(path)
+        return entry is not None and entry.get('signature') == signature
+
+    def scan(self, now=None):
+        """Scan folder input, file yang sudah stabil selama settle time masuk antrian"""
+        now = time.time() if now is None else now
+        queued = {path for path, _, _ in self.queue} | {job['path'] for job in self.running.values()}
+
+        try:
+            names = os.listdir(self.input_dir)
+        except OSError as e:
+            log_message("WARNING", f"Folder input tidak bisa dibaca: {str(e)}")
+            return
+
+        seen = set()
+        for name in sorted(names):
+            if not name.lower().endswith('.csv'):
+                continue
+            path = os.path.join(self.input_dir, name)
+            signature = file_signature(path)
+            if signature is None or path in queued or self.is_done(path, signature):
+                continue
+
+            seen.add(path)
+            previous = self.candidates.get(path)
+            if previous is None or previous[0] != signature:
+                # File baru / masih bertambah: tunggu sampai tidak berubah selama settle time
+                first_seen = previous[2] if previous is not None else now
+                self.candidates[path] = (signature, now, first_seen)
+                continue
+
+            if now - previous[1] >= self.settle_seconds and signature[0] > 0 and is_readable(path):
+                del self.candidates[path]
+                self.queue.append((path, signature, previous[2]))
+                log_message("QUEUE", f"{name} masuk antrian ({signature[0] / (1024 * 1024):.1f} MB), "
+                                     f"antrian: {len(self.queue)}, diproses: {len(self.running)}")
+
+        # File yang hilang sebelum stabil
+        for path in list(self.candidates):
+            if path not in seen:
+                del self.candidates[path]
+
+    def can_start(self, path):
+        """Slot worker kosong dan memory cukup (job pertama selalu boleh jalan)"""
+        if len(self.running) >= self.workers:
+            return False
+        if not self.running:
+            return True
+        available = get_available_memory()
+        return available is None or estimate_batch_memory(path, self.options.get('chunk_size')) <= available
+
+    def dispatch(self):
+        """Kirim job dari antrian ke worker pool"""
+        while self.queue and self.can_start(self.queue[0][0]):
+            path, signature, detected_at = self.queue.popleft()
+            future = self.executor.submit(_process_watched_file, path, self.output_dir, self.options)
+            self.running[future] = {'path': path, 'signature': signature, 'detected_at': detected_at,
+                                    'started_at': time.time()}
+            log_message("WORKER", f"Mulai {os.path.basename(path)}, antrian: {len(self.queue)}, "
+                                  f"diproses: {len(self.running)}/{self.workers}")
+
+    def new_executor(self):
+        # Spawn: perilaku sama di Windows dan Linux (lihat process_batch)
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def collect(self):
+        """Catat job yang sudah selesai ke state"""
+        pool_broken = False
+        for future in [f for f in self.running if f.done()]:
+            job = self.running.pop(future)
+            name = os.path.basename(job['path'])
+            try:
+                result = future.result()
+            except Exception as e:
+                pool_broken = pool_broken or isinstance(e, BrokenProcessPool)
+                attempts = self.attempts.get(job['path'], 0) + 1
+                self.attempts[job['path']] = attempts
+                if attempts < MAX_ATTEMPTS:
+                    # Tidak dicatat di state: scan berikutnya memasukkan file ke antrian lagi
+                    log_message("WARNING", f"Worker {name} berhenti ({str(e)}), dicoba ulang ({attempts}/{MAX_ATTEMPTS})")
+                    continue
+                result = {'success': False, 'seconds': time.time() - job['started_at'], 'outputs': [],
+                          'error': str(e)}
+
+            self.attempts.pop(job['path'], None)
+
+            latency = time.time() - job['detected_at']
+            wait_time = job['started_at'] - job['detected_at']
+            self.processed[job['path']] = {
+                'signature': job['signature'],
+                'processed_at': time.time(),
+                'success': result['success'],
+                'seconds': round(result['seconds'], 3),
+                'latency': round(latency, 3),
+                'outputs': result['outputs'],
+            }
+            self.save_state()
+
+            if result['success']:
+                log_message("SUCCESS", f"{name} selesai: proses {result['seconds']:.2f} detik, "
+                                       f"latency {latency:.2f} detik (tunggu {wait_time:.2f} detik)")
+            else:
+                detail = result.get('error') or f"lihat {get_base_filename(job['path'])}_watch.log"
+                log_message("ERROR", f"{name} gagal ({detail}), tidak diulang sampai file berubah")
+            log_message("QUEUE", f"Antrian: {len(self.queue)}, diproses: {len(self.running)}/{self.workers}")
+
+        if pool_broken and self.executor is not None and not self.running:
+            log_message("WARNING", "Worker pool rusak, dibuat ulang")
+            self.executor.shutdown(wait=False)
+            self.executor = self.new_executor()
+
+    def cleanup_staging(self):
+        """Hapus folder staging sisa service yang berhenti di tengah proses"""
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            if name.startswith(STAGING_PREFIX) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def run(self, max_cycles=None):
+        """Loop scan -> dispatch -> collect sampai stop() / Ctrl+C (max_cycles untuk run terbatas)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.load_state()
+        self.cleanup_staging()
+
+        log_message("START", "=== NDB Watch Service ===")
+        log_message("INFO", f"Input: {self.input_dir}")
+        log_message("INFO", f"Output: {self.output_dir}")
+        log_message("INFO", f"Worker: {self.workers}, interval {self.poll_interval} detik, "
+                            f"settle {self.settle_seconds} detik")
+
+        self.executor = self.new_executor()
+        cycles = 0
+        try:
+            while not self.stopped:
+                self.collect()
+                self.scan()
+                self.dispatch()
+
+                cycles += 1
+                if max_cycles is not None and cycles >= max_cycles:
+                    break
+                time.sleep(self.poll_interval)
+
+        except KeyboardInterrupt:
+            log_message("INFO", "Service dihentikan oleh user")
+
+        finally:
+            # Job yang sedang jalan diselesaikan dulu supaya state tetap benar
+            if self.running:
+                log_message("INFO", f"Menunggu {len(self.running)} job selesai...")
+            self.executor.shutdown(wait=True)
+            self.collect()
+            self.executor = None
+
+        return True
+
+    def stop(self):
+        self.stopped = True
+
+def main(argv=None):
+    """Entry point service headless"""
+    parser = argparse.ArgumentParser(description="NDB CSV Processor - watch folder service")
+    parser.add_argument('--input', required=True, help="Folder yang dipantau")
+    parser.add_argument('--output', required=True, help="Folder output")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah worker (default jumlah core)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help="Interval scan (detik)")
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="File dianggap lengkap jika tidak berubah selama ini (detik)")
+    parser.add_argument('--state-file', default=None, help=f"State file (default <output>/{STATE_FILE_NAME})")
+    parser.add_argument('--chunk-size', type=int, default=None, help="Streaming mode per chunk (baris)")
+    parser.add_argument('--engine', choices=PROCESSING_ENGINES, default='pandas')
+    parser.add_argument('--region', action='append', default=[], help="Filter REGION (boleh berulang)")
+    parser.add_argument('--site-ids', default=None, help="Filter SITE_ID: daftar ID atau path file .txt/.csv")
+    parser.add_argument('--area', default=None, help="Filter area: bbox, WKT atau path file .geojson/.wkt")
+    args = parser.parse_args(argv)
+
+    from site_filter import SiteIdFilter
+    from spatial_filter import SpatialFilter
+
+    site_ids = None
+    if args.site_ids:
+        site_ids = SiteIdFilter.from_file(args.site_ids) if os.path.isfile(args.site_ids) else SiteIdFilter.from_text(args.site_ids)
+
+    service = WatchService(args.input, args.output, workers=args.workers, poll_interval=args.interval,
+                           settle_seconds=args.settle, state_file=args.state_file,
+                           options={'chunk_size': args.chunk_size, 'engine': args.engine, 'regions': args.region,
+                                    'site_ids': site_ids, 'spatial': SpatialFilter.coerce(args.area)})
+    return service.run()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(0 if main() else 1)